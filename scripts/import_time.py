@@ -0,0 +1,100 @@
+"""
+import_time.py
+Created October 19, 2026
+
+Measures how long the application's modules take to import (with `python -X importtime`) and fails if a module pulls
+in something it shouldn't at import time, ex: the window's modules loading OpenCV before the window appears.
+
+Usage:
+    python scripts/import_time.py [--repeat N] [--top N] [--budget MODULE=MILLISECONDS ...]
+"""
+import argparse
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+SOURCE = Path(__file__).resolve().parent.parent / 'src' / 'main' / 'python'
+
+# Loaded on first use (see `preloadDigitization` in `controllers/MainController.py`)
+DIGITIZATION_STACK = ('cv2', 'numpy', 'scipy', 'ecgdigitize', 'Conversion')
+
+# Module -> packages it must not import at import time
+CHECKS = {
+    'controllers.MainController': DIGITIZATION_STACK,
+    'Annotation': DIGITIZATION_STACK,
+    'AnnotationIndex': DIGITIZATION_STACK,
+    'ecgdigitize': ('scipy',),
+    'Conversion': ('scipy',),
+}
+
+LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)$')
+
+
+def measure(module: str) -> Tuple[float, Dict[str, float]]:
+    """Imports `module` in a fresh interpreter.
+
+    Returns:
+        Tuple[float, Dict[str, float]]: Total import time (ms) and the cumulative time (ms) of every module imported.
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=SOURCE, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match is not None:
+            cumulative[match.group(4)] = int(match.group(2)) / 1000
+
+    return cumulative.get(module, 0.0), cumulative
+
+
+def forbiddenImports(imported: Dict[str, float], forbidden: Tuple[str, ...]) -> List[str]:
+    return sorted(name for name in imported if name.split('.')[0] in forbidden and '.' not in name)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[-1])
+    parser.add_argument('--repeat', type=int, default=3, help="Imports per module; the fastest is reported")
+    parser.add_argument('--top', type=int, default=5, help="Slowest imports listed per module")
+    parser.add_argument('--budget', action='append', default=[], metavar='MODULE=MILLISECONDS',
+                        help="Fail if MODULE takes longer than this to import")
+    arguments = parser.parse_args()
+
+    budgets = {name: float(limit) for name, limit in (budget.split('=') for budget in arguments.budget)}
+
+    failures = []
+    for module in sorted(set(CHECKS) | set(budgets)):
+        try:
+            runs = [measure(module) for _ in range(arguments.repeat)]
+        except RuntimeError as error:
+            failures.append(f"{module}: could not be imported ({error})")
+            continue
+
+        total, imported = min(runs, key=lambda run: run[0])
+        print(f"{module}: {total:.1f} ms")
+
+        ownModules = {name: time for name, time in imported.items() if name != module}
+        for name, time in sorted(ownModules.items(), key=lambda item: -item[1])[:arguments.top]:
+            print(f"    {time:8.1f} ms  {name}")
+
+        loaded = forbiddenImports(imported, CHECKS.get(module, ()))
+        if len(loaded) > 0:
+            failures.append(f"{module}: imports {', '.join(loaded)} at import time")
+
+        if module in budgets and total > budgets[module]:
+            failures.append(f"{module}: {total:.1f} ms is over its budget of {budgets[module]:.1f} ms")
+
+    for failure in failures:
+        print("FAIL", failure)
+
+    return 1 if len(failures) > 0 else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
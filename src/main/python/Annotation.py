@@ -12,11 +12,18 @@ import datetime
 from typing import Any, Dict, List, Optional, Union
 
 from model import Lead
+from model.InputParameters import InputParameters
 
 
 VERSION = 0
 
 
+def annotationPath(imagePath: pathlib.Path, page: Optional[int] = None) -> pathlib.Path:
+    """Location of the saved annotation for an image (or for one page of a multi-page file)."""
+    pageSuffix = f"-page{page}" if page is not None else ""
+    return imagePath.parent / '.paperecg' / (imagePath.stem + '-' + imagePath.suffix[1:] + pageSuffix + '.json')
+
+
 def noneValuesRemoved(dictionary: Dict[Any, Any]) -> Dict[Any, Any]:
     return {key: value for key, value in dictionary.items() if value is not None}
 
@@ -115,3 +122,47 @@ class Annotation:
 
         with filePath.open('w') as file:
             file.write(jsonSerial)
+
+
+def annotationFromDict(data: Dict[str, Any]) -> Annotation:
+    """Rebuilds an annotation from its saved form (see `Annotation.toDict`)."""
+    return Annotation(
+        timeStamp=data['timeStamp'],
+        image=ImageMetadata(**data['image']),
+        rotation=data['rotation'],
+        timeScale=data['timeScale'],
+        voltageScale=data['voltageScale'],
+        leads={
+            Lead.LeadId[name]: LeadAnnotation(CropLocation(**lead['cropping']), lead['start'])
+            for name, lead in data['leads'].items()
+        }
+    )
+
+
+def loadAnnotation(filePath: pathlib.Path) -> Annotation:
+    with filePath.open() as file:
+        return annotationFromDict(json.load(file))
+
+
+def annotationInputParameters(annotation: Annotation) -> InputParameters:
+    """The parameters used for digitization described by an annotation."""
+    return InputParameters(
+        rotation=annotation.rotation,
+        timeScale=annotation.timeScale,
+        voltScale=annotation.voltageScale,
+        leads={
+            leadId: Lead.Lead(
+                x=lead.cropping.x,
+                y=lead.cropping.y,
+                width=lead.cropping.width,
+                height=lead.cropping.height,
+                startTime=lead.start
+            )
+            for leadId, lead in annotation.leads.items()
+        }
+    )
+
+
+def loadInputParameters(filePath: pathlib.Path) -> InputParameters:
+    """Reads a saved annotation into the parameters used for digitization."""
+    return annotationInputParameters(loadAnnotation(filePath))
@@ -0,0 +1,294 @@
+"""
+AnnotationIndex.py
+Created October 19, 2026
+
+Indexes saved annotations (the JSON files in `.paperecg` folders) in a local SQLite database, so that large image
+collections can be searched (ex: every page with lead V1 annotated at 50 mm/s) without walking the filesystem and
+parsing every file.
+"""
+import dataclasses
+import datetime
+import hashlib
+import json
+import os
+import pathlib
+import re
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import Annotation
+from model.Lead import LeadId
+
+
+TIMESTAMP_FORMAT = "%m/%d/%Y, %H:%M:%S"  # As written by `MainController.saveAnnotations`
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS annotations (
+    id INTEGER PRIMARY KEY,
+    annotationPath TEXT NOT NULL UNIQUE,
+    imagePath TEXT NOT NULL,
+    page INTEGER,
+    schemaName TEXT NOT NULL,
+    schemaVersion INTEGER NOT NULL,
+    imageHash TEXT,
+    timeStamp TEXT NOT NULL,
+    savedAt TEXT,
+    rotation REAL NOT NULL,
+    timeScale REAL NOT NULL,
+    voltageScale REAL NOT NULL,
+    modified REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS leads (
+    annotationId INTEGER NOT NULL REFERENCES annotations(id) ON DELETE CASCADE,
+    lead TEXT NOT NULL,
+    x INTEGER NOT NULL,
+    y INTEGER NOT NULL,
+    width INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    start REAL NOT NULL,
+    PRIMARY KEY (annotationId, lead)
+);
+CREATE INDEX IF NOT EXISTS leadsByName ON leads(lead, annotationId);
+CREATE INDEX IF NOT EXISTS annotationsByScale ON annotations(timeScale, voltageScale);
+CREATE INDEX IF NOT EXISTS annotationsByHash ON annotations(imageHash);
+"""
+
+
+@dataclasses.dataclass(frozen=True)
+class IndexedAnnotation:
+    annotationPath: pathlib.Path
+    imagePath: pathlib.Path
+    page: Optional[int]  # `None` for single page images
+    annotation: Annotation.Annotation
+
+
+def hashImage(imagePath: pathlib.Path, chunkSize: int = 1 << 20) -> str:
+    """SHA-256 of an image file's contents."""
+    digest = hashlib.sha256()
+    with imagePath.open('rb') as file:
+        for chunk in iter(lambda: file.read(chunkSize), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _annotatedImage(annotationPath: pathlib.Path, imageName: str) -> Tuple[pathlib.Path, Optional[int]]:
+    """The image (and page) an annotation file belongs to, from where `Annotation.annotationPath` puts it.
+
+    The directory saved in the annotation isn't used since the collection may have been moved since.
+    """
+    imagePath = annotationPath.parent.parent / imageName
+    if Annotation.annotationPath(imagePath) == annotationPath:
+        return imagePath, None
+
+    match = re.search(r'-page(\d+)$', annotationPath.stem)
+    if match is not None and Annotation.annotationPath(imagePath, int(match.group(1))) == annotationPath:
+        return imagePath, int(match.group(1))
+
+    return imagePath, None
+
+
+def _savedAt(timeStamp: str) -> Optional[str]:
+    try:
+        return datetime.datetime.strptime(timeStamp, TIMESTAMP_FORMAT).isoformat()
+    except ValueError:
+        return None
+
+
+class AnnotationIndex:
+    """SQLite index of saved annotations.
+
+    Example:
+    ```
+    index = AnnotationIndex(pathlib.Path("annotations.sqlite"))
+    index.importDirectory(pathlib.Path("~/scans").expanduser())
+
+    for record in index.find(leads=[LeadId.V1], timeScale=50):
+        parameters = Annotation.annotationInputParameters(record.annotation)
+        ...
+    ```
+    """
+
+    def __init__(self, databasePath: Union[pathlib.Path, str] = ":memory:"):
+        self.connection = sqlite3.connect(str(databasePath))
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self) -> 'AnnotationIndex':
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def _insert(
+        self,
+        annotationPath: pathlib.Path,
+        data: Dict[str, Any],
+        modified: float,
+        hashImages: bool
+    ):
+        annotation = Annotation.annotationFromDict(data)
+        imagePath, page = _annotatedImage(annotationPath, annotation.image.name)
+
+        imageHash = annotation.image.hashValue
+        if imageHash is None and hashImages and imagePath.exists():
+            imageHash = hashImage(imagePath)
+
+        self.connection.execute("DELETE FROM annotations WHERE annotationPath = ?", (str(annotationPath),))
+        cursor = self.connection.execute(
+            """INSERT INTO annotations (
+                annotationPath, imagePath, page, schemaName, schemaVersion, imageHash, timeStamp, savedAt,
+                rotation, timeScale, voltageScale, modified
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (
+                str(annotationPath), str(imagePath), page,
+                data['schema']['name'], data['schema']['version'],
+                None if imageHash is None else str(imageHash),
+                annotation.timeStamp, _savedAt(annotation.timeStamp),
+                annotation.rotation, annotation.timeScale, annotation.voltageScale,
+                modified
+            )
+        )
+        self.connection.executemany(
+            "INSERT INTO leads (annotationId, lead, x, y, width, height, start) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (cursor.lastrowid, leadId.name, lead.cropping.x, lead.cropping.y, lead.cropping.width,
+                 lead.cropping.height, lead.start)
+                for leadId, lead in annotation.leads.items()
+            ]
+        )
+
+    def add(self, annotationPath: pathlib.Path, hashImages: bool = False):
+        """Indexes (or re-indexes) a single saved annotation."""
+        annotationPath = annotationPath.absolute()
+        with annotationPath.open() as file:
+            data = json.load(file)
+
+        with self.connection:
+            self._insert(annotationPath, data, annotationPath.stat().st_mtime, hashImages)
+
+    def importDirectory(self, root: pathlib.Path, hashImages: bool = False) -> int:
+        """Indexes every saved annotation in the `.paperecg` folders under `root`, in one transaction.
+
+        Files that haven't changed since they were last indexed are skipped, and annotations whose files have been
+        deleted are dropped from the index.
+
+        Args:
+            root (pathlib.Path): Top of the image collection.
+            hashImages (bool, optional): Hash the image files of annotations that don't record a hash (reads every
+                image, so it is slow on large collections). Defaults to False.
+
+        Returns:
+            int: Number of annotations (re)indexed.
+        """
+        root = root.absolute()
+        prefix = os.path.join(str(root), '')  # Exact, case sensitive match (`LIKE` is neither)
+        indexed = dict(self.connection.execute(
+            "SELECT annotationPath, modified FROM annotations WHERE substr(annotationPath, 1, length(?)) = ?",
+            (prefix, prefix)
+        ))
+
+        count = 0
+        with self.connection:
+            for annotationPath in sorted(root.rglob('.paperecg/*.json')):
+                key = str(annotationPath)
+                modified = annotationPath.stat().st_mtime
+                if indexed.pop(key, None) == modified:
+                    continue
+
+                try:
+                    with annotationPath.open() as file:
+                        data = json.load(file)
+                    self._insert(annotationPath, data, modified, hashImages)
+                except (ValueError, KeyError, TypeError, AssertionError) as error:
+                    print("Skipping unreadable annotation", annotationPath, repr(error))
+                    continue
+
+                count += 1
+
+            # Whatever is left was indexed before but no longer exists
+            self.connection.executemany("DELETE FROM annotations WHERE annotationPath = ?", [(key,) for key in indexed])
+
+        return count
+
+    def find(
+        self,
+        leads: Iterable[LeadId] = (),
+        timeScale: Optional[float] = None,
+        voltageScale: Optional[float] = None,
+        imageHash: Optional[str] = None,
+        schema: Optional[Annotation.Schema] = None,
+        savedAfter: Optional[datetime.datetime] = None
+    ) -> List[IndexedAnnotation]:
+        """Annotations matching every given condition, ordered by image and page.
+
+        Args:
+            leads (Iterable[LeadId], optional): Leads that must all be annotated.
+            timeScale (Optional[float], optional): Paper speed, in mm/s.
+            voltageScale (Optional[float], optional): Gain, in mm/mV.
+            imageHash (Optional[str], optional): Hash of the annotated image.
+            schema (Optional[Annotation.Schema], optional): Schema (name and version) of the saved annotation.
+            savedAfter (Optional[datetime.datetime], optional): Earliest time the annotation was saved.
+        """
+        conditions, arguments = [], []  # type: Tuple[List[str], List[Any]]
+
+        for column, value in [('timeScale', timeScale), ('voltageScale', voltageScale), ('imageHash', imageHash)]:
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                arguments.append(value)
+        if schema is not None:
+            conditions.append("schemaName = ? AND schemaVersion = ?")
+            arguments += [schema.name, schema.version]
+        if savedAfter is not None:
+            conditions.append("savedAt >= ?")
+            arguments.append(savedAfter.isoformat())
+
+        leadNames = sorted({leadId.name for leadId in leads})
+        if len(leadNames) > 0:
+            conditions.append(
+                f"id IN (SELECT annotationId FROM leads WHERE lead IN ({', '.join('?' * len(leadNames))}) "
+                "GROUP BY annotationId HAVING COUNT(*) = ?)"
+            )
+            arguments += leadNames + [len(leadNames)]
+
+        where = ("WHERE " + " AND ".join(conditions)) if len(conditions) > 0 else ""
+        rows = self.connection.execute(
+            "SELECT id, annotationPath, imagePath, page, imageHash, timeStamp, rotation, timeScale, voltageScale "
+            f"FROM annotations {where} ORDER BY imagePath, page",
+            arguments
+        ).fetchall()
+
+        leadsById = {}  # type: Dict[int, Dict[LeadId, Annotation.LeadAnnotation]]
+        for annotationId, lead, x, y, width, height, start in self.connection.execute(
+            f"SELECT annotationId, lead, x, y, width, height, start FROM leads WHERE annotationId IN "
+            f"(SELECT id FROM annotations {where})",
+            arguments
+        ):
+            leadsById.setdefault(annotationId, {})[LeadId[lead]] = Annotation.LeadAnnotation(
+                Annotation.CropLocation(x, y, width, height), start
+            )
+
+        return [
+            IndexedAnnotation(
+                annotationPath=pathlib.Path(annotationPath),
+                imagePath=pathlib.Path(imagePath),
+                page=page,
+                annotation=Annotation.Annotation(
+                    timeStamp=timeStamp,
+                    image=Annotation.ImageMetadata(
+                        pathlib.Path(imagePath).name, str(pathlib.Path(imagePath).parent), imageHash
+                    ),
+                    rotation=rotation,
+                    timeScale=timeScale,
+                    voltageScale=voltageScale,
+                    leads=leadsById.get(annotationId, {})
+                )
+            )
+            for annotationId, annotationPath, imagePath, page, imageHash, timeStamp, rotation, timeScale, voltageScale
+            in rows
+        ]
+
+    def count(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM annotations").fetchone()[0]
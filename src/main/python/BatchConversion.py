@@ -0,0 +1,217 @@
+"""
+BatchConversion.py
+Created October 19, 2026
+
+Digitizes large batches of pages as a streaming pipeline, so every core is kept busy instead of converting one page at
+a time: pages are decoded, straightened, split into leads (digitized in worker processes that read the page from shared
+memory), measured against the grid and exported, with each stage working on a different page at once.
+"""
+import dataclasses
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import ecgdigitize
+import ecgdigitize.image
+from ecgdigitize import common, pages
+from ecgdigitize.image import ColorImage, Rectangle
+from ecgdigitize.pipeline import Pipeline, Stage, StageStatistics
+from ecgdigitize.signal.quality import SignalQuality
+from ecgdigitize.sharing import SharedImage, SharedPageBuffers, attachImage
+
+import Annotation
+from AnnotationIndex import IndexedAnnotation
+from Conversion import detectInputParameters, exportSignals, measurePageScaleAndGrid, scaleECGLeads, withGridQuality
+from model.InputParameters import InputParameters
+from model.Lead import LeadId
+
+
+@dataclasses.dataclass(frozen=True)
+class BatchPage:
+    imagePath: Path
+    page: Optional[int] = None                   # `None` for single page images
+    parameters: Optional[InputParameters] = None # The rotation and layout are detected when `None`
+
+    # Filled in as the page moves through the pipeline
+    image: Optional[ColorImage] = None
+    shared: Optional[SharedImage] = None         # The straightened page, for the lead workers
+    signals: Optional[Dict[LeadId, Tuple]] = None
+    quality: Optional[Dict[LeadId, SignalQuality]] = None  # Every lead, including the ones that failed
+    pixelsPerMilliVolt: Optional[float] = None
+    pixelsPerSecond: Optional[float] = None
+
+    @staticmethod
+    def fromRecord(record: IndexedAnnotation) -> 'BatchPage':
+        """A page to convert from an `AnnotationIndex` query result."""
+        return BatchPage(record.imagePath, record.page, Annotation.annotationInputParameters(record.annotation))
+
+
+def outputPath(outputDirectory: Path, page: BatchPage, extension: str = '.csv') -> Path:
+    pageSuffix = f"-page{page.page}" if page.page is not None else ""
+    return outputDirectory / (page.imagePath.stem + pageSuffix + extension)
+
+
+@dataclasses.dataclass(frozen=True)
+class ExportedPage:
+    path: Path
+    quality: Dict[LeadId, SignalQuality]  # Ex: to send doubtful leads for review
+
+
+def _digitizeSharedLead(job: Tuple[LeadId, SharedImage]) -> Tuple[LeadId, Optional[Tuple], SignalQuality]:
+    # Runs in a worker process; only the small descriptor is sent, the pixels are read from shared memory
+    leadId, descriptor = job
+    with attachImage(descriptor) as image:
+        signal, quality = ecgdigitize.digitizeSignalWithQuality(
+            image, filteringMethod=ecgdigitize.SignalFilteringMethod.components
+        )
+
+    if signal is None or isinstance(signal, common.Failure):
+        return leadId, None, quality
+    return leadId, signal, quality
+
+
+class BatchConverter:
+    """Converts pages to signal files with every stage running concurrently.
+
+    Memory stays bounded by `queueSize` (pages waiting between stages) plus the pages in progress in each stage.
+
+    Example:
+    ```
+    converter = BatchConverter(Path("signals"))
+    jobs = map(BatchPage.fromRecord, index.find(leads=[LeadId.V1], timeScale=50))
+
+    with converter:
+        for page, result in converter.run(jobs):
+            if isinstance(result, common.Failure):
+                print(page.imagePath, result.reason)
+            elif any(quality.gapFraction > .2 for quality in result.quality.values()):
+                print(page.imagePath, "needs review")
+
+    # From another thread, ex: a progress display
+    converter.statistics()
+    ```
+    """
+
+    def __init__(
+        self,
+        outputDirectory: Path,
+        zeroingMethod: ecgdigitize.ZeroingMethod = ecgdigitize.ZeroingMethod.default,
+        outputRate: Optional[float] = None,
+        separator: str = ',',
+        leadWorkers: Optional[int] = None,
+        pageWorkers: Optional[int] = None,
+        queueSize: int = 4
+    ):
+        cores = os.cpu_count() or 1
+        leadWorkers = leadWorkers or cores
+        pageWorkers = pageWorkers or max(cores // 8, 2)
+
+        self.outputDirectory = outputDirectory
+        self.zeroingMethod = zeroingMethod
+        self.outputRate = outputRate
+        self.separator = separator
+        self._buffers: Optional[SharedPageBuffers] = None
+
+        self.pipeline = Pipeline([
+            Stage("decode", self._decode, workers=2),
+            Stage("rotate", self._straighten, workers=pageWorkers),
+            Stage(
+                "leads", _digitizeSharedLead, workers=leadWorkers, processes=True,
+                split=self._splitLeads, join=self._joinLeads, inFlight=max(leadWorkers // 12, 2),
+                release=self._freePage
+            ),
+            Stage("grid", self._measureScale, workers=pageWorkers, release=self._freePage),
+            Stage("export", self._export, workers=2),
+        ], queueSize=queueSize)
+
+    def run(self, jobs: Iterable[BatchPage]) -> Iterator[Tuple[BatchPage, Union[ExportedPage, common.Failure]]]:
+        """Yields each page with its signal file and lead quality (or the reason it failed), in the order given."""
+        self.outputDirectory.mkdir(parents=True, exist_ok=True)
+
+        with SharedPageBuffers() as self._buffers:
+            yield from self.pipeline.run(jobs)
+
+    def close(self):
+        """Stops a batch left part way (ex: the consumer stopped iterating `run`) and frees its pages."""
+        self.pipeline.close()
+        if self._buffers is not None:
+            self._buffers.close()
+
+    def __enter__(self) -> 'BatchConverter':
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def statistics(self) -> List[StageStatistics]:
+        return self.pipeline.statistics()
+
+    # Stages
+
+    def _decode(self, page: BatchPage) -> Union[BatchPage, common.Failure]:
+        if not page.imagePath.exists():
+            return common.Failure(f"Unable to read image '{page.imagePath}'")
+
+        return dataclasses.replace(page, image=pages.openPage(page.imagePath, page.page or 0))
+
+    def _straighten(self, page: BatchPage) -> Union[BatchPage, common.Failure]:
+        parameters = page.parameters
+        if parameters is None:
+            # Estimates the rotation, then finds the leads on the straightened page
+            parameters = detectInputParameters(page.image)
+            if parameters is None:
+                return common.Failure("Unable to detect the lead layout")
+
+        rotatedImage = ecgdigitize.image.rotated(page.image, parameters.rotation)
+        shared = self._buffers.share(rotatedImage)
+
+        return dataclasses.replace(
+            page, parameters=parameters, image=self._buffers.view(shared), shared=shared
+        )
+
+    def _splitLeads(self, page: BatchPage) -> List[Tuple[LeadId, SharedImage]]:
+        return [
+            (leadId, page.shared.cropped(Rectangle(lead.x, lead.y, lead.width, lead.height)))
+            for leadId, lead in page.parameters.leads.items()
+        ]
+
+    def _joinLeads(
+        self,
+        page: BatchPage,
+        results: List[Tuple[LeadId, Optional[Tuple], SignalQuality]]
+    ) -> Union[BatchPage, common.Failure]:
+        signals = {leadId: signal for leadId, signal, _ in results if signal is not None}
+        quality = {leadId: leadQuality for leadId, _, leadQuality in results}
+
+        if len(signals) == 0:
+            return common.Failure("Signal extraction failed for every lead")
+
+        return dataclasses.replace(page, signals=signals, quality=quality)
+
+    def _measureScale(self, page: BatchPage) -> Union[BatchPage, common.Failure]:
+        try:
+            pixelsPerMilliVolt, pixelsPerSecond, pageGrid = measurePageScaleAndGrid(page.image, page.parameters)
+        finally:
+            self._buffers.free(page.shared)  # Last stage to need the page itself
+
+        if pixelsPerMilliVolt is None or pixelsPerSecond is None:
+            return common.Failure("Unable to measure the page scale")
+
+        return dataclasses.replace(
+            page, image=None, shared=None, pixelsPerMilliVolt=pixelsPerMilliVolt, pixelsPerSecond=pixelsPerSecond,
+            quality=withGridQuality(page.quality, page.parameters, pageGrid)
+        )
+
+    def _freePage(self, page: BatchPage):
+        # Called by the pipeline for a page that failed or was abandoned while it still held a shared block
+        if page.shared is not None:
+            self._buffers.free(page.shared)
+
+    def _export(self, page: BatchPage) -> ExportedPage:
+        leadSignals = scaleECGLeads(
+            page.signals, page.parameters, page.pixelsPerMilliVolt, page.pixelsPerSecond,
+            self.zeroingMethod, self.outputRate, page.quality
+        )
+        path = outputPath(self.outputDirectory, page)
+        exportSignals(leadSignals, path, separator=self.separator)
+        return ExportedPage(path, leadSignals.quality)
@@ -1,39 +1,119 @@
 from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple
 
 import numpy as np
-from numpy.lib.arraysetops import isin
 
 import ecgdigitize
 import ecgdigitize.signal
 import ecgdigitize.image
-from ecgdigitize import common, visualization
+from ecgdigitize import common, pages, visualization
+from ecgdigitize.grid.page import PageGrid
 from ecgdigitize.image import ColorImage, Rectangle
+from ecgdigitize.signal.quality import SignalQuality, withGridConfidence
 
+import Annotation
+from AnnotationIndex import IndexedAnnotation
 from model.InputParameters import InputParameters
+from model.Lead import Lead, LeadId
+from model.LeadSignals import LeadSignals
 
 
-def convertECGLeads(inputImage: ColorImage, parameters: InputParameters):
-    # Apply rotation
-    rotatedImage = ecgdigitize.image.rotated(inputImage, parameters.rotation)
+def measurePageScaleAndGrid(
+    rotatedImage: ColorImage,
+    parameters: InputParameters
+) -> Tuple[Optional[float], Optional[float], Optional[PageGrid]]:
+    """Finds the vertical (px/mV) and horizontal (px/s) scale of a page.
+
+    Measured factors in `parameters` are used first, then the calibration pulse, and only then the page's grid
+    together with the mm/mV and mm/s settings.
+
+    Returns:
+        Tuple[Optional[float], Optional[float], Optional[PageGrid]]: Pixels per mV and pixels per second (`None` where
+            unavailable), and the page's grid if it had to be measured.
+    """
+    pixelsPerMilliVolt, pixelsPerSecond = parameters.pixelsPerMilliVolt, parameters.pixelsPerSecond
+    pageGrid = None
+
+    if pixelsPerMilliVolt is None or pixelsPerSecond is None:
+        region = Rectangle(*parameters.calibrationRegion) if parameters.calibrationRegion is not None else None
+        pulse = ecgdigitize.detectCalibrationPulse(rotatedImage, region)
+
+        if not isinstance(pulse, common.Failure):
+            pixelsPerMilliVolt = pixelsPerMilliVolt or pulse.pixelsPerMilliVolt
+            pixelsPerSecond = pixelsPerSecond or pulse.pixelsPerSecond
+
+    if pixelsPerMilliVolt is None or pixelsPerSecond is None:
+        # Estimate the grid once for the whole page rather than once per lead crop
+        pageGrid = ecgdigitize.digitizePageGrid(rotatedImage)
+
+        if isinstance(pageGrid, common.Failure):
+            pageGrid = None
+        else:
+            # TODO: Pass in the grid size in mm
+            gridSizeInMillimeters = 1.0
+            pixelsPerMillimeter = pageGrid.period / gridSizeInMillimeters
+            pixelsPerMilliVolt = pixelsPerMilliVolt or pixelsPerMillimeter * parameters.voltScale
+            pixelsPerSecond = pixelsPerSecond or pixelsPerMillimeter * parameters.timeScale
+
+    return pixelsPerMilliVolt, pixelsPerSecond, pageGrid
+
+
+def measurePageScale(
+    rotatedImage: ColorImage,
+    parameters: InputParameters
+) -> Tuple[Optional[float], Optional[float]]:
+    """Pixels per mV and pixels per second of a page (see `measurePageScaleAndGrid`)."""
+    pixelsPerMilliVolt, pixelsPerSecond, _ = measurePageScaleAndGrid(rotatedImage, parameters)
+    return pixelsPerMilliVolt, pixelsPerSecond
+
+
+def withGridQuality(
+    quality: Dict[LeadId, SignalQuality],
+    parameters: InputParameters,
+    pageGrid: Optional[PageGrid]
+) -> Dict[LeadId, SignalQuality]:
+    """Adds the confidence of the page's grid under each lead (unchanged if the grid wasn't measured)."""
+    if pageGrid is None:
+        return quality
+
+    regions = {
+        leadId: Rectangle(lead.x, lead.y, lead.width, lead.height) for leadId, lead in parameters.leads.items()
+    }
+    return {
+        leadId: withGridConfidence(leadQuality, pageGrid, regions[leadId]) for leadId, leadQuality in quality.items()
+    }
 
+
+def extractECGLeads(rotatedImage: ColorImage, parameters: InputParameters):
+    """Digitizes every lead of a straightened page.
+
+    Returns:
+        The signals and preview images of the leads that could be extracted (both `None` if none could), and the
+        quality of every lead's trace, including the ones that failed.
+    """
     # Crop each lead
     leadImages = {
         leadId: ecgdigitize.image.cropped(rotatedImage, Rectangle(lead.x, lead.y, lead.width, lead.height))
         for leadId, lead in parameters.leads.items()
     }
 
-    extractSignal = ecgdigitize.digitizeSignal
-    extractGrid   = ecgdigitize.digitizeGrid
+    extractSignal = ecgdigitize.digitizeSignalWithQuality
 
-    # Map all lead images to signal data
-    signals = {
-        leadId: extractSignal(leadImage)
+    # Map all lead images to signal data (lead labels and the peaks of neighbouring leads are filtered out first, or
+    # the trace can run through them)
+    results = {
+        leadId: extractSignal(leadImage, filteringMethod=ecgdigitize.SignalFilteringMethod.components)
         for leadId, leadImage in leadImages.items()
     }
+    quality = {leadId: leadQuality for leadId, (_, leadQuality) in results.items()}
+    signals = {
+        leadId: signal for leadId, (signal, _) in results.items()
+        if signal is not None and not isinstance(signal, common.Failure)
+    }
 
     # If all signals failed -> Failure
-    if all([isinstance(signal, common.Failure) for _, signal in signals.items()]):
-        return None, None
+    if len(signals) == 0:
+        return None, None, quality
     for leadId, points in signals.items():
         signal,time = points
         print(leadId,signal,time)
@@ -43,77 +123,190 @@ def convertECGLeads(inputImage: ColorImage, parameters: InputParameters):
     # }
 
     previews = {
-        leadId: visualization.overlaySignalOnImage(signal[0], image)
-        for (leadId, image), (_, signal) in zip(leadImages.items(), signals.items())
+        leadId: visualization.overlaySignalOnImage(signal[0], leadImages[leadId])
+        for leadId, signal in signals.items()
     }
 
-    # Map leads to grid size estimates
-    # gridSpacings = {
-    #     leadId: extractGrid(leadImage)
-    #     for leadId, leadImage in leadImages.items()
-    # }
-    # Just got successful spacings
-    spacings = [spacing for spacing in gridSpacings.values() if not isinstance(spacing, common.Failure)]
+    return signals, previews, quality
 
-    if len(spacings) == 0:
-        return None, None
 
-    samplingPeriodInPixels = gridHeightInPixels = common.mean(spacings)
+def scaleECGLeads(
+    signals: dict,
+    parameters: InputParameters,
+    pixelsPerMilliVolt: float,
+    pixelsPerSecond: float,
+    zeroingMethod: ecgdigitize.ZeroingMethod = ecgdigitize.ZeroingMethod.default,
+    outputRate: Optional[float] = None,
+    quality: Optional[Dict[LeadId, SignalQuality]] = None
+) -> LeadSignals:
+    """Zeros, scales and aligns the output of `extractECGLeads` into one (leads × samples) matrix.
+
+    Each lead is written once into its slice of a preallocated matrix (offset by its start time); zeroing, scaling
+    and resampling (to `outputRate` Hz, if given; otherwise one sample per pixel column) are then applied to the
+    whole matrix at once. `quality` (from `extractECGLeads`) is carried along unchanged.
+    """
+    samplingPeriod = ecgdigitize.signal.calibratedSamplingPeriod(pixelsPerSecond)
+
+    leadIds = sorted(signals.keys(), key=lambda leadId: leadId.value)
+    traces = [signals[leadId][0] for leadId in leadIds]
+    starts = [int(parameters.leads[leadId].startTime / samplingPeriod) for leadId in leadIds]
+    ends = [start + len(trace) for start, trace in zip(starts, traces)]
+
+    # Padding is NaN while zeroing so that it is ignored by the baseline estimators
+    matrix = np.full((len(leadIds), max(ends)), np.nan, dtype=np.float32)
+    for row, trace in enumerate(traces):
+        matrix[row, starts[row]:ends[row]] = trace
 
     # Scale signals
-    # TODO: Scale According to px/mv/ms fiducials
-    scaledSignals = {
-        leadId: ecgdigitize.signal.verticallyScaleECGSignal(
-            ecgdigitize.signal.zeroECGSignal(signal[0]),
-            gridHeightInPixels,
-            parameters.voltScale, gridSizeInMillimeters=1.0
+    matrix = ecgdigitize.signal.verticallyScaleECGSignalByCalibration(
+        ecgdigitize.zeroSignals(matrix, zeroingMethod),
+        pixelsPerMilliVolt
+    )
+
+    # Zero pad all signals on the left (start times) and on the right (to the longest lead)
+    for row in range(len(leadIds)):
+        matrix[row, :starts[row]] = 0
+        matrix[row, ends[row]:] = 0
+
+    if outputRate is not None:
+        matrix, samplingPeriod = ecgdigitize.signal.resampleSignals(matrix, samplingPeriod, outputRate)
+
+    return LeadSignals(leadIds, matrix, samplingPeriod, quality if quality is not None else {})
+
+
+def convertECGLeads(
+    inputImage: ColorImage,
+    parameters: InputParameters,
+    zeroingMethod: ecgdigitize.ZeroingMethod = ecgdigitize.ZeroingMethod.default,
+    outputRate: Optional[float] = None
+) -> Tuple[LeadSignals, Optional[dict]]:
+    """Digitizes and scales every lead of a page.
+
+    Returns:
+        Tuple[LeadSignals, Optional[dict]]: The signals and the preview image of each lead. If no lead could be
+            extracted or the page's scale couldn't be measured, the signals are `LeadSignals.failed` (which still
+            carries the quality of every lead) and there are no previews.
+    """
+    # Apply rotation
+    rotatedImage = ecgdigitize.image.rotated(inputImage, parameters.rotation)
+
+    signals, previews, quality = extractECGLeads(rotatedImage, parameters)
+    if signals is None:
+        return LeadSignals.failed(quality), None
+
+    pixelsPerMilliVolt, pixelsPerSecond, pageGrid = measurePageScaleAndGrid(rotatedImage, parameters)
+    quality = withGridQuality(quality, parameters, pageGrid)
+
+    if pixelsPerMilliVolt is None or pixelsPerSecond is None:
+        return LeadSignals.failed(quality), None
+
+    scaledSignals = scaleECGLeads(
+        signals, parameters, pixelsPerMilliVolt, pixelsPerSecond, zeroingMethod, outputRate, quality
+    )
+    return scaledSignals, previews
+
+
+def detectInputParameters(
+    inputImage: ColorImage,
+    rotation: Optional[float] = None,
+    timeScale: int = 25,
+    voltScale: int = 10
+) -> Optional[InputParameters]:
+    """Proposes input parameters for a page without an annotation by detecting its lead layout.
+
+    Args:
+        rotation (Optional[float], optional): Rotation to apply to the page. Estimated when `None`.
+
+    Returns:
+        Optional[InputParameters]: The proposed parameters, or `None` if the layout couldn't be detected.
+    """
+    if rotation is None:
+        rotation = ecgdigitize.estimateRotationAngle(inputImage) or 0
+
+    rotatedImage = ecgdigitize.image.rotated(inputImage, rotation)
+    regions = ecgdigitize.detectLeadLayout(rotatedImage)
+
+    if isinstance(regions, common.Failure):
+        return None
+
+    leads = {
+        LeadId[region.name]: Lead(
+            region.region.x, region.region.y, region.region.width, region.region.height, region.startTime
         )
-        for leadId, signal in signals.items()
+        for region in regions
     }
 
-    # TODO: Pass in the grid size in mm
-    samplingPeriod = ecgdigitize.signal.ecgSignalSamplingPeriod(samplingPeriodInPixels, parameters.timeScale, gridSizeInMillimeters=1.0)
+    return InputParameters(rotation=rotation, timeScale=timeScale, voltScale=voltScale, leads=leads)
 
-    # 3. Zero pad all signals on the left based on their start times and the samplingPeriod
-    # take the max([len(x) for x in signals]) and zero pad all signals on the right
-    paddedSignals = {
-        leadId: common.padLeft(signal, int(parameters.leads[leadId].startTime / samplingPeriod))
-        for leadId, signal in scaledSignals.items()
-    }
 
-    # (should already be handled by (3)) Replace any None signals with all zeros
-    maxLength = max([len(s) for _, s in paddedSignals.items()])
-    fullSignals = {
-        leadId: common.padRight(signal, maxLength - len(signal))
-        for leadId, signal in paddedSignals.items()
-    }
-    fullSignals["samplingPeriod"]=samplingPeriod
+def convertECGPages(
+    path: Path,
+    detectLayout: bool = False,
+    zeroingMethod: ecgdigitize.ZeroingMethod = ecgdigitize.ZeroingMethod.default,
+    outputRate: Optional[float] = None
+) -> Iterator[Tuple[int, Optional[LeadSignals], Optional[dict]]]:
+    """Digitizes every annotated page of a (possibly multi-page) file, keeping only one page in memory at a time.
 
-    return fullSignals, previews
+    Each page uses its own saved annotation (see `Annotation.annotationPath`). Pages without one are skipped, unless
+    `detectLayout` is set, in which case their lead layout is detected automatically.
 
+    Yields:
+        Tuple[int, Optional[LeadSignals], Optional[dict]]: The page index, and the signals and preview images returned
+            by `convertECGLeads` for that page (both `None` if no lead layout was found).
+    """
+    pageCount = pages.countPages(path)
 
-def exportSignals(leadSignals, filePath, separator='\t'):
-    """Exports a dict of lead signals to file
+    for index in range(pageCount):
+        annotationPath = Annotation.annotationPath(path, index if pageCount > 1 else None)
+        if not annotationPath.exists() and not detectLayout:
+            continue  # Don't bother decoding pages that haven't been annotated
 
-    Args:
-        leadSignals (Dict[str -> np.ndarray]): Dict mapping lead id's to np array of signal data (output from convertECGLeads)
+        page = pages.openPage(path, index)
+
+        if annotationPath.exists():
+            parameters = Annotation.loadInputParameters(annotationPath)
+        else:
+            parameters = detectInputParameters(page)
+            if parameters is None:
+                yield index, None, None
+                continue
+
+        signals, previews = convertECGLeads(page, parameters, zeroingMethod, outputRate)
+        yield index, signals, previews
+
+
+def convertIndexedAnnotations(
+    records: Iterable[IndexedAnnotation],
+    zeroingMethod: ecgdigitize.ZeroingMethod = ecgdigitize.ZeroingMethod.default,
+    outputRate: Optional[float] = None
+) -> Iterator[Tuple[IndexedAnnotation, Optional[LeadSignals], Optional[dict]]]:
+    """Digitizes the pages found by an `AnnotationIndex` query, one page in memory at a time.
+
+    Yields:
+        Tuple[IndexedAnnotation, Optional[LeadSignals], Optional[dict]]: The record, and the signals and preview images
+            returned by `convertECGLeads`.
     """
+    for record in records:
+        page = pages.openPage(record.imagePath, record.page or 0)
+        parameters = Annotation.annotationInputParameters(record.annotation)
+
+        signals, previews = convertECGLeads(page, parameters, zeroingMethod, outputRate)
+        yield record, signals, previews
 
-    samplingPeriod=leadSignals["samplingPeriod"]
-    leads = common.zipDict(leadSignals)
-    for lead,signal in leads:
-        print(lead,type(signal))
-    leads = common.filterList(leads,lambda pair:type(pair[1])==np.ndarray)
-    leads.sort(key=lambda pair: pair[0].value)
 
-    assert len(leads) >= 1
-    lengthOfFirst = len(leads[0][1])
+def exportSignals(leadSignals: LeadSignals, filePath, separator='\t'):
+    """Exports the lead signals of a page to file
+
+    Args:
+        leadSignals (LeadSignals): Matrix of lead signals (output from convertECGLeads)
+    """
+
+    samplingPeriod = leadSignals.samplingPeriod
 
-    assert all([len(signal) == lengthOfFirst for key, signal in leads])
+    assert len(leadSignals.leadIds) >= 1
 
-    header = separator.join([str(leadId) for leadId,_ in leads])+"\n"
-    collated = np.array([signal for _, signal in leads])
-    output = np.swapaxes(collated, 0, 1)
+    header = separator.join([str(leadId) for leadId in leadSignals.leadIds])+"\n"
+    output = leadSignals.signals.T  # A view; one row per sample
 
     if not issubclass(type(filePath), Path):
         filePath = Path(filePath)
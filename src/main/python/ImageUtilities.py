@@ -5,15 +5,17 @@ Created November 9, 2020
 -
 """
 from pathlib import Path
-from typing import Tuple
+from typing import TYPE_CHECKING
 
-import cv2
-import numpy as np
 from PyQt5 import QtGui
-import scipy.stats as stats
 
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def readImage(path: Path) -> 'np.ndarray':
+    import cv2  # Deferred so that OpenCV isn't loaded before the window appears
 
-def readImage(path: Path) -> np.ndarray:
     return cv2.imread(str(path.absolute()))
 
 
@@ -8,8 +8,9 @@ Entry point for the application
 import sys
 
 from fbs_runtime.application_context.PyQt5 import ApplicationContext
+from PyQt5 import QtCore
 
-from controllers.MainController import MainController
+from controllers.MainController import MainController, preloadDigitization
 
 
 if __name__ == '__main__':
@@ -22,6 +23,9 @@ if __name__ == '__main__':
     # Launch the main controller and window
     controller = MainController()
 
+    # Once the window is on screen, load the digitization stack in the background
+    QtCore.QTimer.singleShot(0, preloadDigitization)
+
     # Hang
     exit_code = context.app.exec_()
 
@@ -5,27 +5,50 @@ Created November 9, 2020
 Controls the primary window, including the menu bar and the editor.
 """
 from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Optional
 
-import cv2
 import json
-import dataclasses
+import threading
 import webbrowser
 from PyQt5 import QtWidgets
 
-from ecgdigitize.image import ColorImage, openImage
-
-from Conversion import convertECGLeads, exportSignals
 from views.MainWindow import MainWindow
-from views.ImageView import *
-from views.EditorWidget import *
-from views.ROIView import *
-from views.ExportFileDialog import *
-from QtWrapper import *
+from views.ExportFileDialog import ExportFileDialog
+from views.MessageDialog import MessageDialog
 import Annotation
 from model.Lead import Lead, LeadId
 import datetime
 from model.InputParameters import InputParameters
 
+# The digitization stack (ecgdigitize, OpenCV, SciPy) is only imported where it is used, so that the window appears
+# without waiting for it; `preloadDigitization` warms it up in the background once the window is shown.
+if TYPE_CHECKING:
+    from ecgdigitize.image import ColorImage
+    from ecgdigitize.signal.quality import SignalQuality
+
+
+def preloadDigitization():
+    """Imports the digitization stack on a background thread, so it is ready by the time the user needs it."""
+    def load():
+        import Conversion  # noqa: F401 (pulls in ecgdigitize, OpenCV and NumPy)
+        import scipy.signal  # noqa: F401 (imported by ecgdigitize on first use)
+
+    threading.Thread(target=load, name="preloadDigitization", daemon=True).start()
+
+
+def qualityReport(quality: Dict[LeadId, 'SignalQuality']) -> str:
+    """One line per lead describing how well its trace was found."""
+    lines = []
+    for leadId, leadQuality in sorted(quality.items(), key=lambda item: item[0].value):
+        if leadQuality.gapFraction >= 1:
+            lines.append(f"{leadId.name}: no trace found")
+        else:
+            lines.append(
+                f"{leadId.name}: {leadQuality.gapFraction:.0%} of the trace off the signal, "
+                f"{leadQuality.clippedFraction:.0%} at the edge of the box"
+            )
+    return "\n".join(lines)
+
 
 class MainController:
 
@@ -33,7 +56,8 @@ class MainController:
         self.window = MainWindow()
         self.connectUI()
         self.openFile = None
-        self.openImage: Optional[ColorImage] = None
+        self.openPage: Optional[int] = None  # Index of the open page of a multi-page file (`None` for single images)
+        self.openImage: Optional['ColorImage'] = None
 
     def connectUI(self):
         """
@@ -43,6 +67,7 @@ class MainController:
         self.window.fileMenuClose.triggered.connect(self.closeImageFile)
         self.window.editor.processEcgData.connect(self.confirmDigitization)
         self.window.editor.saveAnnotationsButtonClicked.connect(self.saveAnnotations)
+        self.window.autoDetectLeads.triggered.connect(self.autoDetectLeads)
 
         self.window.reportIssueButton.triggered.connect(lambda: webbrowser.open('https://github.com/Tereshchenkolab/paper-ecg/issues'))
         self.window.userGuideButton.triggered.connect(lambda: webbrowser.open('https://github.com/Tereshchenkolab/paper-ecg/blob/master/USER-GUIDE.md'))
@@ -51,17 +76,46 @@ class MainController:
 
         # Per pathlib documentation, if no selection is made then Path('.') is returned
         #  https://docs.python.org/3/library/pathlib.html
-        path = Path(self.openFileBrowser("Open File", "Images (*.png *.jpg *.jpeg *.tif *.tiff)"))
+        path = Path(self.openFileBrowser("Open File", "Images (*.png *.jpg *.jpeg *.tif *.tiff *.pdf)"))
 
         if path != Path('.'):
-            self.window.editor.loadImageFromPath(path)
+            from ecgdigitize import pages
+
+            try:
+                pageCount = pages.countPages(path)
+            except ImportError as error:  # PDF support (PyMuPDF) is not installed
+                MessageDialog(message=f"Error: Unable to open {path.name}\n\n{error}", title="Error").exec_()
+                return
+
+            page = self.choosePage(path, pageCount)
+            if pageCount > 1 and page is None:
+                return
+
+            # Decode once; the editor displays the same pixel data that is later digitized
+            self.openImage = pages.openPage(path, page or 0)
+            self.window.editor.loadImage(self.openImage.data)
             self.window.editor.resetImageEditControls()
             self.openFile = path
-            self.openImage = openImage(path)
+            self.openPage = page
             self.attempToLoadAnnotations()
         else:
             print("[Warning] No image selected")
 
+    def choosePage(self, path: Path, pageCount: int) -> Optional[int]:
+        """Asks which page of a multi-page file (PDF or TIFF) to open.
+
+        Returns:
+            Optional[int]: The page index, or `None` if the file has a single page or the user cancelled.
+        """
+        if pageCount <= 1:
+            return None
+
+        number, accepted = QtWidgets.QInputDialog.getInt(
+            self.window, "Open Page", f"{path.name} has {pageCount} pages. Page to open:", 1, 1, pageCount
+        )
+
+        return number - 1 if accepted else None
+
     def openFileBrowser(self, caption: str, fileType: str, initialPath: str ="") -> str:
         """Launches a file browser for the user to select a file to open.
 
@@ -86,10 +140,38 @@ class MainController:
         """Closes out current image file and resets editor controls."""
         self.window.editor.removeImage()
         self.window.editor.deleteAllLeadRois()
+        self.window.editor.deleteAllScaleBoxes()  # Their scale factors must not carry over to the next image
         self.window.editor.resetImageEditControls()
         self.openFile = None
+        self.openPage = None
         self.openImage = None
 
+    def autoDetectLeads(self):
+        if self.openImage is None:
+            return
+
+        from Conversion import detectInputParameters
+
+        inputParameters = detectInputParameters(
+            self.openImage,
+            rotation=self.window.editor.EditPanelGlobalView.getRotation()
+        )
+
+        if inputParameters is None:
+            errorDialog = MessageDialog(
+                message="Error: Unable to detect the lead layout\n\nPlease add the leads manually",
+                title="Error"
+            )
+            errorDialog.exec_()
+            return
+
+        for leadId, lead in inputParameters.leads.items():
+            # Leave any boxes the user has already placed alone
+            if self.window.leadButtons[leadId].isEnabled():
+                self.window.editor.addLead(
+                    leadId, x=lead.x, y=lead.y, width=lead.width, height=lead.height, startTime=lead.startTime
+                )
+
     def confirmDigitization(self):
         inputParameters = self.getCurrentInputParameters()
 
@@ -119,23 +201,53 @@ class MainController:
         if self.window.editor.image is None:
             raise Exception("IMAGE NOT AVAILABLE WHEN `processEcgData` CALLED")
 
-        extractedSignals, previewImages = convertECGLeads(self.openImage, inputParameters)
+        import ecgdigitize
+        from ecgdigitize.image import rotated
+        from Conversion import extractECGLeads, measurePageScaleAndGrid, scaleECGLeads, withGridQuality
+
+        rotatedImage = rotated(self.openImage, inputParameters.rotation)
+        extractedSignals, previewImages, quality = extractECGLeads(rotatedImage, inputParameters)
+
+        if extractedSignals is not None:
+            pixelsPerMilliVolt, pixelsPerSecond, pageGrid = measurePageScaleAndGrid(rotatedImage, inputParameters)
+            quality = withGridQuality(quality, inputParameters, pageGrid)
+
+        if extractedSignals is None or pixelsPerMilliVolt is None or pixelsPerSecond is None:
+            if extractedSignals is None:
+                reason = "No trace could be found in any lead"
+            else:
+                reason = "The page scale could not be measured (add a calibration box or scale boxes)"
 
-        if extractedSignals is None:
             errorDialog = MessageDialog(
-                message="Error: Signal Processing Failed\n\nPlease check your lead selection boxes",
+                message="Error: Signal Processing Failed\n\n" + reason + "\n\n" + qualityReport(quality) +
+                    "\n\nPlease check your lead selection boxes",
                 title="Error"
             )
             errorDialog.exec_()
         else:
             exportFileDialog = ExportFileDialog(previewImages)
             if exportFileDialog.exec_():
-                self.exportECGData(exportFileDialog.fileExportPath, exportFileDialog.delimiterDropdown.currentText(), extractedSignals)
+                # Zeroing is chosen per export, so it is applied only once the dialog is confirmed
+                zeroingMap = {
+                    "Mode": ecgdigitize.ZeroingMethod.default,
+                    "Median": ecgdigitize.ZeroingMethod.median,
+                    "Sliding Median": ecgdigitize.ZeroingMethod.slidingMedian
+                }
+                zeroingMethod = zeroingMap[exportFileDialog.baselineDropdown.currentText()]
+                rateMap = {"Scan Resolution": None, "250 Hz": 250.0, "500 Hz": 500.0, "1000 Hz": 1000.0}
+                outputRate = rateMap[exportFileDialog.sampleRateDropdown.currentText()]
+                scaledSignals = scaleECGLeads(
+                    extractedSignals, inputParameters, pixelsPerMilliVolt, pixelsPerSecond, zeroingMethod, outputRate,
+                    quality
+                )
+                self.exportECGData(exportFileDialog.fileExportPath, exportFileDialog.delimiterDropdown.currentText(), scaledSignals)
 
     def exportECGData(self, exportPath, delimiter, extractedSignals):
         seperatorMap = {"Comma":',', "Tab":'\t', "Space":' '}
         assert delimiter in seperatorMap, f"Unrecognized delimiter {delimiter}"
 
+        from Conversion import exportSignals
+
         exportSignals(extractedSignals, exportPath, separator=seperatorMap[delimiter])
 
     def saveAnnotations(self):
@@ -158,12 +270,12 @@ class MainController:
                 lead.startTime
             )
 
-        metadataDirectory = self.openFile.parent / '.paperecg'
+        filePath = Annotation.annotationPath(self.openFile, self.openPage)
+
+        metadataDirectory = filePath.parent
         if not metadataDirectory.exists():
             metadataDirectory.mkdir()
 
-        filePath = metadataDirectory / (self.openFile.stem + '-' + self.openFile.suffix[1:] + '.json')
-
         print("leads\n", inputParameters.leads.items())
 
         leads = {
@@ -190,11 +302,7 @@ class MainController:
 
         assert self.openFile is not None
 
-        metadataDirectory = self.openFile.parent / '.paperecg'
-        if not metadataDirectory.exists():
-            return
-
-        filePath = metadataDirectory / (self.openFile.stem + '-' + self.openFile.suffix[1:] + '.json')
+        filePath = Annotation.annotationPath(self.openFile, self.openPage)
         if not filePath.exists():
             return
 
@@ -207,11 +315,15 @@ class MainController:
         self.window.editor.loadSavedState(data)
 
     def getCurrentInputParameters(self):
+        pixelsPerMilliVolt, pixelsPerSecond = self.window.editor.imageViewer.getScaleFactors()
         return InputParameters(
             rotation=self.window.editor.EditPanelGlobalView.getRotation(),
             timeScale=self.window.editor.EditPanelGlobalView.timeScaleSpinBox.value(),
             voltScale=self.window.editor.EditPanelGlobalView.voltScaleSpinBox.value(),
-            leads=self.window.editor.imageViewer.getAllLeadRoisAsDict()
+            leads=self.window.editor.imageViewer.getAllLeadRoisAsDict(),
+            pixelsPerMilliVolt=pixelsPerMilliVolt,
+            pixelsPerSecond=pixelsPerSecond,
+            calibrationRegion=self.window.editor.imageViewer.getCalibrationRegion()
         )
 
 
@@ -1,8 +1,19 @@
 from .ecgdigitize import \
     estimateRotationAngle, \
     SignalDetectionMethod, \
+    SignalFilteringMethod, \
     SignalExtractionMethod, \
+    SignalRefinementMethod, \
     digitizeSignal, \
+    digitizeSignalWithQuality, \
+    ZeroingMethod, \
+    zeroSignals, \
     GridDetectionMethod, \
     GridExtractionMethod, \
-    digitizeGrid
\ No newline at end of file
+    digitizeGrid, \
+    digitizePageGrid, \
+    detectLeadLayout, \
+    detectCalibrationPulse
+from .preprocessing import PreprocessedImage, preprocess
+from .sharing import SharedImage, SharedPageBuffers, attachImage
+from .pipeline import Pipeline, Stage, StageStatistics
@@ -0,0 +1,151 @@
+"""
+calibration.py
+Created October 19, 2026
+
+Finds the calibration pulse (the square 1 mV step printed beside the leads) and derives the page's voltage and time
+scale from it.
+"""
+from dataclasses import dataclass
+from typing import Union
+
+import cv2
+import numpy as np
+
+from . import common
+from .image import BinaryImage, Rectangle
+
+
+@dataclass(frozen=True)
+class CalibrationPulse:
+    region: Rectangle          # Bounding box of the pulse, centered on its strokes
+    pixelsPerMilliVolt: float
+    pixelsPerSecond: float
+
+
+def verticalRuns(mask: np.ndarray) -> np.ndarray:
+    """Finds every vertical run of set pixels.
+
+    Returns:
+        np.ndarray: (N, 3) array of `[column, top, bottom]`, with `bottom` exclusive, sorted by column then top.
+    """
+    padded = np.pad(mask.astype(np.int8), ((1, 1), (0, 0)))
+    edges = np.diff(padded, axis=0).T  # Transposed so that `nonzero` walks down each column in turn
+
+    startColumns, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+
+    return np.stack([startColumns, starts, ends], axis=1)
+
+
+def _edgeCenter(runs: np.ndarray, column: int, top: int, bottom: int, tolerance: int) -> float:
+    """The center column of the (possibly several pixel thick) vertical stroke containing `column`."""
+    matching = runs[(np.abs(runs[:, 1] - top) <= tolerance) & (np.abs(runs[:, 2] - bottom) <= tolerance)]
+    columns = np.unique(matching[:, 0])
+
+    # Keep only the columns contiguous with `column`
+    position = np.searchsorted(columns, column)
+    breaks = np.flatnonzero(np.diff(columns) > 1)
+    first = breaks[breaks < position][-1] + 1 if np.any(breaks < position) else 0
+    last = breaks[breaks >= position][0] if np.any(breaks >= position) else len(columns) - 1
+
+    return float(np.mean(columns[first:last + 1]))
+
+
+def findCalibrationPulse(
+    signalMask: BinaryImage,
+    pulseAmplitude: float = 1.0,
+    pulseDuration: float = 0.2,
+    minimumHeight: int = 20,
+    tolerance: int = 2
+) -> Union[CalibrationPulse, common.Failure]:
+    """Finds a calibration pulse among the signal pixels of a page (or a region around the pulse).
+
+    A pulse is a pair of vertical strokes of the same height whose tops are joined by a horizontal stroke, whose
+    interior is empty and whose bottoms continue outwards along the baseline (which sets it apart from text). Every
+    vertical run on the page is found at once and all pairs of tall runs are checked together, so no per-lead grid
+    estimate is needed.
+
+    Args:
+        signalMask (BinaryImage): Signal pixels, ex: from `signal.detection.adaptive`.
+        pulseAmplitude (float, optional): Height of the pulse in mV. Defaults to 1.0.
+        pulseDuration (float, optional): Width of the pulse in seconds. Defaults to 0.2.
+        minimumHeight (int, optional): Shortest stroke (in pixels) considered an edge of the pulse. Defaults to 20.
+        tolerance (int, optional): Allowed mismatch (in pixels) between the two edges. Defaults to 2.
+
+    Returns:
+        Union[CalibrationPulse, common.Failure]: The pulse and the scale factors it implies.
+    """
+    mask = signalMask.data > 0
+    runs = verticalRuns(mask)
+    tall = runs[(runs[:, 2] - runs[:, 1]) >= minimumHeight]
+
+    if len(tall) < 2:
+        return common.Failure("No vertical strokes tall enough to be a calibration pulse.")
+
+    # Tolerate small wobbles in the horizontal strokes
+    thickened = cv2.dilate(mask.astype(np.uint8), np.ones((2 * tolerance + 1, 1), np.uint8)) > 0
+    cumulative = np.pad(np.cumsum(thickened, axis=1, dtype=np.int32), ((0, 0), (1, 0)))
+
+    # Every ordered pair of tall strokes, left to right
+    left, right = np.triu_indices(len(tall), k=1)
+    left, right = tall[left], tall[right]
+    width = right[:, 0] - left[:, 0]
+    height = left[:, 2] - left[:, 1]
+
+    candidate = (
+        (width >= 3) &
+        (np.abs(left[:, 1] - right[:, 1]) <= tolerance) &
+        (np.abs(left[:, 2] - right[:, 2]) <= tolerance) &
+        (width <= 2 * height) & (height <= 5 * width)
+    )
+    left, right, width, height = left[candidate], right[candidate], width[candidate], height[candidate]
+
+    if len(left) == 0:
+        return common.Failure("No pair of strokes is shaped like a calibration pulse.")
+
+    def coverage(rows: np.ndarray, start: np.ndarray, stop: np.ndarray) -> np.ndarray:
+        start, stop = np.clip(start, 0, mask.shape[1]), np.clip(stop, 0, mask.shape[1])
+        return (cumulative[rows, stop] - cumulative[rows, start]) / np.maximum(stop - start, 1)
+
+    topCoverage = coverage(left[:, 1], left[:, 0] + 1, right[:, 0])
+    middleCoverage = coverage((left[:, 1] + left[:, 2]) // 2, left[:, 0] + 1, right[:, 0])
+
+    # The baseline leading into or out of the pulse
+    baseline = left[:, 2] - 1 - tolerance
+    reach = np.maximum(width // 2, 2)
+    leadingCoverage = coverage(baseline, left[:, 0] - reach, left[:, 0])
+    trailingCoverage = coverage(baseline, right[:, 0] + 1, right[:, 0] + 1 + reach)
+
+    valid = (
+        (topCoverage >= 0.9) & (middleCoverage <= 0.1) &
+        (np.maximum(leadingCoverage, trailingCoverage) >= 0.9)
+    )
+    if not np.any(valid):
+        return common.Failure("No pair of strokes is joined at the top like a calibration pulse.")
+
+    # Prefer the most complete top stroke, then the largest pulse (the outermost columns of thick strokes)
+    best = np.lexsort((width * height, topCoverage.round(2), valid))[-1]
+    column, top, bottom = left[best]
+
+    leftCenter = _edgeCenter(tall, column, top, bottom, tolerance)
+    rightCenter = _edgeCenter(tall, right[best, 0], right[best, 1], right[best, 2], tolerance)
+
+    # The strokes run from the bottom of the baseline to the top of the horizontal stroke; measure between centers
+    middleColumn = int(round((leftCenter + rightCenter) / 2))
+    middleRuns = runs[runs[:, 0] == middleColumn]
+    topStroke = middleRuns[np.abs(middleRuns[:, 1] - top) <= tolerance]
+    thickness = float(topStroke[0, 2] - topStroke[0, 1]) if len(topStroke) > 0 else 1.0
+
+    pulseWidth = rightCenter - leftCenter
+    pulseHeight = (bottom - top) - thickness
+
+    if pulseWidth <= 0 or pulseHeight <= 0:
+        return common.Failure("Calibration pulse has no extent.")
+
+    return CalibrationPulse(
+        region=Rectangle(
+            int(round(leftCenter)), int(round(top + thickness / 2)), int(round(pulseWidth)), int(round(pulseHeight))
+        ),
+        pixelsPerMilliVolt=pulseHeight / pulseAmplitude,
+        pixelsPerSecond=pulseWidth / pulseDuration
+    )
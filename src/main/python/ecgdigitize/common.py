@@ -89,7 +89,9 @@ def shiftedPairs(signal: Union[List, np.ndarray], limit: Optional[int] = None) -
 
 
 def autocorrelation(signal: np.ndarray, limit: int = None) -> np.ndarray:
-    return np.array([np.corrcoef(x, y)[0][1] for x, y in shiftedPairs(signal, limit)])
+    # Offsets where either side is constant (ex: a blank image) have no correlation and are NaN
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.array([np.corrcoef(x, y)[0][1] for x, y in shiftedPairs(signal, limit)])
 
 
 def zipDict(dictionary: Dict) -> Iterable[Tuple[Any, Any]]:
@@ -1,20 +1,32 @@
-from typing import Optional, Union
-from dataclasses import dataclass
+from typing import List, Optional, Tuple, Union
+from dataclasses import dataclass, replace
 from enum import Enum
 
 import numpy as np
 
-from ecgdigitize.image import ColorImage
+from ecgdigitize.image import ColorImage, Rectangle, cropped
 from . import common
+from .preprocessing import PreprocessedImage, preprocess
 from .grid import detection as grid_detection
 from .grid import extraction as grid_extraction
+from .grid import page as grid_page
 from .signal import detection as signal_detection
+from .signal import refinement as signal_refinement
+from .signal import baseline as signal_baseline
+from .signal import signal as signal_signal
+from .signal import quality as signal_quality
 from .signal.extraction import viterbi
 from . import vision
+from . import layout
+from . import calibration
 
 
-def estimateRotationAngle(image: ColorImage, houghThresholdFraction: float = 0.25) -> Optional[float]:
-    binaryImage = grid_detection.thresholdApproach(image)
+def estimateRotationAngle(
+    image: ColorImage,
+    houghThresholdFraction: float = 0.25,
+    preprocessed: Optional[PreprocessedImage] = None
+) -> Optional[float]:
+    binaryImage = grid_detection.thresholdApproach(image, preprocessed=preprocessed)
 
     houghThreshold = int(image.width * houghThresholdFraction)
     lines = vision.houghLines(binaryImage, houghThreshold)
@@ -36,57 +48,198 @@ def estimateRotationAngle(image: ColorImage, houghThresholdFraction: float = 0.2
 
 class SignalDetectionMethod(Enum):
     default = 'default'
+    colorSeparation = 'colorSeparation'
+
+
+class SignalFilteringMethod(Enum):
+    none = 'none'
+    components = 'components'
 
 
 class SignalExtractionMethod(Enum):
     default = 'default'
+    banded = 'banded'
+    streaming = 'streaming'
 
 
-def digitizeSignal(
+class SignalRefinementMethod(Enum):
+    none = 'none'
+    centroid = 'centroid'
+    gaussian = 'gaussian'
+
+
+def _digitizeSignal(
     image: ColorImage,
-    detectionMethod: SignalDetectionMethod = SignalDetectionMethod.default,
-    extractionMethod: SignalExtractionMethod = SignalExtractionMethod.default
-) -> Union[np.ndarray, common.Failure]:
+    detectionMethod: SignalDetectionMethod,
+    filteringMethod: SignalFilteringMethod,
+    extractionMethod: SignalExtractionMethod,
+    refinementMethod: SignalRefinementMethod,
+    preprocessed: Optional[PreprocessedImage]
+) -> Tuple[Optional[Tuple[np.ndarray, np.ndarray]], signal_quality.SignalQuality]:
+    # Grayscale, histogram and thresholds are computed once and shared by every stage below
+    preprocessed = preprocessed if preprocessed is not None else preprocess(image)
+
     # First, convert color image to binary image where signal pixels are turned on (1) and other are off (0)
     if detectionMethod == SignalDetectionMethod.default:
-        binary = signal_detection.adaptive(image)
+        binary = signal_detection.adaptive(image, preprocessed=preprocessed)
+    elif detectionMethod == SignalDetectionMethod.colorSeparation:
+        binary = signal_detection.colorSeparation(image)
     else:
         raise ValueError("Unrecognized SignalDetectionMethod in `digitizeSignal`")
 
+    # Optionally, drop components that aren't part of the trace (labels, neighbouring leads, grid fragments)
+    filtered = None
+    if filteringMethod == SignalFilteringMethod.none:
+        pass
+    elif filteringMethod == SignalFilteringMethod.components:
+        filtered = signal_detection.filterComponents(binary)
+        binary = filtered.mask
+    else:
+        raise ValueError("Unrecognized SignalFilteringMethod in `digitizeSignal`")
+
     # Second, analyze the binary image to produce a signal
     if extractionMethod == SignalExtractionMethod.default:
         signal = viterbi.extractSignal(binary)
+    elif extractionMethod == SignalExtractionMethod.banded:
+        signal = viterbi.extractSignalBanded(binary)
+    elif extractionMethod == SignalExtractionMethod.streaming:
+        signal = viterbi.extractSignalStreaming(binary)
     else:
         raise ValueError("Unrecognized SignalExtractionMethod in `digitizeSignal`")
 
+    # Judge the path the extractor chose (before any refinement moves it off the pixel grid)
+    quality = signal_quality.assessSignal(binary, signal[0] if signal is not None else None)
+    if filtered is not None:
+        quality = signal_quality.withFiltering(quality, filtered)
+
+    # Optionally, use the grayscale intensity around the trace to get subpixel precision
+    if refinementMethod == SignalRefinementMethod.none or signal is None:
+        pass
+    elif refinementMethod == SignalRefinementMethod.centroid:
+        trace, time = signal
+        signal = signal_refinement.centroidRefinement(trace, preprocessed.grayscale), time
+    elif refinementMethod == SignalRefinementMethod.gaussian:
+        trace, time = signal
+        signal = signal_refinement.gaussianRefinement(trace, preprocessed.grayscale), time
+    else:
+        raise ValueError("Unrecognized SignalRefinementMethod in `digitizeSignal`")
+
+    return signal, quality
+
+
+def digitizeSignal(
+    image: ColorImage,
+    detectionMethod: SignalDetectionMethod = SignalDetectionMethod.default,
+    filteringMethod: SignalFilteringMethod = SignalFilteringMethod.none,
+    extractionMethod: SignalExtractionMethod = SignalExtractionMethod.default,
+    refinementMethod: SignalRefinementMethod = SignalRefinementMethod.none,
+    preprocessed: Optional[PreprocessedImage] = None
+) -> Union[np.ndarray, common.Failure]:
+    signal, _ = _digitizeSignal(image, detectionMethod, filteringMethod, extractionMethod, refinementMethod, preprocessed)
     return signal
 
 
+def digitizeSignalWithQuality(
+    image: ColorImage,
+    detectionMethod: SignalDetectionMethod = SignalDetectionMethod.default,
+    filteringMethod: SignalFilteringMethod = SignalFilteringMethod.none,
+    extractionMethod: SignalExtractionMethod = SignalExtractionMethod.default,
+    refinementMethod: SignalRefinementMethod = SignalRefinementMethod.none,
+    preprocessed: Optional[PreprocessedImage] = None
+) -> Tuple[Optional[Tuple[np.ndarray, np.ndarray]], signal_quality.SignalQuality]:
+    """Like `digitizeSignal`, but also returns quality metrics of the trace (even when extraction fails)."""
+    return _digitizeSignal(image, detectionMethod, filteringMethod, extractionMethod, refinementMethod, preprocessed)
+
+
+class ZeroingMethod(Enum):
+    default = 'default'
+    median = 'median'
+    slidingMedian = 'slidingMedian'
+
+
+def zeroSignals(signals: np.ndarray, zeroingMethod: ZeroingMethod = ZeroingMethod.default) -> np.ndarray:
+    # Works on a single signal or a whole (leads × samples) matrix; NaN samples (gaps, padding) are ignored
+    if zeroingMethod == ZeroingMethod.default:
+        return signal_signal.zeroECGSignal(signals, signal_baseline.histogramMode)
+    elif zeroingMethod == ZeroingMethod.median:
+        return signal_signal.zeroECGSignal(signals, signal_baseline.nanMedian)
+    elif zeroingMethod == ZeroingMethod.slidingMedian:
+        return signal_signal.zeroECGSignal(signals, signal_baseline.slidingMedianBaseline)
+    else:
+        raise ValueError("Unrecognized ZeroingMethod in `zeroSignals`")
+
+
 class GridDetectionMethod(Enum):
     default = 'default'
 
 
 class GridExtractionMethod(Enum):
     default = 'default'
+    spectrum = 'spectrum'
 
 
 def digitizeGrid(
     image: ColorImage,
     detectionMethod: GridDetectionMethod = GridDetectionMethod.default,
-    extractionMethod: GridExtractionMethod = GridExtractionMethod.default
+    extractionMethod: GridExtractionMethod = GridExtractionMethod.default,
+    preprocessed: Optional[PreprocessedImage] = None
 ) -> Union[float, common.Failure]:  # Returns size of grid in pixels
     # First, convert color image to binary image where grid pixels are turned on (1) and all others are off (0)
     if detectionMethod == GridDetectionMethod.default:
         # Nothing intelligent; just gets all non-white pixels
-        binary = grid_detection.allDarkPixels(image)
+        binary = grid_detection.allDarkPixels(image, preprocessed=preprocessed)
     else:
         raise ValueError("Unrecognized GridDetectionMethod in `digitizeGrid`")
 
     # Second, analyze the binary image to estimate the grid spacing (period)
     if extractionMethod == GridExtractionMethod.default:
         gridPeriod = grid_extraction.estimateFrequencyViaAutocorrelation(binary.data)
+    elif extractionMethod == GridExtractionMethod.spectrum:
+        gridPeriod = grid_extraction.estimateFrequencyViaSpectrum(binary.data)
     else:
         raise ValueError("Unrecognized GridExtractionMethod in `digitizeSignal`")
 
     return gridPeriod
 
+
+
+def digitizePageGrid(
+    image: ColorImage,
+    detectionMethod: GridDetectionMethod = GridDetectionMethod.default,
+    preprocessed: Optional[PreprocessedImage] = None
+) -> Union[grid_page.PageGrid, common.Failure]:
+    """Analyzes the grid of a whole (rotated) page once, so that all leads on it can share the result."""
+    if detectionMethod == GridDetectionMethod.default:
+        binary = grid_detection.allDarkPixels(image, preprocessed=preprocessed)
+    else:
+        raise ValueError("Unrecognized GridDetectionMethod in `digitizePageGrid`")
+
+    return grid_page.analyzePageGrid(binary)
+
+
+def detectLeadLayout(
+    image: ColorImage,
+    preprocessed: Optional[PreprocessedImage] = None
+) -> Union[List[layout.LeadRegion], common.Failure]:
+    """Proposes the lead regions of a whole (rotated) page without any user annotation."""
+    signalMask = signal_detection.adaptive(image, preprocessed=preprocessed)
+    return layout.detectLeadRegions(signalMask)
+
+
+def detectCalibrationPulse(
+    image: ColorImage,
+    region: Optional[Rectangle] = None,
+    preprocessed: Optional[PreprocessedImage] = None
+) -> Union[calibration.CalibrationPulse, common.Failure]:
+    """Finds the calibration pulse on a whole (rotated) page, or only within `region` (ex: a scale box)."""
+    if region is not None:
+        image = cropped(image, region)
+        preprocessed = None  # Computed for the whole page
+
+    signalMask = signal_detection.adaptive(image, preprocessed=preprocessed)
+    pulse = calibration.findCalibrationPulse(signalMask)
+
+    if region is not None and isinstance(pulse, calibration.CalibrationPulse):
+        pulse = replace(pulse, region=replace(pulse.region, x=pulse.region.x + region.x, y=pulse.region.y + region.y))
+
+    return pulse
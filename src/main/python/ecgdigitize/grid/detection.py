@@ -4,11 +4,14 @@ Created May 23, 2021
 
 Converts a color image to binary mask of the grid.
 """
+from typing import Optional
+
 import cv2
 import numpy as np
 
 from ..image import BinaryImage, ColorImage
 from .. import vision
+from ..preprocessing import PreprocessedImage, preprocess
 from ..signal.detection import adaptive
 
 
@@ -39,10 +42,16 @@ def kernelApproach(colorImage: ColorImage) -> BinaryImage:
     return BinaryImage(final)
 
 #
-def thresholdApproach(colorImage: ColorImage, erode: bool =False) -> BinaryImage:
-    binaryImage = allDarkPixels(colorImage)
+def thresholdApproach(
+    colorImage: ColorImage,
+    erode: bool =False,
+    preprocessed: Optional[PreprocessedImage] = None
+) -> BinaryImage:
+    preprocessed = preprocessed if preprocessed is not None else preprocess(colorImage)
+
+    binaryImage = allDarkPixels(colorImage, preprocessed=preprocessed)
 
-    signalImage = adaptive(colorImage)
+    signalImage = adaptive(colorImage, preprocessed=preprocessed)
 
     dilatedSignal = cv2.dilate(
         signalImage.data,
@@ -65,14 +74,16 @@ def thresholdApproach(colorImage: ColorImage, erode: bool =False) -> BinaryImage
         return BinaryImage(subtracted)
 
 
-def allDarkPixels(colorImage: ColorImage, belowThreshold: int = 230) -> BinaryImage:
-    grayscale = colorImage.toGrayscale()
+def allDarkPixels(
+    colorImage: ColorImage,
+    belowThreshold: int = 230,
+    preprocessed: Optional[PreprocessedImage] = None
+) -> BinaryImage:
+    preprocessed = preprocessed if preprocessed is not None else preprocess(colorImage)
 
     # Adjusts the exposure of the image so that the most common pixel is pure white
     # This helps to normalize for variation in the greyness of the paper
-    adjusted = grayscale.whitePointAdjusted()
-
-    # Now that we have applied some normalization,
-    binary = adjusted.toBinary(belowThreshold)
+    # Then, now that we have applied some normalization, threshold (both in one lookup)
+    binary = preprocessed.darkPixels(belowThreshold)
 
     return binary
\ No newline at end of file
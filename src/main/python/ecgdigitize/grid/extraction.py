@@ -4,7 +4,7 @@ Created February 17, 2021
 
 Provides methods for extracting grid data from images of leads.
 """
-from typing import List, Optional, Union
+from typing import List, Optional, Tuple, Union
 
 import numpy as np
 
@@ -74,3 +74,27 @@ def estimateFrequencyViaAutocorrelation(binaryImage: np.ndarray) -> Union[float,
     else:
         return common.Failure("Unable to estimate the frequency of the grid in either directions.")
 
+
+
+def estimatePeriodsViaSpectrum(
+    binaryImage: np.ndarray
+) -> Tuple[Optional[grid_frequency.PeriodEstimate], Optional[grid_frequency.PeriodEstimate]]:
+    """Estimates the grid period along both axes from the spectra of the column and row densities.
+
+    Returns:
+        Tuple[Optional[PeriodEstimate], Optional[PeriodEstimate]]: The (column, row) estimates.
+    """
+    columnDensity = np.sum(binaryImage, axis=0, dtype=float)
+    rowDensity = np.sum(binaryImage, axis=1, dtype=float)
+
+    return grid_frequency.estimatePeriodViaSpectrum(columnDensity), grid_frequency.estimatePeriodViaSpectrum(rowDensity)
+
+
+def estimateFrequencyViaSpectrum(binaryImage: np.ndarray) -> Union[float, common.Failure]:
+    columnEstimate, rowEstimate = estimatePeriodsViaSpectrum(binaryImage)
+    estimates = [estimate for estimate in [columnEstimate, rowEstimate] if estimate is not None]
+
+    if len(estimates) == 0:
+        return common.Failure("Unable to estimate the frequency of the grid in either directions.")
+
+    return max(estimates, key=lambda estimate: estimate.confidence).period
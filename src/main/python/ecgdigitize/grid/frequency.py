@@ -1,11 +1,12 @@
 from typing import List, Optional, Union
+from dataclasses import dataclass
 
 import numpy as np
-import scipy.signal
-import scipy.interpolate
 
 
 def _findFirstPeak(signal: np.ndarray, minHeight: float = 0.3, prominence: float = 0.05) -> Optional[int]:
+    import scipy.signal  # SciPy is imported on first use; it dominates the package's import time
+
     peaks, _ = scipy.signal.find_peaks(signal, prominence=prominence, height=minHeight)
     if len(peaks) == 0:
         return None
@@ -25,6 +26,8 @@ def _estimateFirstPeakLocation(
         return None
 
     if interpolate:
+        import scipy.interpolate
+
         # Squeeze out a little more accuracy by fitting a quadratic to the points around the peak then finding the maximum
         start, end = index - interpolationRadius, index + interpolationRadius
         func = scipy.interpolate.interp1d(range(start, end + 1), signal[start:end + 1], kind='quadratic')
@@ -42,4 +45,68 @@ def _estimateFirstPeakLocation(
         return newPeak
 
     else:
-        return index
\ No newline at end of file
+        return index
+
+
+@dataclass(frozen=True)
+class PeriodEstimate:
+    period: float      # In pixels
+    confidence: float  # Fraction of the spectral power (within the searched range) belonging to the peak, in [0, 1]
+
+
+def _parabolicPeakOffset(left: float, center: float, right: float) -> float:
+    """Closed form location of the vertex of the parabola through three equally spaced points, relative to `center`."""
+    denominator = left - 2 * center + right
+    if denominator == 0:
+        return 0.0
+    return float(np.clip(0.5 * (left - right) / denominator, -0.5, 0.5))
+
+
+def estimatePeriodViaSpectrum(
+    profile: np.ndarray,
+    minimumPeriod: float = 3.0,
+    maximumPeriod: Optional[float] = None,
+    oversampling: int = 8
+) -> Optional[PeriodEstimate]:
+    """Estimates the dominant period of a density profile from the peak of its (windowed, zero-padded) FFT magnitude.
+
+    The peak location is refined below the bin spacing with a parabola through the log-magnitudes of the peak and its
+    neighbors, which is exact for the Gaussian-like main lobe of the Hann window.
+
+    Args:
+        profile (np.ndarray): Sum of grid pixels along one axis.
+        minimumPeriod (float, optional): Smallest period considered, in pixels. Defaults to 3.0.
+        maximumPeriod (Optional[float], optional): Largest period considered. Defaults to a quarter of the profile length.
+        oversampling (int, optional): Zero-padding factor of the FFT. Defaults to 8.
+
+    Returns:
+        Optional[PeriodEstimate]: The period and confidence, or `None` if there is no usable peak.
+    """
+    assert oversampling >= 1
+
+    length = len(profile)
+    maximumPeriod = maximumPeriod if maximumPeriod is not None else length / 4
+    if maximumPeriod <= minimumPeriod:
+        return None
+
+    centered = (profile - np.mean(profile)) * np.hanning(length)
+    size = oversampling * length
+    magnitudes = np.abs(np.fft.rfft(centered, size))
+    frequencies = np.fft.rfftfreq(size)
+
+    candidates = np.flatnonzero((frequencies >= 1 / maximumPeriod) & (frequencies <= 1 / minimumPeriod))
+    candidates = candidates[(candidates > 0) & (candidates < len(magnitudes) - 1)]
+    if len(candidates) == 0 or magnitudes[candidates].max() == 0:
+        return None
+
+    peak = candidates[np.argmax(magnitudes[candidates])]
+
+    with np.errstate(divide='ignore'):
+        left, center, right = np.log(magnitudes[peak - 1:peak + 2])
+    offset = _parabolicPeakOffset(left, center, right) if np.all(np.isfinite([left, center, right])) else 0.0
+
+    power = magnitudes[candidates] ** 2
+    mainLobe = np.abs(candidates - peak) <= oversampling
+    confidence = float(power[mainLobe].sum() / power.sum())
+
+    return PeriodEstimate(size / (peak + offset), confidence)
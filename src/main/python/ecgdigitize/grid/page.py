@@ -0,0 +1,98 @@
+"""
+page.py
+Created October 19, 2026
+
+Analyzes the grid of an entire (rotated) page once so that every lead on the page can share the result.
+"""
+from dataclasses import dataclass
+from typing import Union
+
+import numpy as np
+
+from . import frequency as grid_frequency
+from .. import common
+from ..image import BinaryImage, Rectangle
+
+
+@dataclass(frozen=True)
+class PageGrid:
+    period: float          # Grid spacing in pixels
+    columnPhase: float     # Offset (in pixels, within one period) of the vertical grid lines from the left edge
+    rowPhase: float        # Offset (in pixels, within one period) of the horizontal grid lines from the top edge
+    periodConfidence: float
+    tileSize: int
+    confidenceMap: np.ndarray  # (rows x columns) of tiles; how strongly each tile exhibits the grid, in [0, 1]
+
+    def confidenceIn(self, region: Rectangle) -> float:
+        """Mean grid confidence of the tiles overlapping `region`."""
+        fromRow, toRow = region.y // self.tileSize, -(-(region.y + region.height) // self.tileSize)
+        fromColumn, toColumn = region.x // self.tileSize, -(-(region.x + region.width) // self.tileSize)
+        tiles = self.confidenceMap[max(fromRow, 0):toRow, max(fromColumn, 0):toColumn]
+
+        return float(tiles.mean()) if tiles.size > 0 else 0.0
+
+
+def _phase(profile: np.ndarray, period: float) -> float:
+    """The offset of the comb with the given period that best matches `profile`, taken from its Fourier coefficient."""
+    positions = np.arange(len(profile))
+    coefficient = np.sum(profile * np.exp(-2j * np.pi * positions / period))
+    return float((-np.angle(coefficient) / (2 * np.pi) * period) % period)
+
+
+def _tileComponentStrengths(profiles: np.ndarray, period: float) -> np.ndarray:
+    """For each tile, the fraction of the (mean-removed) density profile's power found at the grid frequency.
+
+    `profiles` holds the density profile of each tile along one axis, as `(tilesDown, tilesAcross, tileSize)`. A pure
+    sinusoid at the grid period gives 1, a grid of thin lines gives less (the rest of its power is in the harmonics)
+    and no grid gives ~0."""
+    tileSize = profiles.shape[2]
+    profiles = profiles - profiles.mean(axis=2, keepdims=True)
+
+    basis = np.exp(-2j * np.pi * np.arange(tileSize) / period)
+    componentPower = np.abs(profiles @ basis) ** 2
+    totalPower = np.sum(profiles ** 2, axis=2) * tileSize / 2
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(totalPower > 0, componentPower / totalPower, 0.0).clip(0, 1)
+
+
+def analyzePageGrid(binary: BinaryImage, tileSize: int = 128) -> Union[PageGrid, common.Failure]:
+    """Estimates the grid period, phase and a per-tile confidence map from a binary image of the whole page's grid.
+
+    Args:
+        binary (BinaryImage): Grid pixels of the (rotated) page, ex: from `grid.detection.allDarkPixels`.
+        tileSize (int, optional): Size (in pixels) of the square tiles of the confidence map. Defaults to 128.
+    """
+    # Every density profile is counted on the packed mask, an eighth of the memory of the mask itself
+    packed = binary.packed()
+    columnDensity = packed.columnDensity().astype(float)
+    rowDensity = packed.rowDensity().astype(float)
+
+    columnEstimate = grid_frequency.estimatePeriodViaSpectrum(columnDensity)
+    rowEstimate = grid_frequency.estimatePeriodViaSpectrum(rowDensity)
+
+    estimates = [estimate for estimate in [columnEstimate, rowEstimate] if estimate is not None]
+    if len(estimates) == 0:
+        return common.Failure("Unable to estimate the frequency of the grid in either directions.")
+
+    best = max(estimates, key=lambda estimate: estimate.confidence)
+
+    columnPhase = _phase(columnDensity, best.period)
+    rowPhase = _phase(rowDensity, best.period)
+
+    # Whole bytes of the packed rows
+    tileSize = max(min(tileSize, binary.height, binary.width) // 8 * 8, 8)
+    tilesDown, tilesAcross = binary.height // tileSize, binary.width // tileSize
+
+    # (tilesDown, tilesAcross, tileSize) profiles along the columns and along the rows of each tile
+    columnProfiles = packed.columnDensity(blockHeight=tileSize)[:, :tilesAcross * tileSize]
+    columnProfiles = columnProfiles.reshape(tilesDown, tilesAcross, tileSize)
+    rowProfiles = packed.rowDensity(blockWidth=tileSize)[:tilesDown * tileSize]
+    rowProfiles = rowProfiles.reshape(tilesDown, tileSize, tilesAcross).swapaxes(1, 2)
+
+    confidenceMap = (
+        _tileComponentStrengths(columnProfiles.astype(float), best.period) +
+        _tileComponentStrengths(rowProfiles.astype(float), best.period)
+    ) / 2
+
+    return PageGrid(best.period, columnPhase, rowPhase, best.confidence, tileSize, confidenceMap)
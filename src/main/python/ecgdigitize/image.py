@@ -1,15 +1,24 @@
 from pathlib import Path
-from typing import Optional, Tuple, Union
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar, Union
 import dataclasses
 
 import cv2
 import numpy as np
-from numpy.lib.arraysetops import isin
-import scipy.stats as stats
+
+
+Derived = TypeVar("Derived")
 
 
 @dataclasses.dataclass(frozen=True)
 class Image:
+    """Immutable wrapper around image data.
+
+    Derived representations (grayscale, color, histogram, ...) are computed on first use and cached on the instance,
+    so converting the same image repeatedly is free. Cached results are shared between callers and must not be
+    modified in place. Call `release` to drop the cache.
+    """
+    __slots__ = ('data', '_cache')
+
     data: np.ndarray
 
     @property
@@ -20,8 +29,32 @@ class Image:
     def width(self):
         return self.data.shape[1]
 
+    def _cached(self, key: Any, compute: Callable[[], Derived]) -> Derived:
+        try:
+            cache: Dict[Any, Any] = self._cache  # type: ignore
+        except AttributeError:
+            cache = {}
+            object.__setattr__(self, '_cache', cache)  # Bypass the frozen `__setattr__`
+
+        if key not in cache:
+            cache[key] = compute()
+
+        return cache[key]
+
+    def release(self) -> None:
+        """Drops all cached derived representations of this image."""
+        try:
+            object.__delattr__(self, '_cache')
+        except AttributeError:
+            pass
+
+    def __reduce__(self):
+        # Only the data is sent when pickling (ex: to worker processes); caches are rebuilt on demand
+        return (type(self), (self.data,))
+
 
 class ColorImage(Image):
+    __slots__ = ()
 
     def __post_init__(self) -> None:
         assert isinstance(self.data, np.ndarray)
@@ -33,29 +66,29 @@ class ColorImage(Image):
 
         The "standard method" given in equation (2) by Mallawaarachchi.
         """
-        return GrayscaleImage(
+        return self._cached('grayscale', lambda: GrayscaleImage(
             cv2.cvtColor(self.data, cv2.COLOR_BGR2GRAY)
-        )
+        ))
 
 
 class GrayscaleImage(Image):
+    __slots__ = ()
 
     def __post_init__(self) -> None:
         assert isinstance(self.data, np.ndarray)
         assert len(self.data.shape) == 2
 
     def toColor(self) -> ColorImage:
-        return ColorImage(cv2.cvtColor(self.data, cv2.COLOR_GRAY2BGR))
+        return self._cached('color', lambda: ColorImage(cv2.cvtColor(self.data, cv2.COLOR_GRAY2BGR)))
 
     def toBinary(self, threshold: Optional[int] = None, inverse: bool =True):  # -> BinaryImage
         if threshold is None:
+            # Let Otsu's method pick the threshold (the `0` is ignored); inverting is done by the threshold itself
             if inverse:
                 binaryData: np.ndarray
-                _, binaryData = cv2.threshold(self.data, 0, 1, cv2.THRESH_OTSU)
-                # Convert from uint8 -> bool, invert truth values, then convert bool -> uint8
-                binaryData = np.invert(binaryData.astype('bool')).astype('uint8')
+                _, binaryData = cv2.threshold(self.data, 0, 1, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
             else:
-                _, binaryData = cv2.threshold(self.data, 0, 1, cv2.THRESH_OTSU)
+                _, binaryData = cv2.threshold(self.data, 0, 1, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
         else:
             if inverse:
                 _, binaryData = cv2.threshold(self.data, threshold, 1, cv2.THRESH_BINARY_INV)
@@ -67,7 +100,7 @@ class GrayscaleImage(Image):
     def normalized(self):  # -> GrayscaleImage:
         # Maps the image to the range [0,1]
         assert self.data.dtype is np.dtype('uint8')
-        return GrayscaleImage(self.data / 255)
+        return self._cached('normalized', lambda: GrayscaleImage(self.data / 255))
 
     def whitePointAdjusted(self, strength: float = 1.0):  # -> GrayscaleImage:
         hist = self.histogram()
@@ -76,21 +109,124 @@ class GrayscaleImage(Image):
         return GrayscaleImage(cv2.addWeighted(self.data, whiteScaleFactor, self.data, 0, 0))
 
     def histogram(self) -> np.ndarray:
-        counts, _ = np.histogram(self.data, 255, range=(0,255))
-        return counts
+        """Same as `np.histogram(self.data, 255, range=(0,255))` (the last bin holds both 254 and 255)."""
+
+        def countValues() -> np.ndarray:
+            if self.data.dtype != np.dtype('uint8'):
+                counts, _ = np.histogram(self.data, 255, range=(0,255))
+                return counts
+
+            # One counting pass over the pixels
+            counts = np.bincount(self.data.ravel(), minlength=256)
+            histogram = counts[:255].copy()
+            histogram[254] += counts[255]
+            return histogram
+
+        return self._cached('histogram', countValues)
 
 
 class BinaryImage(Image):
+    __slots__ = ()
 
     def __post_init__(self) -> None:
         assert isinstance(self.data, np.ndarray)
         assert len(self.data.shape) == 2
 
     def toColor(self) -> ColorImage:
-        return ColorImage(cv2.cvtColor(self.data * 255, cv2.COLOR_GRAY2BGR))
+        return self._cached('color', lambda: ColorImage(cv2.cvtColor(self.data * 255, cv2.COLOR_GRAY2BGR)))
 
     def toGrayscale(self) -> GrayscaleImage:
-        return GrayscaleImage(self.data * 255)
+        return self._cached('grayscale', lambda: GrayscaleImage(self.data * 255))
+
+    def packed(self):  # -> PackedBinaryImage
+        """Compact copy of the mask with 8 pixels per byte. Any non-zero pixel is considered on."""
+        return PackedBinaryImage.fromMask(self.data)
+
+
+# Constants for counting set bits in each byte of a 64 bit word at once
+_EVERY_OTHER_BIT = np.uint64(0x5555555555555555)
+_EVERY_OTHER_PAIR = np.uint64(0x3333333333333333)
+_LOW_NIBBLES = np.uint64(0x0F0F0F0F0F0F0F0F)
+_LOW_BITS = np.uint64(0x0101010101010101)
+
+
+@dataclasses.dataclass(frozen=True)
+class PackedBinaryImage:
+    """A binary mask stored with 8 pixels per byte (rows packed with `np.packbits`, padded to whole 64 bit words).
+
+    Densities are counted directly on the packed words, reading an eighth of the memory of the unpacked mask.
+    """
+    words: np.ndarray  # (height, words per row) of uint64
+    width: int
+
+    @staticmethod
+    def fromMask(mask: np.ndarray) -> 'PackedBinaryImage':
+        height, width = mask.shape
+        packed = np.packbits(mask, axis=1)
+
+        bits = np.zeros((height, -(-width // 64) * 8), dtype=np.uint8)
+        bits[:, :packed.shape[1]] = packed
+
+        return PackedBinaryImage(bits.view(np.uint64), width)
+
+    @property
+    def height(self) -> int:
+        return self.words.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        return self.words.nbytes
+
+    def unpacked(self) -> BinaryImage:
+        return BinaryImage(np.unpackbits(self.words.view(np.uint8), axis=1, count=self.width))
+
+    def _byteCounts(self) -> np.ndarray:
+        """Number of on pixels in each byte of each row (a SWAR popcount of 8 bytes at a time)."""
+        counts = self.words - ((self.words >> np.uint64(1)) & _EVERY_OTHER_BIT)
+        counts = (counts & _EVERY_OTHER_PAIR) + ((counts >> np.uint64(2)) & _EVERY_OTHER_PAIR)
+        counts = (counts + (counts >> np.uint64(4))) & _LOW_NIBBLES
+        return counts.view(np.uint8)
+
+    def rowDensity(self, blockWidth: Optional[int] = None) -> np.ndarray:
+        """Number of on pixels in each row, or in each row of every (whole) block of `blockWidth` columns.
+
+        Returns an array of `height` counts, or `(height, width // blockWidth)` counts if `blockWidth` is given (it
+        must be a multiple of 8).
+        """
+        counts = self._byteCounts()
+        if blockWidth is None:
+            return counts.sum(axis=1, dtype=np.int64)  # The padding bits are all off
+
+        assert blockWidth % 8 == 0
+        blocks, bytesPerBlock = self.width // blockWidth, blockWidth // 8
+        return counts[:, :blocks * bytesPerBlock].reshape(self.height, blocks, bytesPerBlock).sum(axis=2, dtype=np.int64)
+
+    def columnDensity(self, blockHeight: Optional[int] = None) -> np.ndarray:
+        """Number of on pixels in each column, or in each column of every (whole) block of `blockHeight` rows.
+
+        Returns an array of `width` counts, or `(height // blockHeight, width)` counts if `blockHeight` is given.
+        """
+        rows = blockHeight if blockHeight is not None else self.height
+        blocks, wordsPerRow = self.height // rows, self.words.shape[1]
+
+        # Each byte adds up one bit position of its 8 columns, so the rows are added in pieces of at most 255
+        pieces = -(-rows // 255)
+        pieceRows = -(-rows // pieces)
+        words = self.words[:blocks * rows].reshape(blocks, rows, wordsPerRow)
+        if pieces * pieceRows != rows:
+            words = np.concatenate(
+                [words, np.zeros((blocks, pieces * pieceRows - rows, wordsPerRow), dtype=np.uint64)], axis=1
+            )
+        words = words.reshape(blocks * pieces, pieceRows, wordsPerRow)
+
+        # (pieces, bytes, bit) where bit 0 is the leftmost column of the byte (`np.packbits` is big endian)
+        counts = np.empty((blocks * pieces, wordsPerRow * 8, 8), dtype=np.uint8)
+        for shift in range(8):
+            laneSums = ((words >> np.uint64(shift)) & _LOW_BITS).sum(axis=1, dtype=np.uint64)
+            counts[:, :, 7 - shift] = laneSums.view(np.uint8)
+
+        density = counts.reshape(blocks, pieces, -1).sum(axis=1, dtype=np.int64)[:, :self.width]
+        return density[0] if blockHeight is None else density
 
 
 #########################
@@ -126,6 +262,8 @@ def saveImage(image: Image, path: Path) -> None:
 # TODO: This takes waaayyy to long for practical use
 def getMode(inputImage: np.ndarray) -> Tuple[int, int, int]:
     """Gets the mode (most common) pixel color value in the image. Used to fill borders when rotating."""
+    import scipy.stats as stats  # Deferred since SciPy is slow to import and this is rarely used
+
     firstModes = stats.mode(inputImage, axis=0)
     modeResults = stats.mode(firstModes.mode, axis=1).mode[0][0]
     modeValues = tuple(map(int, modeResults))
@@ -154,8 +292,8 @@ def cropped(inputImage: Image, crop: Union[Rectangle, Boundaries]) -> Image:
         x, y, w, h = crop.x, crop.y, crop.width, crop.height
         crop = Boundaries(x, x+w, y, y+h)
 
-    outputData = inputImage.data.copy()
-    croppedData = outputData[crop.fromY:crop.toY, crop.fromX:crop.toX]
+    # Copy only the region so the result doesn't alias (or keep alive) the whole page
+    croppedData = inputImage.data[crop.fromY:crop.toY, crop.fromX:crop.toX].copy()
 
     if isinstance(inputImage, ColorImage):
         return ColorImage(croppedData)
@@ -0,0 +1,125 @@
+"""
+layout.py
+Created October 19, 2026
+
+Proposes the region, name and start time of each lead on a page from the page's signal mask, using the standard
+3x4 (+ rhythm strips) printout layout as a template.
+"""
+from dataclasses import dataclass
+from typing import List, Sequence, Union
+
+import cv2
+import numpy as np
+
+from . import common
+from .image import BinaryImage, Rectangle
+
+
+# Lead names in reading order for the three rows of the 3x4 block
+STANDARD_ROWS = [
+    ['I', 'aVR', 'V1', 'V4'],
+    ['II', 'aVL', 'V2', 'V5'],
+    ['III', 'aVF', 'V3', 'V6'],
+]
+
+# Rhythm strips below the 3x4 block, by how many there are
+STANDARD_RHYTHM_STRIPS = {
+    1: ['II'],
+    2: ['V1', 'II'],
+    3: ['V1', 'II', 'V5'],
+}
+
+
+@dataclass(frozen=True)
+class LeadRegion:
+    name: str          # ex: 'aVR'; matches the names of `model.Lead.LeadId`
+    region: Rectangle
+    startTime: float   # In seconds
+
+
+def traceComponents(signalMask: BinaryImage, minimumWidthFraction: float = 0.05) -> np.ndarray:
+    """Keeps only the connected components wide enough to be traces (drops text, labels and specks)."""
+    _, labels, stats, _ = cv2.connectedComponentsWithStats(signalMask.data, connectivity=8)
+
+    isTrace = stats[:, cv2.CC_STAT_WIDTH] >= minimumWidthFraction * signalMask.width
+    isTrace[0] = False  # Background
+
+    return isTrace[labels]
+
+
+def findBaselines(traceMask: np.ndarray, maximumRows: int = 8, smoothing: int = 9) -> np.ndarray:
+    """Finds the rows of the page's lead baselines as peaks in the row projection profile of the traces.
+
+    The isoelectric segments of every lead in a printed row lie on the same line, so each row of leads produces a
+    strong, narrow peak.
+    """
+    import scipy.signal
+
+    profile = np.sum(traceMask, axis=1, dtype=float)
+    smoothed = np.convolve(profile, np.ones(smoothing) / smoothing, mode='same')
+
+    if smoothed.max() == 0:
+        return np.array([], dtype=int)
+
+    peaks, _ = scipy.signal.find_peaks(
+        smoothed,
+        distance=max(traceMask.shape[0] // (2 * maximumRows), 1),
+        prominence=0.2 * smoothed.max()
+    )
+    return peaks
+
+
+def _bandEdges(baselines: Sequence[int], height: int) -> List[int]:
+    """Splits the page halfway between consecutive baselines (the outer bands are as tall as their neighbors)."""
+    midpoints = [(first + second) // 2 for first, second in zip(baselines[:-1], baselines[1:])]
+    firstHalf = midpoints[0] - baselines[0] if len(midpoints) > 0 else height // 2
+    lastHalf = baselines[-1] - midpoints[-1] if len(midpoints) > 0 else height // 2
+
+    return [max(baselines[0] - firstHalf, 0)] + midpoints + [min(baselines[-1] + lastHalf, height)]
+
+
+def detectLeadRegions(
+    signalMask: BinaryImage,
+    pageDuration: float = 10.0,
+    minimumWidthFraction: float = 0.05
+) -> Union[List[LeadRegion], common.Failure]:
+    """Proposes lead regions for a page laid out as a 3x4 block of leads followed by 0-3 rhythm strips.
+
+    Args:
+        signalMask (BinaryImage): Signal pixels of the whole (rotated) page, ex: from `signal.detection.adaptive`.
+        pageDuration (float, optional): Seconds spanned by the width of the traces. Defaults to 10.0.
+        minimumWidthFraction (float, optional): Narrowest connected component (as a fraction of the page width)
+            considered to be part of a trace. Defaults to 0.05.
+
+    Returns:
+        Union[List[LeadRegion], common.Failure]: The proposed regions. Rhythm strips replace the short lead of the
+        same name.
+    """
+    traceMask = traceComponents(signalMask, minimumWidthFraction)
+    baselines = findBaselines(traceMask, maximumRows=3 + max(STANDARD_RHYTHM_STRIPS))
+
+    rhythmCount = len(baselines) - len(STANDARD_ROWS)
+    if rhythmCount < 0 or rhythmCount > max(STANDARD_RHYTHM_STRIPS):
+        return common.Failure(f"Found {len(baselines)} rows of leads, which doesn't match the 3x4 (+ rhythm) layout.")
+
+    columns = np.flatnonzero(np.any(traceMask, axis=0))
+    left, right = int(columns[0]), int(columns[-1]) + 1
+    columnEdges = np.linspace(left, right, len(STANDARD_ROWS[0]) + 1).round().astype(int)
+
+    rowEdges = _bandEdges(list(baselines), signalMask.height)
+    regions = {}
+
+    for row, names in enumerate(STANDARD_ROWS):
+        top, bottom = rowEdges[row], rowEdges[row + 1]
+        for column, name in enumerate(names):
+            regions[name] = LeadRegion(
+                name,
+                Rectangle(int(columnEdges[column]), top, int(columnEdges[column + 1] - columnEdges[column]), bottom - top),
+                column * pageDuration / len(names)
+            )
+
+    for strip, name in enumerate(STANDARD_RHYTHM_STRIPS.get(rhythmCount, [])):
+        top, bottom = rowEdges[len(STANDARD_ROWS) + strip], rowEdges[len(STANDARD_ROWS) + strip + 1]
+        regions[name] = LeadRegion(name, Rectangle(left, top, right - left, bottom - top), 0.0)
+
+    return list(regions.values())
@@ -7,20 +7,24 @@ Methods related to optimization.
 
 from typing import Callable, List, Optional, Tuple, Union
 
+import numpy as np
+
 from ecgdigitize.image import GrayscaleImage
 
 
-def otsuThreshold(image: GrayscaleImage) -> float:
+def otsuThreshold(image: GrayscaleImage, histogram: Optional[np.ndarray] = None) -> float:
     """
     A Threshold Selection Method from Gray-Level Histograms - Nobuyuki Otsu
     http://web-ext.u-aizu.ac.jp/course/bmclass/documents/otsu1979.pdf
+
+    `histogram` may be passed in if it has already been computed (see `GrayscaleImage.histogram`).
     """
     assert isinstance(image, GrayscaleImage)
 
     L = 256
     height, width = image.data.shape
     N = height * width
-    n = image.histogram()
+    n = image.histogram() if histogram is None else histogram
     p = n / N
 
     def ω(k: int) -> float:
@@ -34,6 +38,8 @@ def otsuThreshold(image: GrayscaleImage) -> float:
     def σ_B(k: int) -> float: # Technically σ^2_B
         numerator   = (μ_T * ω(k) - μ(k))**2
         denominator =  ω(k) * ( 1 - ω(k) )
+        if denominator == 0:
+            return 0.0  # One of the classes is empty, so nothing is separated
         return numerator / denominator
 
     k = climb1dHill(list(range(L)), σ_B)
@@ -41,6 +47,25 @@ def otsuThreshold(image: GrayscaleImage) -> float:
     return k
 
 
+def histogramThreshold(histogram: np.ndarray) -> int:
+    """Otsu's threshold of any histogram (ex: of only some of an image's pixels), as the paper defines it.
+
+    Returns the threshold `k` that best separates the values `<= k` from the rest: the global maximum of the
+    between-class variance. This is not always what `otsuThreshold` returns, since it climbs from the middle of the
+    range and can stop on a local maximum or a flat stretch (ex: 128 instead of 151 on `fullScan.png`).
+    """
+    p = histogram / max(histogram.sum(), 1)
+
+    ω = np.cumsum(p)
+    μ = np.cumsum(np.arange(len(p)) * p)
+    μ_T = μ[-1]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        σ_B = (μ_T * ω - μ)**2 / (ω * (1 - ω))  # Technically σ^2_B
+
+    return int(np.argmax(np.nan_to_num(σ_B, nan=0.0, posinf=0.0)))
+
+
 def climb1dHill(xs: List[int], evaluate: Callable[[int], Union[float, int]]) -> int:
     """[summary]
 
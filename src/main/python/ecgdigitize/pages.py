@@ -0,0 +1,119 @@
+"""
+pages.py
+Created October 19, 2026
+
+Reads multi-page files (TIFF stacks and scanned PDFs) one page at a time, so a file with hundreds of ECGs never has
+to be fully decoded in memory or exploded to disk first.
+"""
+from pathlib import Path
+from typing import Iterator
+
+import cv2
+import numpy as np
+
+from .image import ColorImage, openImage
+
+
+PDF_SUFFIXES = {'.pdf'}
+
+
+def _isPdf(path: Path) -> bool:
+    return path.suffix.lower() in PDF_SUFFIXES
+
+
+def _importPdfRenderer():
+    # PDF support is optional; only needed when a PDF is actually opened
+    try:
+        import fitz  # PyMuPDF
+    except ImportError as error:
+        raise ImportError("Reading PDF files requires PyMuPDF (`pip install pymupdf`)") from error
+
+    return fitz
+
+
+def countPages(path: Path) -> int:
+    assert isinstance(path, Path)
+    assert path.exists()
+
+    if _isPdf(path):
+        fitz = _importPdfRenderer()
+        with fitz.open(str(path)) as document:
+            return len(document)
+    elif hasattr(cv2, 'imcount'):
+        return int(cv2.imcount(str(path)))
+    else:
+        success, pages = cv2.imreadmulti(str(path), flags=cv2.IMREAD_COLOR)
+        return len(pages) if success else 0
+
+
+def _renderPdfPage(page, dpi: int) -> ColorImage:
+    fitz = _importPdfRenderer()
+    pixmap = page.get_pixmap(matrix=fitz.Matrix(dpi / 72, dpi / 72), alpha=False)
+    rgb = np.frombuffer(pixmap.samples, dtype=np.uint8).reshape(pixmap.height, pixmap.width, pixmap.n)
+
+    if pixmap.n == 1:
+        return ColorImage(cv2.cvtColor(rgb[:, :, 0], cv2.COLOR_GRAY2BGR))
+    else:
+        return ColorImage(cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR))
+
+
+def _readPage(path: Path, index: int) -> ColorImage:
+    success, pages = cv2.imreadmulti(str(path), start=index, count=1, flags=cv2.IMREAD_COLOR)
+    assert success and len(pages) == 1, f"Unable to read page {index} of '{path}'"
+    return ColorImage(pages[0])
+
+
+def iteratePages(path: Path, dpi: int = 300) -> Iterator[ColorImage]:
+    """Yields each page of the file in order, decoding only one page at a time.
+
+    Args:
+        path (Path): A multi-page TIFF, a PDF, or any single image `openImage` can read.
+        dpi (int, optional): Resolution at which PDF pages are rendered. Defaults to 300.
+    """
+    assert isinstance(path, Path)
+    assert path.exists()
+
+    if _isPdf(path):
+        fitz = _importPdfRenderer()
+        with fitz.open(str(path)) as document:
+            for page in document:
+                yield _renderPdfPage(page, dpi)
+        return
+
+    if not hasattr(cv2, 'imcount'):
+        # Older versions of OpenCV can only decode every page at once
+        success, pages = cv2.imreadmulti(str(path), flags=cv2.IMREAD_COLOR)
+        assert success, f"Unable to read '{path}'"
+        for page in pages:
+            yield ColorImage(page)
+        return
+
+    pageCount = countPages(path)
+
+    if pageCount <= 1:
+        yield openImage(path)
+        return
+
+    for index in range(pageCount):
+        yield _readPage(path, index)
+
+
+def openPage(path: Path, index: int, dpi: int = 300) -> ColorImage:
+    """Decodes a single page of a (possibly) multi-page file."""
+    assert isinstance(path, Path)
+    assert path.exists()
+
+    if _isPdf(path):
+        fitz = _importPdfRenderer()
+        with fitz.open(str(path)) as document:
+            return _renderPdfPage(document[index], dpi)
+
+    if index == 0 and countPages(path) <= 1:
+        return openImage(path)
+
+    if not hasattr(cv2, 'imcount'):
+        success, pages = cv2.imreadmulti(str(path), flags=cv2.IMREAD_COLOR)
+        assert success, f"Unable to read '{path}'"
+        return ColorImage(pages[index])
+
+    return _readPage(path, index)
@@ -0,0 +1,322 @@
+"""
+pipeline.py
+Created October 19, 2026
+
+Streams items through a chain of stages, each with its own pool of workers, connected by bounded queues. A stage that
+falls behind fills its input queue, which blocks the stage before it, so the number of items held in memory stays
+capped no matter how long the batch is.
+"""
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import dataclasses
+import multiprocessing
+import queue
+import threading
+import time
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+from . import common
+
+
+@dataclasses.dataclass(frozen=True)
+class Stage:
+    """One step of a `Pipeline`.
+
+    If `split` is given, each item is split into parts that are processed independently by `function` (ex: the leads
+    of a page) and `join(item, results)` combines the results into the item passed on. Otherwise `function` is
+    applied to the item itself.
+    """
+    name: str
+    function: Callable[[Any], Any]
+    workers: int = 1
+    processes: bool = False  # Use worker processes (for pure Python work that holds the GIL) instead of threads
+    split: Optional[Callable[[Any], List[Any]]] = None
+    join: Optional[Callable[[Any, List[Any]], Any]] = None
+    inFlight: Optional[int] = None  # Items being worked on at once; defaults to twice the workers
+    release: Optional[Callable[[Any], None]] = None  # Called with an item the stage failed or abandoned (ex: to free it)
+
+    def __post_init__(self):
+        assert self.workers >= 1
+        assert (self.split is None) == (self.join is None)
+
+
+@dataclasses.dataclass(frozen=True)
+class StageStatistics:
+    name: str
+    completed: int
+    failed: int
+    inFlight: int
+    queued: int              # Items waiting in the stage's input queue
+    itemsPerSecond: float    # Since the stage received its first item
+    busyFraction: float      # Fraction of the elapsed time with at least one item in flight
+
+
+class _End:
+    """Marks the end of the stream."""
+
+
+_END = _End()
+
+_POLL_INTERVAL = .1  # Seconds between checks for a stop request while blocked on a queue
+
+
+def _put(target: queue.Queue, item: Any, stopping: threading.Event) -> bool:
+    """Blocks until `item` is queued (returns `True`) or the pipeline is stopped (returns `False`)."""
+    while not stopping.is_set():
+        try:
+            target.put(item, timeout=_POLL_INTERVAL)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _get(source: queue.Queue, stopping: threading.Event) -> Any:
+    """Blocks until an item is available, or returns `_END` once the pipeline is stopped."""
+    while not stopping.is_set():
+        try:
+            return source.get(timeout=_POLL_INTERVAL)
+        except queue.Empty:
+            pass
+    return _END
+
+
+class _StageRunner:
+
+    def __init__(self, stage: Stage, inbox: queue.Queue, outbox: queue.Queue, stopping: threading.Event):
+        self.stage = stage
+        self.inbox = inbox
+        self.outbox = outbox
+        self.stopping = stopping
+        self.pending: queue.Queue = queue.Queue(maxsize=stage.inFlight or 2 * stage.workers)
+
+        self.lock = threading.Lock()
+        self.completed = 0
+        self.failed = 0
+        self.active = 0
+        self.started: Optional[float] = None
+        self.busySince: Optional[float] = None
+        self.busyTime = 0.0
+
+    def _executor(self) -> Executor:
+        if self.stage.processes:
+            # Forking a process that is running other threads can deadlock the child, so workers are spawned
+            return ProcessPoolExecutor(max_workers=self.stage.workers, mp_context=multiprocessing.get_context('spawn'))
+        return ThreadPoolExecutor(max_workers=self.stage.workers, thread_name_prefix=self.stage.name)
+
+    def _markActive(self, change: int):
+        with self.lock:
+            now = time.perf_counter()
+            if self.started is None:
+                self.started = now
+            if self.active == 0 and change > 0:
+                self.busySince = now
+            self.active += change
+            if self.active == 0 and self.busySince is not None:
+                self.busyTime += now - self.busySince
+                self.busySince = None
+
+    def _release(self, value: Any):
+        if self.stage.release is None or isinstance(value, common.Failure):
+            return
+        try:
+            self.stage.release(value)
+        except Exception as error:
+            print(f"Releasing an item of stage '{self.stage.name}' failed: {error}")
+
+    def _abandon(self, value: Any, futures: Any):
+        # The pipeline was stopped before this item's results were collected
+        if isinstance(futures, list):
+            for future in futures:
+                future.cancel()
+        if futures is not None:
+            self._markActive(-1)
+            self._release(value)
+
+    def run(self):
+        with self._executor() as executor:
+            collector = threading.Thread(target=self._collect, name=f"{self.stage.name}-collect", daemon=True)
+            collector.start()
+
+            while True:
+                item = _get(self.inbox, self.stopping)
+                if item is _END:
+                    break
+
+                key, value = item
+                if isinstance(value, common.Failure):
+                    futures = None  # Earlier stage failed; pass it along untouched
+                else:
+                    self._markActive(+1)
+                    try:
+                        parts = self.stage.split(value) if self.stage.split is not None else [value]
+                        futures = [executor.submit(self.stage.function, part) for part in parts]
+                    except Exception as error:
+                        futures = error
+
+                # Blocks once `inFlight` items are in progress
+                if not _put(self.pending, (key, value, futures), self.stopping):
+                    self._abandon(value, futures)
+                    break
+
+            _put(self.pending, _END, self.stopping)
+            collector.join()
+
+            # Only left over if the pipeline was stopped; queued work is cancelled before the executor shuts down
+            while True:
+                try:
+                    entry = self.pending.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is not _END:
+                    self._abandon(entry[1], entry[2])
+
+        _put(self.outbox, _END, self.stopping)
+
+    def _collect(self):
+        while True:
+            entry = _get(self.pending, self.stopping)
+            if entry is _END:
+                return
+
+            key, value, futures = entry
+            if futures is None:
+                if not _put(self.outbox, (key, value), self.stopping):
+                    return
+                continue
+
+            try:
+                if isinstance(futures, Exception):
+                    raise futures
+                results = [future.result() for future in futures]
+                output = self.stage.join(value, results) if self.stage.join is not None else results[0]
+            except Exception as error:
+                output = common.Failure(f"{self.stage.name}: {type(error).__name__}: {error}")
+
+            with self.lock:
+                if isinstance(output, common.Failure):
+                    self.failed += 1
+                else:
+                    self.completed += 1
+            self._markActive(-1)
+
+            if isinstance(output, common.Failure):
+                self._release(value)  # Later stages skip failures, so nothing else would free the item
+
+            # Blocks while the next stage is full (backpressure)
+            if not _put(self.outbox, (key, output), self.stopping):
+                return
+
+    def statistics(self) -> StageStatistics:
+        with self.lock:
+            now = time.perf_counter()
+            elapsed = now - self.started if self.started is not None else 0.0
+            busy = self.busyTime + (now - self.busySince if self.busySince is not None else 0.0)
+
+            return StageStatistics(
+                name=self.stage.name,
+                completed=self.completed,
+                failed=self.failed,
+                inFlight=self.active,
+                queued=self.inbox.qsize(),
+                itemsPerSecond=(self.completed + self.failed) / elapsed if elapsed > 0 else 0.0,
+                busyFraction=busy / elapsed if elapsed > 0 else 0.0
+            )
+
+
+class Pipeline:
+    """Runs items through `stages` in order, every stage working concurrently on different items.
+
+    At most `queueSize` items wait between consecutive stages and each stage works on at most `Stage.inFlight` items,
+    which bounds memory. Results come out in the order the items went in. An exception raised while processing an item
+    turns it into a `common.Failure` that skips the remaining stages; one raised by `items` itself is raised to the
+    consumer once the items before it have come out.
+
+    Leaving the loop early (or calling `close`) stops every stage: queued work is cancelled, work in progress is waited
+    for, and the items in flight are passed to their stage's `release`.
+
+    Example:
+    ```
+    pipeline = Pipeline([
+        Stage("decode", openImage, workers=2),
+        Stage("rotate", straighten, workers=4),
+        Stage("leads", digitizeLead, workers=os.cpu_count(), processes=True, split=splitLeads, join=joinLeads),
+    ])
+    with pipeline:
+        for path, result in pipeline.run(paths):
+            ...
+
+    # From another thread, ex: to display progress
+    pipeline.statistics()
+    ```
+    """
+
+    def __init__(self, stages: List[Stage], queueSize: int = 4):
+        assert len(stages) > 0
+        assert queueSize >= 1
+
+        self.stages = stages
+        self.queueSize = queueSize
+        self._runners: List[_StageRunner] = []
+        self._threads: List[threading.Thread] = []
+        self._stopping = threading.Event()
+
+    def run(self, items: Iterable[Any], keys: Optional[Iterable[Any]] = None) -> Iterator[Tuple[Any, Any]]:
+        """Yields `(key, result)` for each item, where the key is the item itself unless `keys` are given."""
+        self.close()  # At most one run at a time
+
+        stopping = self._stopping = threading.Event()
+        queues = [queue.Queue(maxsize=self.queueSize) for _ in range(len(self.stages) + 1)]
+        self._runners = [
+            _StageRunner(stage, queues[index], queues[index + 1], stopping) for index, stage in enumerate(self.stages)
+        ]
+
+        self._threads = [
+            threading.Thread(target=runner.run, name=runner.stage.name, daemon=True) for runner in self._runners
+        ]
+
+        feedErrors: List[Exception] = []
+
+        def feed():
+            pairs = zip(keys, items) if keys is not None else ((item, item) for item in items)
+            try:
+                for pair in pairs:
+                    if not _put(queues[0], pair, stopping):
+                        return
+            except Exception as error:
+                feedErrors.append(error)
+            finally:
+                _put(queues[0], _END, stopping)
+
+        self._threads.append(threading.Thread(target=feed, name="feed", daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+        try:
+            while True:
+                result = _get(queues[-1], stopping)
+                if result is _END:
+                    break
+                yield result
+
+            if len(feedErrors) > 0:
+                raise feedErrors[0]
+        finally:
+            self.close()
+
+    def close(self):
+        """Stops the current run (if any) and waits for its threads and worker pools to shut down."""
+        self._stopping.set()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join()
+        self._threads = []
+
+    def __enter__(self) -> 'Pipeline':
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def statistics(self) -> List[StageStatistics]:
+        """Live counters of every stage (safe to call from any thread while `run` is being iterated)."""
+        return [runner.statistics() for runner in self._runners]
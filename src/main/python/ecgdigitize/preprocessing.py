@@ -0,0 +1,61 @@
+"""
+preprocessing.py
+Created October 19, 2026
+
+Computes everything the detection methods need from a color image (grayscale, histogram, white point, Otsu's
+threshold) in a single pass, so that signal and grid detection can share it instead of recomputing it.
+"""
+from dataclasses import dataclass, field
+
+import cv2
+import numpy as np
+
+from . import otsu
+from .image import BinaryImage, ColorImage, GrayscaleImage
+
+
+@dataclass(frozen=True)
+class PreprocessedImage:
+    image: ColorImage
+    grayscale: GrayscaleImage
+    histogram: np.ndarray
+    whitePoint: int          # Most common grayscale value (i.e., the paper)
+    otsuThreshold: float
+    whitePointLookup: np.ndarray = field(repr=False)  # Maps grayscale -> white point adjusted grayscale
+
+    def whitePointAdjusted(self) -> GrayscaleImage:
+        """Equivalent to `self.grayscale.whitePointAdjusted()` without recomputing the histogram."""
+        return GrayscaleImage(cv2.LUT(self.grayscale.data, self.whitePointLookup))
+
+    def darkPixels(self, belowThreshold: int = 230) -> BinaryImage:
+        """Pixels at or below `belowThreshold` after white point adjustment, computed straight from the grayscale
+        image with one lookup (no intermediate adjusted image)."""
+        maskLookup = (self.whitePointLookup <= belowThreshold).astype(np.uint8)
+        return BinaryImage(cv2.LUT(self.grayscale.data, maskLookup))
+
+    def thresholded(self, threshold: float) -> BinaryImage:
+        """Pixels at or below `threshold` in the grayscale image (same as `self.grayscale.toBinary(threshold)`)."""
+        return self.grayscale.toBinary(threshold)
+
+
+def preprocess(image: ColorImage, whitePointStrength: float = 1.0) -> PreprocessedImage:
+    grayscale = image.toGrayscale()
+    histogram = grayscale.histogram()
+
+    whitePoint = int(np.argmax(histogram))
+    if whitePoint > 0:
+        whiteScaleFactor = 255 / whitePoint * whitePointStrength
+        whitePointLookup = np.clip(np.rint(np.arange(256) * whiteScaleFactor), 0, 255).astype(np.uint8)
+    else:
+        # Mostly black (ex: a crop off the page): the unbounded scale factor maps everything to black, as in
+        # `GrayscaleImage.whitePointAdjusted`
+        whitePointLookup = np.zeros(256, dtype=np.uint8)
+
+    return PreprocessedImage(
+        image,
+        grayscale,
+        histogram,
+        whitePoint,
+        otsu.otsuThreshold(grayscale, histogram=histogram),
+        whitePointLookup
+    )
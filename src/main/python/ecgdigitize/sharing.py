@@ -0,0 +1,153 @@
+"""
+sharing.py
+Created October 19, 2026
+
+Places decoded pages (and masks derived from them) in shared memory, so worker processes can read them through small
+picklable descriptors instead of receiving a pickled copy of the whole page each.
+"""
+from contextlib import contextmanager
+import dataclasses
+from multiprocessing import shared_memory
+from typing import Dict, Iterator, Optional, Tuple, Type
+import weakref
+
+import numpy as np
+
+from .image import BinaryImage, ColorImage, GrayscaleImage, Image, Rectangle
+
+
+IMAGE_TYPES: Dict[str, Type[Image]] = {
+    'color': ColorImage,
+    'grayscale': GrayscaleImage,
+    'binary': BinaryImage,
+}
+
+
+@dataclasses.dataclass(frozen=True)
+class SharedImage:
+    """Describes an image held in a shared memory block. Cheap to pickle; see `attachImage`."""
+    name: str                          # Name of the shared memory block
+    shape: Tuple[int, ...]
+    dtype: str
+    kind: str                          # Key of `IMAGE_TYPES`
+    crop: Optional[Rectangle] = None   # Region of the image the worker should see, `None` for all of it
+
+    def cropped(self, region: Rectangle) -> 'SharedImage':
+        """The same buffer, restricted to `region` (relative to the current crop)."""
+        offsetX, offsetY = (self.crop.x, self.crop.y) if self.crop is not None else (0, 0)
+        return dataclasses.replace(
+            self, crop=Rectangle(offsetX + region.x, offsetY + region.y, region.width, region.height)
+        )
+
+
+def _kindOf(image: Image) -> str:
+    for kind, imageType in IMAGE_TYPES.items():
+        if isinstance(image, imageType):
+            return kind
+    raise ValueError(f"Unrecognized image type {type(image).__name__}")
+
+
+def _release(blocks: Dict[str, shared_memory.SharedMemory]) -> None:
+    for block in blocks.values():
+        try:
+            block.close()
+        except BufferError:
+            pass  # Views into the block are still alive; the mapping goes away with them
+        try:
+            block.unlink()
+        except FileNotFoundError:
+            pass
+    blocks.clear()
+
+
+class SharedPageBuffers:
+    """Owns the shared memory blocks of one or more pages, and frees them all when closed.
+
+    Use as a context manager so the blocks are unlinked even if digitization fails part way (they are also freed if
+    the owner is garbage collected or the interpreter exits). Workers must be done with the descriptors first.
+
+    Example:
+    ```
+    with SharedPageBuffers() as buffers:
+        page = buffers.share(rotatedImage)
+        jobs = [executor.submit(digitizeLead, page.cropped(region)) for region in regions]
+        signals = [job.result() for job in jobs]
+
+    def digitizeLead(descriptor: SharedImage):
+        with attachImage(descriptor) as image:
+            return ecgdigitize.digitizeSignal(image)
+    ```
+    """
+
+    def __init__(self):
+        self._blocks: Dict[str, shared_memory.SharedMemory] = {}
+        self._finalizer = weakref.finalize(self, _release, self._blocks)
+
+    def share(self, image: Image) -> SharedImage:
+        """Copies the image into a new shared memory block (the only copy made) and returns its descriptor."""
+        data = np.ascontiguousarray(image.data)
+        block = shared_memory.SharedMemory(create=True, size=max(data.nbytes, 1))
+        self._blocks[block.name] = block
+
+        np.ndarray(data.shape, data.dtype, buffer=block.buf)[...] = data
+
+        return SharedImage(block.name, data.shape, data.dtype.str, _kindOf(image))
+
+    def view(self, descriptor: SharedImage) -> Image:
+        """The owner's own (writable, copy free) view of a shared image."""
+        return _wrap(self._blocks[descriptor.name], descriptor, writeable=True)
+
+    def free(self, descriptor: SharedImage) -> None:
+        """Frees one block early, ex: once every lead of a page is done."""
+        block = self._blocks.pop(descriptor.name, None)
+        if block is not None:
+            _release({descriptor.name: block})
+
+    def close(self) -> None:
+        self._finalizer()
+
+    def __enter__(self) -> 'SharedPageBuffers':
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+def _wrap(block: shared_memory.SharedMemory, descriptor: SharedImage, writeable: bool) -> Image:
+    data = np.ndarray(descriptor.shape, np.dtype(descriptor.dtype), buffer=block.buf)
+    if descriptor.crop is not None:
+        crop = descriptor.crop
+        data = data[crop.y:crop.y + crop.height, crop.x:crop.x + crop.width]
+    data.flags.writeable = writeable
+
+    return IMAGE_TYPES[descriptor.kind](data)
+
+
+def _attachBlock(name: str) -> shared_memory.SharedMemory:
+    try:
+        # The owner unlinks the block; a worker must not (Python 3.13+)
+        return shared_memory.SharedMemory(name=name, track=False)  # type: ignore
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+@contextmanager
+def attachImage(descriptor: SharedImage) -> Iterator[Image]:
+    """Worker side: a read-only view of a shared image, valid until the block exits.
+
+    Nothing is copied; the image's data is the shared buffer itself (restricted to the descriptor's crop). Keep only
+    results computed from the image, not the image or views of its data, beyond the block.
+    """
+    block = _attachBlock(descriptor.name)
+    try:
+        image = _wrap(block, descriptor, writeable=False)
+        try:
+            yield image
+        finally:
+            image.release()
+            del image
+    finally:
+        try:
+            block.close()
+        except BufferError:
+            pass  # Something still holds a view; the mapping is freed along with it
@@ -1 +1,4 @@
-from .signal import ecgSignalSamplingPeriod, extractSignalFromImage, verticallyScaleECGSignal, zeroECGSignal
\ No newline at end of file
+from .signal import ecgSignalSamplingPeriod, extractSignalFromImage, verticallyScaleECGSignal, zeroECGSignal, \
+    calibratedSamplingPeriod, verticallyScaleECGSignalByCalibration
+from .resampling import resampleSignals
+from .quality import SignalQuality, assessSignal
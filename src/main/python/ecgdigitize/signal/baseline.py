@@ -0,0 +1,111 @@
+"""
+baseline.py
+Created October 19, 2026
+
+Estimates the baseline (isoelectric level) of extracted signals. Each estimator works along the last axis, so a whole
+`(leads × samples)` matrix is handled at once, and ignores NaN samples (gaps and padding).
+"""
+from typing import Union
+import warnings
+
+import numpy as np
+
+
+def _dtype(signals: np.ndarray) -> np.dtype:
+    # float32 matrices stay float32; anything else is computed in float64
+    return np.result_type(np.asarray(signals).dtype, np.float32)
+
+
+def _rows(signals: np.ndarray) -> np.ndarray:
+    data = np.asarray(signals, dtype=_dtype(signals))
+    return data.reshape(-1, data.shape[-1])
+
+
+def _shaped(values: np.ndarray, signals: np.ndarray) -> Union[float, np.ndarray]:
+    """Returns one value per row, shaped to broadcast against `signals` (or a float for a single signal)."""
+    if np.ndim(signals) <= 1:
+        return float(values[0])
+    return values.astype(_dtype(signals)).reshape(np.shape(signals)[:-1] + (1,))
+
+
+def histogramMode(signals: np.ndarray, binWidth: float = 1.0) -> Union[float, np.ndarray]:
+    """Most common level of each signal, found by binning the samples.
+
+    Args:
+        signals (np.ndarray): A signal or a `(leads × samples)` matrix.
+        binWidth (float, optional): Width of each bin, in the units of the signal. Defaults to 1.0 (one pixel).
+
+    Returns:
+        Union[float, np.ndarray]: The mean of the samples in the fullest bin of each signal.
+    """
+    rows = _rows(signals)
+    finite = np.isfinite(rows)
+
+    lows = np.min(np.where(finite, rows, np.inf), axis=1)
+    lows[~np.isfinite(lows)] = 0
+
+    bins = np.floor((np.where(finite, rows, lows[:, None]) - lows[:, None]) / binWidth).astype(np.int64)
+    binCount = int(bins.max()) + 1
+    keys = (np.arange(len(rows))[:, None] * binCount + bins)[finite]
+
+    counts = np.bincount(keys, minlength=len(rows) * binCount).reshape(len(rows), binCount)
+    sums = np.bincount(keys, weights=rows[finite], minlength=len(rows) * binCount).reshape(len(rows), binCount)
+
+    fullest = np.argmax(counts, axis=1)
+    everyRow = np.arange(len(rows))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        modes = sums[everyRow, fullest] / counts[everyRow, fullest]
+
+    return _shaped(modes, signals)
+
+
+def nanMedian(signals: np.ndarray) -> Union[float, np.ndarray]:
+    """Median of each signal, ignoring NaN samples."""
+    rows = _rows(signals)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # All-NaN rows give NaN
+        medians = np.nanmedian(rows, axis=1)
+
+    return _shaped(medians, signals)
+
+
+def slidingMedianBaseline(signals: np.ndarray, windowSize: int = 200, decimation: int = 10) -> np.ndarray:
+    """Slowly varying baseline (wander) of each signal, for removal by subtraction.
+
+    The samples are first reduced to the median of every `decimation` samples, then a sliding median of
+    `windowSize` samples is taken over the reduced signal and linearly interpolated back to full length.
+
+    Args:
+        signals (np.ndarray): A signal or a `(leads × samples)` matrix.
+        windowSize (int, optional): Width of the sliding window, in samples. Defaults to 200.
+        decimation (int, optional): Number of samples reduced to one before the sliding median. Defaults to 10.
+
+    Returns:
+        np.ndarray: Baseline with the same shape as `signals`.
+    """
+    rows = _rows(signals)
+    count, length = rows.shape
+
+    blockCount = -(-length // decimation)
+    padded = np.full((count, blockCount * decimation), np.nan, dtype=rows.dtype)
+    padded[:, :length] = rows
+
+    halfWindow = max(windowSize // decimation // 2, 0)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # All-NaN blocks/windows give NaN
+        coarse = np.nanmedian(padded.reshape(count, blockCount, decimation), axis=2)
+        coarse = np.pad(coarse, ((0, 0), (halfWindow, halfWindow)), constant_values=np.nan)
+        windows = np.lib.stride_tricks.sliding_window_view(coarse, 2 * halfWindow + 1, axis=1)
+        smoothed = np.nanmedian(windows, axis=2)
+
+    centers = np.arange(blockCount) * decimation + (decimation - 1) / 2
+    samples = np.arange(length)
+
+    baseline = np.full_like(rows, np.nan)
+    for row in range(count):
+        known = np.isfinite(smoothed[row])
+        if np.any(known):
+            baseline[row] = np.interp(samples, centers[known], smoothed[row, known])
+
+    return baseline.reshape(np.shape(signals))
@@ -4,11 +4,15 @@ Created May 23, 2021
 
 Converts a color image to binary mask of the lead's curve.
 """
+from dataclasses import dataclass
+from typing import Optional
+
 import cv2
 import numpy as np
 
 from .. import common, otsu, vision
 from ..image import BinaryImage, ColorImage
+from ..preprocessing import PreprocessedImage, preprocess
 from ..grid import frequency as grid_frequency
 
 
@@ -35,6 +39,27 @@ def otsuDetection(image: ColorImage, useBlur: bool = False, invert: bool = True)
     return binaryImage
 
 
+def colorSeparation(image: ColorImage, minimumChroma: int = 12) -> BinaryImage:
+    """CIE-LAB approach from Mallawaarachchi et. al., 2014: removes a colored grid by its chroma in a single pass.
+
+    Pixels are converted to CIE-LAB, and those far from neutral (a*/b* distance above a threshold chosen by Otsu's
+    method, but at least `minimumChroma`) are discarded as grid. Otsu's threshold on the lightness of the remaining
+    neutral pixels then separates the (dark) trace from the paper. On paper without color this reduces to
+    `otsuDetection`.
+    """
+    lab = cv2.cvtColor(image.data, cv2.COLOR_BGR2LAB)
+    lightness = lab[:, :, 0]
+    a, b = cv2.split(lab[:, :, 1:].astype(np.float32) - 128)
+    chroma = np.clip(cv2.magnitude(a, b), 0, 255).astype(np.uint8)
+
+    chromaThreshold = max(otsu.histogramThreshold(np.bincount(chroma.ravel(), minlength=256)), minimumChroma)
+    neutral = chroma <= chromaThreshold
+
+    lightnessThreshold = otsu.histogramThreshold(np.bincount(lightness[neutral], minlength=256))
+
+    return BinaryImage((neutral & (lightness <= lightnessThreshold)).astype(np.uint8))
+
+
 def _denoise(image: BinaryImage, kernelSize: int = 3, erosions: int = 1, dilations: int = 1) -> BinaryImage:
     eroded = image.data
 
@@ -55,6 +80,82 @@ def _denoise(image: BinaryImage, kernelSize: int = 3, erosions: int = 1, dilatio
     return BinaryImage(dilated)
 
 
+@dataclass(frozen=True)
+class FilteredMask:
+    mask: BinaryImage
+    removedComponents: int
+    removedPoints: int  # Candidate points (vertical runs, see `viterbi.getPointLocations`) no longer fed to extraction
+
+
+def _countCandidatePoints(mask: np.ndarray) -> int:
+    # Each vertical run of on pixels becomes one candidate point for extraction
+    # Cast before differencing: on booleans `np.diff` is an XOR, which would count the end of each run as well
+    onPixels = (mask > 0).astype(np.int8)
+    return int(np.count_nonzero(np.diff(onPixels, axis=0, prepend=0) == 1))
+
+
+def filterComponents(
+    image: BinaryImage,
+    minimumArea: int = 4,
+    maximumDistanceFraction: float = 0.15,
+    maximumAspect: float = 8.0
+) -> FilteredMask:
+    """Drops connected components that aren't part of the trace (text, lead labels, grid fragments, specks).
+
+    The dominant trace is the widest component. Any other component is dropped if:
+      - its area is under `minimumArea` pixels,
+      - it is further than `maximumDistanceFraction` of the image height above or below the dominant trace in the
+        columns it spans (ex: lead labels), or
+      - it is a straight line: elongated beyond `maximumAspect` and filling its bounding box (ex: grid fragments).
+
+    Returns:
+        FilteredMask: The filtered mask, and how many components and candidate points were removed.
+    """
+    data = image.data
+    height, width = data.shape
+    count, labels, stats, _ = cv2.connectedComponentsWithStats(data, connectivity=8)
+
+    if count <= 2:
+        return FilteredMask(image, 0, 0)
+
+    left, top = stats[1:, cv2.CC_STAT_LEFT], stats[1:, cv2.CC_STAT_TOP]
+    widths, heights, areas = stats[1:, cv2.CC_STAT_WIDTH], stats[1:, cv2.CC_STAT_HEIGHT], stats[1:, cv2.CC_STAT_AREA]
+    dominant = int(np.lexsort((areas, widths))[-1])
+
+    # Vertical extent of the dominant trace in each column (spread to columns it doesn't cover)
+    onDominant = labels == dominant + 1
+    covered = np.flatnonzero(np.any(onDominant, axis=0))
+    traceTop = np.interp(np.arange(width), covered, np.argmax(onDominant, axis=0)[covered])
+    traceBottom = np.interp(np.arange(width), covered, height - 1 - np.argmax(onDominant[::-1], axis=0)[covered])
+
+    bottoms = top + heights - 1
+    distances = np.array([
+        max(top[index] - traceBottom[left[index]:left[index] + widths[index]].max(),
+            traceTop[left[index]:left[index] + widths[index]].min() - bottoms[index],
+            0)
+        for index in range(count - 1)
+    ])
+
+    aspects = np.maximum(widths, heights) / np.minimum(widths, heights)
+    fill = areas / (widths * heights)
+
+    remove = (
+        (areas < minimumArea) |
+        (distances > maximumDistanceFraction * height) |
+        ((aspects > maximumAspect) & (fill > 0.9))
+    )
+    remove[dominant] = False
+
+    keep = np.concatenate([[False], ~remove]).astype(np.uint8)
+    filtered = keep[labels]
+
+    return FilteredMask(
+        BinaryImage(filtered),
+        int(np.count_nonzero(remove)),
+        _countCandidatePoints(data) - _countCandidatePoints(filtered)
+    )
+
+
 def _gridIsDetectable(image: BinaryImage) -> bool:
     columnDensity = np.sum(image.data, axis=0)
     columnFrequencyStrengths = common.autocorrelation(columnDensity)
@@ -66,12 +167,17 @@ def _gridIsDetectable(image: BinaryImage) -> bool:
     return not columnFrequency is None
 
 
-def adaptive(image: ColorImage, applyDenoising: bool = False) -> BinaryImage:
+def adaptive(
+    image: ColorImage,
+    applyDenoising: bool = False,
+    preprocessed: Optional[PreprocessedImage] = None
+) -> BinaryImage:
     maxHedge = 1
     minHedge = 0.6  # 0.5
 
-    grayscaleImage = image.toGrayscale()
-    otsuThreshold = otsu.otsuThreshold(grayscaleImage)
+    preprocessed = preprocessed if preprocessed is not None else preprocess(image)
+    grayscaleImage = preprocessed.grayscale
+    otsuThreshold = preprocessed.otsuThreshold
 
     hedging = float(maxHedge)
     binary = grayscaleImage.toBinary(otsuThreshold * hedging)
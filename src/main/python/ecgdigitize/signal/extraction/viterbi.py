@@ -4,13 +4,14 @@ Created June 1, 2021
 
 ...
 """
-from collections import defaultdict
+from collections import defaultdict, deque
 from functools import partial
 
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from ecgdigitize import signal
-from math import isnan, sqrt, asin, pi
-from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from enum import Enum
+from math import sqrt, asin, pi
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 
@@ -144,41 +145,71 @@ def getAdjacent(pointsByColumn, bestPathToPoint, startingColumn: int, minimumLoo
         yield pointScore, point, pointAngle
 
 
-def interpolate(fromPoint: Point, toPoint: Point) -> Iterator[Point]:
-    slope = (toPoint.y - fromPoint.y) / (toPoint.x - fromPoint.x)
-    f = lambda x: slope * (x - toPoint.x) + toPoint.y
+class GapPolicy(Enum):
+    """How to fill columns between two path points that are more than `maximumGap` columns apart."""
+    linear = 'linear'  # Straight line between the points
+    hold = 'hold'      # Repeat the value of the left point
+    nan = 'nan'        # Leave the gap as missing data
 
-    for x in range(fromPoint.index + 1, toPoint.index):
-        yield Point(x, f(x))
 
+def convertPathToSignal(
+    columns: np.ndarray,
+    rows: np.ndarray,
+    width: Optional[int] = None,
+    gapPolicy: GapPolicy = GapPolicy.linear,
+    maximumGap: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Converts a path (given as left-to-right column and row arrays) into signal and time arrays.
 
-def convertPointsToSignal(points: List[Point], width: Optional[int] = None) -> np.ndarray:
-    assert len(points) > 0
+    Every column between path points is linearly interpolated, except for gaps wider than `maximumGap` which are
+    filled according to `gapPolicy`. Columns with no data are NaN in the signal and 0 in the time.
+    """
+    assert len(columns) > 0
+
+    arraySize = width or (int(columns[-1]) + 1)
+    allColumns = np.arange(arraySize)
 
-    firstPoint = points[0]  # farthest from y-axis (recall we `back`-tracked earlier so paths are reversed)
-    lastPoint = points[-1]  # closest to y-axis
+    signal = np.interp(allColumns, columns, rows, left=np.nan, right=np.nan)
 
-    arraySize = width or (firstPoint.x + 1)
-    signal = np.full(arraySize, np.nan, dtype=float)
-    time = np.zeros_like(signal)
-    signal[firstPoint.index] = firstPoint.y
-    time[firstPoint.index] = firstPoint.x
-    priorPoint = firstPoint
+    if maximumGap is not None and gapPolicy != GapPolicy.linear:
+        segment = np.searchsorted(columns, allColumns, side='right') - 1
+        insideGap = (segment >= 0) & (segment < len(columns) - 1)
+        insideGap[insideGap] &= allColumns[insideGap] != columns[segment[insideGap]]
 
-    for point in points[1:]:
-        if isnan(signal[point.index + 1]):
-            for interpolatedPoint in interpolate(point, priorPoint):
-                signal[interpolatedPoint.index] = interpolatedPoint.y
-                time[interpolatedPoint.index] = interpolatedPoint.x
+        wideGaps = np.diff(columns) > maximumGap
+        inWideGap = insideGap.copy()
+        inWideGap[insideGap] = wideGaps[segment[insideGap]]
 
-        signal[point.index] = point.y
-        time[point.index] = point.x
-        priorPoint = point
+        if gapPolicy == GapPolicy.hold:
+            signal[inWideGap] = rows[segment[inWideGap]]
+        elif gapPolicy == GapPolicy.nan:
+            signal[inWideGap] = np.nan
+
+    time = np.where(np.isnan(signal), 0, allColumns).astype(float)
 
     return signal, time
 
 
-def extractSignal(binary: BinaryImage) -> Optional[np.ndarray]:
+def convertPointsToSignal(
+    points: List[Point],
+    width: Optional[int] = None,
+    gapPolicy: GapPolicy = GapPolicy.linear,
+    maximumGap: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    assert len(points) > 0
+
+    # Recall we `back`-tracked earlier so paths are reversed (first point is farthest from y-axis)
+    columns = np.array([point.x for point in reversed(points)], dtype=float)
+    rows = np.array([point.y for point in reversed(points)], dtype=float)
+
+    return convertPathToSignal(columns, rows, width, gapPolicy, maximumGap)
+
+
+def extractSignal(
+    binary: BinaryImage,
+    gapPolicy: GapPolicy = GapPolicy.linear,
+    maximumGap: Optional[int] = None
+) -> Optional[Tuple[np.ndarray, np.ndarray]]:
     pointsByColumn = getPointLocations(binary.data)
     points = list(common.flatten(pointsByColumn))
 
@@ -235,7 +266,7 @@ def extractSignal(binary: BinaryImage) -> Optional[np.ndarray]:
         bestPath.append(current)
         _, current, _ = bestPathToPoint[current]
 
-    signal, time = convertPointsToSignal(bestPath) #, width=binary.width)
+    signal, time = convertPointsToSignal(bestPath, gapPolicy=gapPolicy, maximumGap=maximumGap) #, width=binary.width)
 
     # scores = [bestPathToPoint[point][0] ** .5 for point in points]
     # plt.imshow(binary.toColor().data, cmap='Greys')
@@ -244,3 +275,254 @@ def extractSignal(binary: BinaryImage) -> Optional[np.ndarray]:
     # plt.show()
 
     return signal, time
+
+
+@dataclass(frozen=True)
+class Beam:
+    """The surviving DP state for a single occupied column."""
+    column: int
+    rows: np.ndarray
+    scores: np.ndarray
+    angles: np.ndarray
+    predecessors: np.ndarray  # Index into the previous occupied column's beam (-1 for none)
+
+
+def scoreTransitions(column: int, rows: np.ndarray, candidates: Beam) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized form of `score` for every (point, candidate) pair between two columns.
+
+    Returns the total scores as a `(len(rows), len(candidates.rows))` matrix along with the angle of each transition.
+    """
+    DISTANCE_WEIGHT = .5
+
+    deltaX = float(column - candidates.column)
+    deltaY = rows[:, np.newaxis] - candidates.rows[np.newaxis, :]
+
+    distances = np.hypot(deltaX, deltaY)
+    angles = np.degrees(np.arcsin(deltaY / distances))
+    angleValues = np.abs(angles - candidates.angles[np.newaxis, :]) / 180
+
+    scores = (distances * DISTANCE_WEIGHT) + (angleValues * (1 - DISTANCE_WEIGHT)) + candidates.scores[np.newaxis, :]
+    return scores, angles
+
+
+def advanceBeam(
+    column: int,
+    rows: np.ndarray,
+    candidates: Optional[Beam],
+    maximumVerticalJump: float,
+    beamWidth: int
+) -> Beam:
+    """Extends the beam of the previous occupied column (`candidates`) to the points in `column`.
+
+    Transitions are limited to candidates within `maximumVerticalJump` rows; if none fall inside the band the
+    whole beam is used so the path is never broken. Only the best `beamWidth` points are kept.
+    """
+    if candidates is None:
+        # Base case (far left side)
+        scores = np.zeros(len(rows))
+        angles = np.zeros(len(rows))
+        predecessors = np.full(len(rows), -1, dtype=int)
+    else:
+        transitionScores, transitionAngles = scoreTransitions(column, rows, candidates)
+
+        usable = np.isfinite(candidates.scores)
+        excluded = (np.abs(rows[:, np.newaxis] - candidates.rows[np.newaxis, :]) > maximumVerticalJump) | ~usable
+        noneInBand = np.all(excluded, axis=1)
+        excluded[noneInBand, :] = ~usable  # Fall back to the full beam rather than breaking the path
+
+        transitionScores[excluded] = np.inf
+        predecessors = np.argmin(transitionScores, axis=1)
+        scores = transitionScores[np.arange(len(rows)), predecessors]
+        angles = transitionAngles[np.arange(len(rows)), predecessors]
+
+    # Beam pruning: only the best `beamWidth` points in this column may be extended
+    if len(rows) > beamWidth:
+        keep = np.argpartition(scores, beamWidth - 1)[:beamWidth]
+        rows, scores, angles, predecessors = rows[keep], scores[keep], angles[keep], predecessors[keep]
+
+    return Beam(column, rows, scores, angles, predecessors)
+
+
+def findBestEnding(beams: List[Beam], endingWidth: int = 20) -> Tuple[int, int]:
+    """Returns `(position in beams, index in beam)` of the best scoring point within `endingWidth` of the last column."""
+    lastColumn = beams[-1].column
+    _, position, index = min(
+        (beam.scores[index], position, index)
+        for position, beam in enumerate(beams) if beam.column > lastColumn - endingWidth
+        for index in range(len(beam.scores))
+    )
+    return position, index
+
+
+def backtrackBeams(beams: List[Beam], position: int, index: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Follows predecessors from point `index` of `beams[position]` back to the first beam.
+
+    Returns the columns, rows and indices (within each beam) of the path, from left to right.
+    """
+    indices = np.empty(position + 1, dtype=int)
+
+    for current in range(position, -1, -1):
+        indices[current] = index
+        index = beams[current].predecessors[index]
+
+    columns = np.array([beam.column for beam in beams[:position + 1]], dtype=float)
+    rows = np.array([beam.rows[index] for beam, index in zip(beams, indices)], dtype=float)
+
+    return columns, rows, indices
+
+
+def extractSignalBanded(
+    binary: BinaryImage,
+    maximumVerticalJump: Optional[int] = None,
+    beamWidth: int = 8,
+    gapPolicy: GapPolicy = GapPolicy.linear,
+    maximumGap: Optional[int] = None
+) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """Viterbi extraction with transitions limited to a vertical band and a fixed-size beam per column.
+
+    Each point only considers the (at most `beamWidth`) surviving points of the nearest occupied column to its
+    left, which is always the last beam built, so no look-back search is needed and the work per column is bounded
+    regardless of how noisy the mask is.
+
+    Args:
+        binary (BinaryImage): Mask of the signal.
+        maximumVerticalJump (Optional[int], optional): Height of the transition band in pixels. Defaults to half the image height.
+        beamWidth (int, optional): The number of best-scoring points kept per column. Defaults to 8.
+        gapPolicy (GapPolicy, optional): How to fill gaps wider than `maximumGap`. Defaults to GapPolicy.linear.
+        maximumGap (Optional[int], optional): Widest gap (in columns) that is always interpolated. Defaults to None (no limit).
+
+    Returns:
+        Optional[Tuple[np.ndarray, np.ndarray]]: The signal and time arrays, or `None` if the mask is empty.
+    """
+    assert beamWidth >= 1
+
+    maximumVerticalJump = maximumVerticalJump if maximumVerticalJump is not None else binary.height // 2
+
+    beams: List[Beam] = []
+
+    for column, rows in enumerate(columnRunCenters(binary.data)):
+        if len(rows) == 0:
+            continue
+
+        beams.append(advanceBeam(column, rows, beams[-1] if beams else None, maximumVerticalJump, beamWidth))
+
+    if len(beams) == 0:
+        return None
+
+    columns, rows, _ = backtrackBeams(beams, *findBestEnding(beams))
+
+    return convertPathToSignal(columns, rows, gapPolicy=gapPolicy, maximumGap=maximumGap)
+
+
+def _blockRunCenters(mask: np.ndarray, blockWidth: int) -> Iterator[Tuple[int, np.ndarray]]:
+    """`columnRunCenters` for each column in turn, computed `blockWidth` columns at a time to bound memory."""
+    for blockStart in range(0, mask.shape[1], blockWidth):
+        for offset, rows in enumerate(columnRunCenters(mask[:, blockStart:blockStart + blockWidth])):
+            yield blockStart + offset, rows
+
+
+def restrictToDescendants(beams: List[Beam], ancestor: Beam, index: int) -> List[Beam]:
+    """Disqualifies every point in `beams` whose path does not pass through point `index` of `ancestor`."""
+    restricted = []
+    allowed = np.zeros(len(ancestor.rows), dtype=bool)
+    allowed[index] = True
+
+    for beam in beams:
+        allowed = allowed[beam.predecessors] & (beam.predecessors >= 0)
+        restricted.append(replace(beam, scores=np.where(allowed, beam.scores, np.inf)))
+
+    return restricted
+
+
+def traceSignalIncrementally(
+    binary: BinaryImage,
+    windowWidth: int = 512,
+    overlap: int = 64,
+    maximumVerticalJump: Optional[int] = None,
+    beamWidth: int = 8
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Streaming form of `extractSignalBanded` for very wide images (ex: full-page rhythm strips).
+
+    Columns are processed left to right while only the beams of the last `windowWidth` columns are kept. Whenever
+    the window fills up the best path is backtracked from the current frontier, all but the last `overlap` columns
+    of it are emitted, and the remaining beams are restricted to paths that continue the emitted trace. Memory is
+    therefore O(`windowWidth` x `beamWidth`) instead of O(all points).
+
+    Yields:
+        Tuple[np.ndarray, np.ndarray]: Consecutive chunks of the trace as (columns, rows), from left to right.
+    """
+    assert beamWidth >= 1
+    assert 0 < overlap < windowWidth
+
+    maximumVerticalJump = maximumVerticalJump if maximumVerticalJump is not None else binary.height // 2
+    history: Deque[Beam] = deque()
+
+    for column, rows in _blockRunCenters(binary.data, windowWidth):
+        if len(rows) == 0:
+            continue
+
+        history.append(advanceBeam(column, rows, history[-1] if history else None, maximumVerticalJump, beamWidth))
+
+        if history[-1].column - history[0].column >= windowWidth:
+            beams = list(history)
+            frontierIndex = int(np.argmin(beams[-1].scores))
+            columns, rows, indices = backtrackBeams(beams, len(beams) - 1, frontierIndex)
+
+            committed = sum(1 for beam in beams if beam.column <= beams[-1].column - overlap)
+            yield columns[:committed], rows[:committed]
+
+            # Only paths continuing from the last emitted point may be extended from here on
+            history = deque(restrictToDescendants(beams[committed:], beams[committed - 1], indices[committed - 1]))
+
+    if len(history) == 0:
+        return
+
+    beams = list(history)
+    columns, rows, _ = backtrackBeams(beams, *findBestEnding(beams))
+    yield columns, rows
+
+
+def extractSignalStreaming(
+    binary: BinaryImage,
+    gapPolicy: GapPolicy = GapPolicy.linear,
+    maximumGap: Optional[int] = None,
+    **kwargs: Any
+) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """Collects the output of `traceSignalIncrementally` into signal and time arrays. See it for the other arguments."""
+    chunks = list(traceSignalIncrementally(binary, **kwargs))
+
+    if len(chunks) == 0:
+        return None
+
+    columns = np.concatenate([chunkColumns for chunkColumns, _ in chunks])
+    rows = np.concatenate([chunkRows for _, chunkRows in chunks])
+
+    return convertPathToSignal(columns, rows, gapPolicy=gapPolicy, maximumGap=maximumGap)
+
+
+def columnRuns(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Finds every vertical run of on pixels in `mask`.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: The column, first row and last row + 1 of each run, sorted by column
+        then row.
+    """
+    padded = np.pad(mask > 0, ((1, 1), (0, 0))).astype(np.int8)
+    edges = np.diff(padded, axis=0).T  # Transposed so that `nonzero` walks down each column in turn
+
+    columns, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+
+    return columns, starts, ends
+
+
+def columnRunCenters(mask: np.ndarray) -> List[np.ndarray]:
+    """Vectorized `findContiguousRegionCenters` for every column of `mask` at once.
+
+    Returns:
+        List[np.ndarray]: For each column, the (float) rows of the centers of its runs, from top to bottom.
+    """
+    columns, starts, ends = columnRuns(mask)
+    centers = ((starts + ends) // 2).astype(float)
+
+    return np.split(centers, np.searchsorted(columns, np.arange(1, mask.shape[1])))
@@ -0,0 +1,104 @@
+"""
+quality.py
+Created October 19, 2026
+
+Cheap, deterministic measures of how trustworthy an extracted trace is, computed from the signal mask and the extracted
+signal (no extra image processing), so batch runs can send only doubtful leads to slower methods or to a person.
+"""
+import dataclasses
+from typing import Optional
+
+import numpy as np
+
+from ..image import BinaryImage, Rectangle
+
+
+DISTANCE_WEIGHT = .5  # Same weighting of distance and change of angle as the Viterbi extractors
+
+
+@dataclasses.dataclass(frozen=True)
+class SignalQuality:
+    pathCostPerColumn: float             # Viterbi cost of the extracted path per column; high for jagged traces
+    gapFraction: float                   # Fraction of the crop's columns where the trace is not on a signal pixel
+    candidateDensity: float              # Candidate points (vertical runs of signal pixels) per column; rises with noise
+    clippedFraction: float               # Fraction of samples at the top or bottom edge of the crop
+    removedComponents: Optional[int] = None  # Components the noise filter dropped before extraction, if it ran
+    removedPoints: Optional[int] = None      # Candidate points the noise filter kept away from the extractor, if it ran
+    gridPeriodConfidence: Optional[float] = None  # Confidence in the page's grid period, if the grid was measured
+    gridCoverage: Optional[float] = None          # How strongly the grid shows under this lead, in [0, 1]
+
+
+def pathCostPerColumn(signal: np.ndarray) -> float:
+    """Re-scores the extracted path the way the Viterbi extractors do (distance and change of angle per step).
+
+    Linear gap filling lies on the straight line between path points, so scoring every column gives the same total as
+    scoring the path points alone. Steps into or out of NaN samples are not scored.
+    """
+    deltas = np.diff(signal)
+    steps = np.isfinite(deltas)
+    if not np.any(steps):
+        return float('nan')
+
+    distances = np.hypot(1.0, deltas)
+    angles = np.degrees(np.arcsin(np.where(steps, deltas / distances, 0)))
+    angleChanges = np.abs(np.diff(angles, prepend=0.0)) / 180
+
+    costs = (distances * DISTANCE_WEIGHT) + (angleChanges * (1 - DISTANCE_WEIGHT))
+    return float(np.mean(costs[steps]))
+
+
+def gapFraction(mask: np.ndarray, signal: np.ndarray) -> float:
+    width = mask.shape[1]
+    columns = np.arange(min(len(signal), width))
+    rows = signal[:len(columns)]
+
+    finite = np.isfinite(rows)
+    onTrace = np.zeros(len(columns), dtype=bool)
+    onTrace[finite] = mask[np.clip(np.round(rows[finite]).astype(int), 0, mask.shape[0] - 1), columns[finite]] > 0
+
+    return 1 - np.count_nonzero(onTrace) / width
+
+
+def candidateDensity(mask: np.ndarray) -> float:
+    # Every vertical run of signal pixels is one candidate point for the extractors (cast first: a boolean diff is an
+    # XOR, which would count the end of each run too)
+    runStarts = np.count_nonzero(np.diff((mask > 0).astype(np.int8), axis=0, prepend=0) == 1)
+    return runStarts / mask.shape[1]
+
+
+def clippedFraction(signal: np.ndarray, height: int, margin: int = 1) -> float:
+    finite = signal[np.isfinite(signal)]
+    if len(finite) == 0:
+        return 0.0
+
+    clipped = (finite <= margin) | (finite >= height - 1 - margin)
+    return np.count_nonzero(clipped) / len(finite)
+
+
+def assessSignal(binary: BinaryImage, signal: Optional[np.ndarray]) -> SignalQuality:
+    """Quality of a trace extracted from `binary` (`signal` is `None` when extraction failed)."""
+    mask = binary.data
+
+    if signal is None:
+        return SignalQuality(float('nan'), 1.0, candidateDensity(mask), 0.0)
+
+    return SignalQuality(
+        pathCostPerColumn=pathCostPerColumn(signal),
+        gapFraction=gapFraction(mask, signal),
+        candidateDensity=candidateDensity(mask),
+        clippedFraction=clippedFraction(signal, binary.height)
+    )
+
+
+def withFiltering(quality: SignalQuality, filtered) -> SignalQuality:
+    """Adds what the noise filter (a `detection.FilteredMask`) removed from the mask before extraction."""
+    return dataclasses.replace(
+        quality, removedComponents=filtered.removedComponents, removedPoints=filtered.removedPoints
+    )
+
+
+def withGridConfidence(quality: SignalQuality, pageGrid, region: Rectangle) -> SignalQuality:
+    """Adds the confidence of the page's grid (a `grid.page.PageGrid`) in the lead's `region`."""
+    return dataclasses.replace(
+        quality, gridPeriodConfidence=float(pageGrid.periodConfidence), gridCoverage=pageGrid.confidenceIn(region)
+    )
@@ -0,0 +1,65 @@
+"""
+refinement.py
+Created October 19, 2026
+
+Refines an extracted signal to subpixel precision using the grayscale intensity around the trace.
+"""
+from typing import Tuple
+
+import numpy as np
+
+from ..image import GrayscaleImage
+
+
+def _darknessWindows(signal: np.ndarray, image: GrayscaleImage, radius: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Gathers the darkness (255 - intensity) of the `2 * radius + 1` rows centered on the trace in every column.
+
+    Returns the indices of the columns with data, the window rows `(columns x window)`, and their darkness with the
+    local background (the lightest pixel in the window) subtracted.
+    """
+    assert radius >= 1
+    assert len(signal) <= image.width
+
+    columns = np.flatnonzero(~np.isnan(signal))
+    centers = np.rint(signal[columns]).astype(int)
+
+    rows = np.clip(centers[:, np.newaxis] + np.arange(-radius, radius + 1)[np.newaxis, :], 0, image.height - 1)
+    darkness = 255 - image.data[rows, columns[:, np.newaxis]].astype(float)
+    darkness -= darkness.min(axis=1, keepdims=True)
+
+    return columns, rows, darkness
+
+
+def centroidRefinement(signal: np.ndarray, image: GrayscaleImage, radius: int = 3) -> np.ndarray:
+    """Moves each point of the trace to the darkness-weighted centroid of the rows around it."""
+    refined = signal.copy()
+    columns, rows, darkness = _darknessWindows(signal, image, radius)
+
+    totals = darkness.sum(axis=1)
+    hasInk = totals > 0
+    refined[columns[hasInk]] = (darkness[hasInk] * rows[hasInk]).sum(axis=1) / totals[hasInk]
+
+    return refined
+
+
+def gaussianRefinement(signal: np.ndarray, image: GrayscaleImage, radius: int = 3) -> np.ndarray:
+    """Moves each point of the trace to the peak of a Gaussian fit through the darkest row and its two neighbors.
+
+    Uses the closed form three-point fit (a parabola through the log of the darkness values).
+    """
+    refined = signal.copy()
+    columns, rows, darkness = _darknessWindows(signal, image, radius)
+
+    peaks = np.argmax(darkness, axis=1)
+    interior = (peaks > 0) & (peaks < darkness.shape[1] - 1)
+    columns, rows, darkness, peaks = columns[interior], rows[interior], darkness[interior], peaks[interior]
+
+    index = np.arange(len(peaks))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        left, center, right = (np.log(darkness[index, peaks + offset] + 1) for offset in (-1, 0, 1))
+        offsets = (left - right) / (2 * (left - 2 * center + right))
+
+    fitted = np.isfinite(offsets)
+    refined[columns[fitted]] = rows[index[fitted], peaks[fitted]] + np.clip(offsets[fitted], -0.5, 0.5)
+
+    return refined
@@ -0,0 +1,50 @@
+"""
+resampling.py
+Created October 19, 2026
+
+Resamples extracted signals, which are sampled once per pixel column, to a chosen output rate.
+"""
+from fractions import Fraction
+from typing import Tuple
+
+import numpy as np
+
+
+def resamplingFactors(inputRate: float, outputRate: float, maximumDenominator: int = 1000) -> Tuple[int, int]:
+    """Approximates `outputRate / inputRate` as the ratio of two small integers (up, down)."""
+    ratio = Fraction(outputRate / inputRate).limit_denominator(maximumDenominator)
+    return max(ratio.numerator, 1), ratio.denominator
+
+
+def resampleSignals(signals: np.ndarray, samplingPeriod: float, outputRate: float) -> Tuple[np.ndarray, float]:
+    """Resamples a signal or a whole `(leads × samples)` matrix to `outputRate` with an anti-aliased polyphase filter.
+
+    Every lead shares the same sample times, so resampling the matrix as a whole keeps the leads aligned. NaN samples
+    (gaps) are filled with 0 (the zeroed baseline) while filtering and are NaN again in the output.
+
+    Args:
+        signals (np.ndarray): Signal(s) sampled every `samplingPeriod` seconds along the last axis.
+        samplingPeriod (float): The input sampling period in seconds.
+        outputRate (float): The desired sampling rate in Hz.
+
+    Returns:
+        Tuple[np.ndarray, float]: The resampled signal(s) and their exact sampling period in seconds.
+    """
+    import scipy.signal
+
+    up, down = resamplingFactors(1 / samplingPeriod, outputRate)
+    if up == down:
+        return signals, samplingPeriod
+
+    gaps = np.isnan(signals)
+    filled = np.where(gaps, 0, signals) if np.any(gaps) else signals
+
+    resampled = scipy.signal.resample_poly(filled, up, down, axis=-1).astype(signals.dtype, copy=False)
+
+    if np.any(gaps):
+        # Each output sample takes the gap status of the input sample it falls on
+        length = signals.shape[-1]
+        source = np.minimum(np.arange(resampled.shape[-1]) * down // up, length - 1)
+        resampled[gaps[..., source]] = np.nan
+
+    return resampled, samplingPeriod * down / up
@@ -4,9 +4,9 @@ Created February 17, 2021
 
 Provides methods for converting images of leads into signal data.
 """
-from typing import Callable
+from typing import Callable, Union
 from ecgdigitize.image import BinaryImage, ColorImage
-from .. import common
+from . import baseline
 
 import numpy as np
 
@@ -48,6 +48,21 @@ def verticallyScaleECGSignal(
     return signal * microVoltsPerPixel * -1  # Pixels are 0 at the top of the image
 
 
+def verticallyScaleECGSignalByCalibration(signal: np.ndarray, pixelsPerMilliVolt: float) -> np.ndarray:
+    """Scales an extracted signal vertically using a measured calibration (ex: the 1 mV calibration pulse).
+
+    Args:
+        signal (np.ndarray): Extracted ECG signal.
+        pixelsPerMilliVolt (float): The vertical size of 1 mV in pixels.
+
+    Returns:
+        np.ndarray: Scaled signal in μV.
+    """
+    microVoltsPerMilliVolt = 1000
+    microVoltsPerPixel = microVoltsPerMilliVolt / pixelsPerMilliVolt
+    return signal * microVoltsPerPixel * -1  # Pixels are 0 at the top of the image
+
+
 def ecgSignalSamplingPeriod(gridSizeInPixels: float, millimetersPerSecond: float = 25.0, gridSizeInMillimeters: float = 1.0) -> float:
     gridsPerPixel = 1 / gridSizeInPixels
     millimetersPerGrid = gridSizeInMillimeters
@@ -57,7 +72,15 @@ def ecgSignalSamplingPeriod(gridSizeInPixels: float, millimetersPerSecond: float
     return secondsPerPixel
 
 
-def zeroECGSignal(signal: np.ndarray, zeroingMethod: Callable[[np.ndarray], float]=common.mode) -> np.ndarray:
+def calibratedSamplingPeriod(pixelsPerSecond: float) -> float:
+    return 1 / pixelsPerSecond
+
+
+def zeroECGSignal(
+    signal: np.ndarray,
+    zeroingMethod: Callable[[np.ndarray], Union[float, np.ndarray]] = baseline.histogramMode
+) -> np.ndarray:
+    # `signal` may be a single signal or a (leads × samples) matrix; see `baseline` for estimators
     zeroPoint = zeroingMethod(signal)
 
     return signal - zeroPoint
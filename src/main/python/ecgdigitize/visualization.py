@@ -9,7 +9,6 @@ from typing import List, Optional, Sequence, Tuple, Union
 
 import cv2
 import numpy as np
-from numpy.lib.arraysetops import isin
 
 from . import common
 from .image import Image, ColorImage, GrayscaleImage, BinaryImage
@@ -84,7 +83,7 @@ def overlaySignalOnImage(
     assert len(signal.shape) == 1
     assert isinstance(image, ColorImage)
 
-    def quantize(element: np.float) -> Optional[int]:
+    def quantize(element: float) -> Optional[int]:
         if not np.isnan(element):
             return int(element)
         else:
@@ -1,4 +1,4 @@
-from typing import Dict
+from typing import Dict, Optional, Tuple
 import dataclasses
 
 from model.Lead import LeadId, Lead
@@ -10,3 +10,8 @@ class InputParameters:
     timeScale: int
     voltScale: int
     leads: Dict[LeadId, Lead]
+    # Measured scale factors (ex: from a scale box); take precedence over the grid and the calibration pulse
+    pixelsPerMilliVolt: Optional[float] = None
+    pixelsPerSecond: Optional[float] = None
+    # (x, y, width, height) of a box around the calibration pulse; the whole page is searched when `None`
+    calibrationRegion: Optional[Tuple[int, int, int, int]] = None
@@ -0,0 +1,30 @@
+"""
+LeadSignals.py
+
+Type holding the digitized signals of every lead on a page as one matrix.
+"""
+
+from typing import Dict, List
+import dataclasses
+
+import numpy as np
+
+from ecgdigitize.signal.quality import SignalQuality
+
+from model.Lead import LeadId
+
+
+@dataclasses.dataclass(frozen=True)
+class LeadSignals:
+    leadIds: List[LeadId]   # Row order of `signals`
+    signals: np.ndarray     # (leads × samples) float32 matrix in μV, aligned by start time
+    samplingPeriod: float   # In seconds
+    quality: Dict[LeadId, SignalQuality] = dataclasses.field(default_factory=dict)  # Every lead, including failed ones
+
+    @staticmethod
+    def failed(quality: Dict[LeadId, SignalQuality]) -> 'LeadSignals':
+        """A page that couldn't be digitized: no signals, only the quality of the leads that were tried."""
+        return LeadSignals([], np.empty((0, 0), dtype=np.float32), float('nan'), quality)
+
+    def __getitem__(self, leadId: LeadId) -> np.ndarray:
+        return self.signals[self.leadIds.index(leadId)]
@@ -1,11 +1,6 @@
-from datetime import datetime
 from PyQt5 import QtCore, QtWidgets
 
-from QtWrapper import *
-import model.EcgModel as EcgModel
-import ecgdigitize
-from ecgdigitize.image import ColorImage
-from views.MessageDialog import *
+from QtWrapper import FormLayout, GroupBox, HorizontalBoxLayout, HorizontalSlider, Label, PushButton, SpinBox, VerticalBoxLayout
 
 DEFAULT_TIME_SCALE = 25
 DEFAULT_VOLTAGE_SCALE = 10
@@ -148,6 +143,10 @@ class EditPanelGlobalView(QtWidgets.QWidget):
     def autoRotate(self):
         if self.editorWidget.image is None: return
 
+        # Deferred so that the scientific stack isn't loaded before the window appears
+        import ecgdigitize
+        from ecgdigitize.image import ColorImage
+
         colorImage = ColorImage(self.editorWidget.image)
         angle = ecgdigitize.estimateRotationAngle(colorImage)
 
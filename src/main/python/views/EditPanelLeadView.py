@@ -1,6 +1,6 @@
 from PyQt5 import QtCore, QtWidgets
 
-from QtWrapper import *
+from QtWrapper import DoubleSpinBox, FormLayout, Label, PushButton, VerticalBoxLayout
 
 
 class EditPanelLeadView(QtWidgets.QWidget):
@@ -136,8 +136,8 @@ class EditPanelXScaleView(QtWidgets.QWidget):
         self.parent.XScalemsecChanged.emit(self.XScalemsecSpinBox.value())
 
 class EditPanelYScaleView(QtWidgets.QWidget):
-    XScalemsecChanged = QtCore.pyqtSignal(float)
-    deleteXScale = QtCore.pyqtSignal()
+    YScalemVperChanged = QtCore.pyqtSignal(float)
+    deleteYScale = QtCore.pyqtSignal()
 
     def __init__(self, parent):
         super().__init__()
@@ -155,28 +155,28 @@ class EditPanelYScaleView(QtWidgets.QWidget):
             Label(
                 owner=self,
                 name="title",
-                text=""
+                text="Voltage Scale"
             ),
             FormLayout(owner=self, name="controlsLayout", contents=[
                 [
                     Label(
                         owner=self,
-                        name="XScalemsecLabel",
-                        text="msec: "
+                        name="YScalemVperLabel",
+                        text="mV: "
                     ),
                     DoubleSpinBox(
                         owner=self,
-                        name="XScalemsecSpinBox",
-                        suffix=" msec",
+                        name="YScalemVperSpinBox",
+                        suffix=" mV",
                         minVal=0,
-                        maxVal=1000
+                        maxVal=100
                     )
                 ]
             ]),
             PushButton(
                 owner=self,
-                name="deleteXScaleButton",
-                text="Delete X Scale"
+                name="deleteYScaleButton",
+                text="Delete Y Scale"
             )
         ])
 
@@ -184,17 +184,9 @@ class EditPanelYScaleView(QtWidgets.QWidget):
         self.title.setAlignment(QtCore.Qt.AlignCenter)
 
         self.setLayout(self.mainlayout)
-        self.XScalemsecSpinBox.valueChanged.connect(lambda: self.XScalemsecChanged.emit(self.XScalemsecSpinBox.value()))
-        self.deleteXScaleButton.clicked.connect(lambda: self.deleteXScale.emit())
-
+        self.YScalemVperSpinBox.valueChanged.connect(lambda: self.YScalemVperChanged.emit(self.YScalemVperSpinBox.value()))
+        self.deleteYScaleButton.clicked.connect(lambda: self.deleteYScale.emit())
 
-    def setValues(self, msec=200.0):
-        self.setTitle("X")
-        self.XScalemsecSpinBox.setValue(msec)
 
-    def setTitle(self, leadId):
-        self.title.setText("Time Scale")
-
-    def startTimeChanged(self):
-        print("start time changed: " + str(self.XScalemsecSpinBox.value()))
-        self.parent.XScalemsecChanged.emit(self.XScalemsecSpinBox.value())
+    def setValues(self, mV=1.0):
+        self.YScalemVperSpinBox.setValue(mV)
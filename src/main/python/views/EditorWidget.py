@@ -8,14 +8,14 @@ from pathlib import Path
 
 from PyQt5 import QtCore, QtWidgets
 
+import ImageUtilities
 from model.Lead import LeadId
-from views.ImageView import *
-from views.ROIView import *
-from views.ScaleROIView import *
-from views.EditPanelLeadView import *
-from views.EditPanelGlobalView import *
-from QtWrapper import *
-from views.MessageDialog import *
+from views.ImageView import ImageView
+from views.ROIView import ROIItem
+from views.ScaleROIView import XScaleROIItem, YScaleROIItem, X_SCALE_ITEM_TYPE, Y_SCALE_ITEM_TYPE
+from views.EditPanelLeadView import EditPanelLeadView, EditPanelXScaleView, EditPanelYScaleView
+from views.EditPanelGlobalView import EditPanelGlobalView
+from QtWrapper import Custom, HorizontalBoxLayout, HorizontalSplitter, ScrollArea, StackedWidget
 
 class Editor(QtWidgets.QWidget):
     processEcgData = QtCore.pyqtSignal()
@@ -104,7 +104,10 @@ class Editor(QtWidgets.QWidget):
         self.EditPanelLeadView.deleteLeadRoi.connect(self.deleteLeadRoi)
 
         self.EditPanelXScaleView.XScalemsecChanged.connect(self.updateXScalemsec)
-        self.EditPanelXScaleView.deleteXscale.connect(self.deleteXScale)
+        self.EditPanelXScaleView.deleteXScale.connect(self.deleteXScale)
+
+        self.EditPanelYScaleView.YScalemVperChanged.connect(self.updateYScalemVper)
+        self.EditPanelYScaleView.deleteYScale.connect(self.deleteYScale)
 
     def loadSavedState(self, data):
         self.EditPanelGlobalView.setRotation(data['rotation'])
@@ -128,7 +131,7 @@ class Editor(QtWidgets.QWidget):
         elif leadId == "X":
             self.showXScaleDetailView()
         elif leadId == "Y":
-            pass
+            self.showYScaleDetailView()
         else:
             # self.showGlobalView(self.inputParameters.voltScale, self.inputParameters.timeScale)
             self.showGlobalView()
@@ -147,7 +150,11 @@ class Editor(QtWidgets.QWidget):
         # leadStartTime = self.inputParameters.leads[LeadId[leadId]].startTime
         leadStartTime = self.imageViewer.getXScalemsec()
         self.EditPanelXScaleView.setValues(leadStartTime)
-        self.editPanel.setCurrentIndex(1)
+        self.editPanel.setCurrentIndex(2)
+
+    def showYScaleDetailView(self):
+        self.EditPanelYScaleView.setValues(self.imageViewer.getYScalemVper())
+        self.editPanel.setCurrentIndex(3)
 
     ###################
     # Image Functions #
@@ -161,7 +168,11 @@ class Editor(QtWidgets.QWidget):
         self.showGlobalView()
 
     def loadImageFromPath(self, path: Path):
-        self.image = ImageUtilities.readImage(path)
+        self.loadImage(ImageUtilities.readImage(path))
+
+    def loadImage(self, image):
+        # Accepts an already decoded openCV image so the same data can be shared with digitization
+        self.image = image
         self.displayImage()
 
     def displayImage(self):
@@ -193,7 +204,7 @@ class Editor(QtWidgets.QWidget):
             roiBox.setRect(x, y, width, height)
             roiBox.startTime = startTime
 
-            self.imageViewer._scene.addItem(roiBox)
+            self.imageViewer.addRoiBox(roiBox)
             roiBox.show()
     def addXscale(self, x=0, y=0, width=400, height=200, startTime=0.0):
         if self.imageViewer.hasImage():
@@ -207,7 +218,7 @@ class Editor(QtWidgets.QWidget):
             roiBox.setRect(x, y, width, height)
             roiBox.msecper = startTime
 
-            self.imageViewer._scene.addItem(roiBox)
+            self.imageViewer.addScaleBox(roiBox)
             roiBox.show()
     def addYscale(self, x=0, y=0, width=400, height=200, startTime=0.0):
         if self.imageViewer.hasImage():
@@ -222,7 +233,7 @@ class Editor(QtWidgets.QWidget):
             roiBox.setRect(x, y, width, height)
             roiBox.mVper = startTime
 
-            self.imageViewer._scene.addItem(roiBox)
+            self.imageViewer.addScaleBox(roiBox)
             roiBox.show()
     def updateLeadStartTime(self, leadId, value=None):
         if value is None:
@@ -230,11 +241,36 @@ class Editor(QtWidgets.QWidget):
 
         self.imageViewer.setLeadRoiStartTime(leadId, value)
 
+    def updateXScalemsec(self, value):
+        self.imageViewer.setXScalemsec(value)
+
+    def deleteXScale(self):
+        self.imageViewer.removeScaleBox(X_SCALE_ITEM_TYPE)
+        self.mainWindow.addXscale.setEnabled(True)
+        self.setControlPanel()
+
+    def updateYScalemVper(self, value):
+        self.imageViewer.setYScalemVper(value)
+
+    def deleteYScale(self):
+        self.imageViewer.removeScaleBox(Y_SCALE_ITEM_TYPE)
+        self.mainWindow.addYscale.setEnabled(True)
+        self.setControlPanel()
+
     def deleteLeadRoi(self, leadId):
         self.imageViewer.removeRoiBox(leadId)   # Remove lead roi box from image view
         self.mainWindow.leadButtons[LeadId[leadId]].setEnabled(True)    # Re-enable add lead menu button
         self.setControlPanel()  # Set control panel back to global view
 
+    def deleteAllScaleBoxes(self):
+        self.imageViewer.removeAllScaleBoxes()  # Remove the scale boxes from image view
+
+        # Re-enable the add scale menu buttons
+        self.mainWindow.addXscale.setEnabled(True)
+        self.mainWindow.addYscale.setEnabled(True)
+
+        self.setControlPanel()    # Set control panel back to global view
+
     def deleteAllLeadRois(self):
         self.imageViewer.removeAllRoiBoxes()  # Remove all lead roi boxes from image view
 
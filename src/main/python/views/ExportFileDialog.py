@@ -1,5 +1,5 @@
 from PyQt5 import QtWidgets, QtCore
-from QtWrapper import *
+from QtWrapper import ComboBox, HorizontalBoxLayout, Label, LineEdit, PushButton, ScrollArea, VerticalBoxLayout, Widget
 from views.ImagePreviewDialog import ImagePreviewDialog
 
 fileTypesDictionary = {
@@ -66,6 +66,41 @@ class ExportFileDialog(QtWidgets.QDialog):
                         ]
                     )
 
+            ]),
+            HorizontalBoxLayout(owner=self, name="baselineChoiceLayout", contents=[
+                    Label(
+                        owner=self,
+                        name="baselineLabel",
+                        text="Baseline: "
+                    ),
+                    ComboBox(
+                        owner=self,
+                        name="baselineDropdown",
+                        items=[
+                            "Mode",
+                            "Median",
+                            "Sliding Median"
+                        ]
+                    )
+
+            ]),
+            HorizontalBoxLayout(owner=self, name="sampleRateChoiceLayout", contents=[
+                    Label(
+                        owner=self,
+                        name="sampleRateLabel",
+                        text="Sample Rate: "
+                    ),
+                    ComboBox(
+                        owner=self,
+                        name="sampleRateDropdown",
+                        items=[
+                            "Scan Resolution",
+                            "250 Hz",
+                            "500 Hz",
+                            "1000 Hz"
+                        ]
+                    )
+
             ]),
             VerticalBoxLayout(owner=self, name="leadPreviewLayout", contents=[
                 Label(
@@ -104,6 +139,8 @@ class ExportFileDialog(QtWidgets.QDialog):
         ])
 
         self.delimiterChoiceLayout.setAlignment(QtCore.Qt.AlignLeft)
+        self.baselineChoiceLayout.setAlignment(QtCore.Qt.AlignLeft)
+        self.sampleRateChoiceLayout.setAlignment(QtCore.Qt.AlignLeft)
         self.confirmCancelButtonLayout.setAlignment(QtCore.Qt.AlignBottom | QtCore.Qt.AlignRight)
 
         self.setLayout(self.mainLayout)
@@ -1,6 +1,6 @@
 
-from PyQt5 import QtCore, QtGui, QtWidgets
-from QtWrapper import *
+from PyQt5 import QtCore, QtWidgets
+from PyQt5.QtWidgets import QLabel, QVBoxLayout
 from ImageUtilities import opencvImageToPixmap
 
 class ImagePreviewDialog(QtWidgets.QDialog):
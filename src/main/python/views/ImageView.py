@@ -5,12 +5,13 @@ Created November 1, 2020
 ...
 """
 import sys
-from typing import Any
+from typing import Any, Dict, Optional, Tuple
 
 from PyQt5 import QtGui, QtCore, QtWidgets
 
 import ImageUtilities
-from views.ROIView import ROI_ITEM_TYPE
+from views.ROIView import ROIItem
+from views.ScaleROIView import X_SCALE_ITEM_TYPE, Y_SCALE_ITEM_TYPE
 from model.Lead import Lead, LeadId
 
 
@@ -44,6 +45,10 @@ class ImageView(QtWidgets.QGraphicsView):
         self._pixmapItem = QtWidgets.QGraphicsPixmapItem(parent=self._container)  # The pixmap form of the image data
         self._scene.addItem(self._container)
 
+        # Registry of the boxes in the scene, so lookups never have to walk the (possibly huge) list of scene items
+        self._leadRois: Dict[LeadId, ROIItem] = {}
+        self._scaleBoxes: Dict[int, QtWidgets.QGraphicsRectItem] = {}  # Keyed by item type (X/Y_SCALE_ITEM_TYPE)
+
         self.setMinimumSize(600, 400) # What does this do?
         self.setScene(self._scene)
         self.setTransformationAnchor(QtWidgets.QGraphicsView.AnchorUnderMouse)
@@ -130,37 +135,95 @@ class ImageView(QtWidgets.QGraphicsView):
 
         self.rotateImage(0)
 
+    def addRoiBox(self, item: ROIItem):
+        # add a lead roi to the scene, replacing any existing box for the same lead
+        self.removeRoiBox(item.leadId)
+        self._leadRois[LeadId[item.leadId]] = item
+        self._scene.addItem(item)
+
     def removeAllRoiBoxes(self):
         # remove roi boxes from scene
-        for item in self._scene.items():
-            if item.type == ROI_ITEM_TYPE:
-                self._scene.removeItem(item)
+        for item in self._leadRois.values():
+            self._scene.removeItem(item)
+        self._leadRois.clear()
 
     def removeRoiBox(self, leadId):
         # remove indiviudual roi from scene
-        for item in self._scene.items():
-            if item.type == ROI_ITEM_TYPE and item.leadId == leadId:
-                self._scene.removeItem(item)
+        item = self._leadRois.pop(LeadId[leadId], None)
+        if item is not None:
+            self._scene.removeItem(item)
 
     def getAllLeadRoisAsDict(self):
         # return all lead ROIs present in the scene as a dictionary with LeadId:Lead pairs
-        leads = {}
-        for item in self._scene.items():
-            if item.type == ROI_ITEM_TYPE:
-                leads[LeadId[item.leadId]] = Lead(x=item.x, y=item.y, width=item.width, height=item.height, startTime=item.startTime)
-        return leads
+        return {
+            leadId: Lead(x=item.x, y=item.y, width=item.width, height=item.height, startTime=item.startTime)
+            for leadId, item in self._leadRois.items()
+        }
 
     def getLeadRoiStartTime(self, leadId):
-        # get start time for specific lead (looking into a way to do this without looping through all items in scene)
-        for item in self._scene.items():
-            if item.type == ROI_ITEM_TYPE and item.leadId == leadId:
-                return item.startTime
+        item = self._leadRois.get(LeadId[leadId])
+        if item is not None:
+            return item.startTime
 
     def setLeadRoiStartTime(self, leadId, startTime):
-        # set start time for specific lead (looking into a way to do this without looping through all items in scene)
-        for item in self._scene.items():
-            if item.type == ROI_ITEM_TYPE and item.leadId == leadId:
-                item.startTime = startTime
+        item = self._leadRois.get(LeadId[leadId])
+        if item is not None:
+            item.startTime = startTime
+
+    def addScaleBox(self, item: QtWidgets.QGraphicsRectItem):
+        # add an x or y scale box to the scene, replacing any existing box of the same kind
+        self.removeScaleBox(item.type)
+        self._scaleBoxes[item.type] = item
+        self._scene.addItem(item)
+
+    def removeAllScaleBoxes(self):
+        # remove the x and y scale boxes from the scene
+        for item in self._scaleBoxes.values():
+            self._scene.removeItem(item)
+        self._scaleBoxes.clear()
+
+    def getXScalemsec(self):
+        item = self._scaleBoxes.get(X_SCALE_ITEM_TYPE)
+        if item is not None:
+            return item.msecper
+
+    def setXScalemsec(self, msec):
+        item = self._scaleBoxes.get(X_SCALE_ITEM_TYPE)
+        if item is not None:
+            item.msecper = msec
+
+    def getYScalemVper(self):
+        item = self._scaleBoxes.get(Y_SCALE_ITEM_TYPE)
+        if item is not None:
+            return item.mVper
+
+    def setYScalemVper(self, mV):
+        item = self._scaleBoxes.get(Y_SCALE_ITEM_TYPE)
+        if item is not None:
+            item.mVper = mV
+
+    def removeScaleBox(self, itemType):
+        item = self._scaleBoxes.pop(itemType, None)
+        if item is not None:
+            self._scene.removeItem(item)
+
+    def getScaleFactors(self) -> Tuple[Optional[float], Optional[float]]:
+        # return the (px/mV, px/s) measured by the scale boxes, where they have been given a value
+        pixelsPerMilliVolt, pixelsPerSecond = None, None
+        xScale, yScale = self._scaleBoxes.get(X_SCALE_ITEM_TYPE), self._scaleBoxes.get(Y_SCALE_ITEM_TYPE)
+        if xScale is not None and xScale.msecper > 0:
+            pixelsPerSecond = xScale.width / (xScale.msecper / 1000)
+        if yScale is not None and yScale.mVper > 0:
+            pixelsPerMilliVolt = yScale.height / yScale.mVper
+        return pixelsPerMilliVolt, pixelsPerSecond
+
+    def getCalibrationRegion(self) -> Optional[Tuple[int, int, int, int]]:
+        # a scale box without a value marks where to look for the calibration pulse
+        xScale, yScale = self._scaleBoxes.get(X_SCALE_ITEM_TYPE), self._scaleBoxes.get(Y_SCALE_ITEM_TYPE)
+        if xScale is not None and xScale.msecper <= 0:
+            return (xScale.x, xScale.y, xScale.width, xScale.height)
+        if yScale is not None and yScale.mVper <= 0:
+            return (yScale.x, yScale.y, yScale.width, yScale.height)
 
     def keyPressEvent(self, event: QtGui.QKeyEvent) -> None:
         if onMacOS and event.key() in MACOS_SCROLL_KEYS:
@@ -186,6 +186,14 @@ class MainWindow(QtWidgets.QMainWindow):
                     displayName="Add Lead V6",
                     shortcut=QtGui.QKeySequence('Ctrl+]'),
                     statusTip="Add Lead V6"
+                ),
+                Qt.Separator(),
+                Qt.MenuAction(
+                    owner=self,
+                    name="autoDetectLeads",
+                    displayName="Auto-Detect Leads",
+                    shortcut=None,
+                    statusTip="Place a bounding box on every lead that hasn't been added yet"
                 )
             ]
         )
@@ -1,5 +1,5 @@
-from PyQt5 import QtCore, QtGui, QtWidgets
-from QtWrapper import *
+from PyQt5 import QtCore, QtWidgets
+from QtWrapper import Label, PushButton, VerticalBoxLayout
 
 class MessageDialog(QtWidgets.QDialog):
     def __init__(self, message="", title=""):
@@ -1,8 +1,6 @@
-import numpy as np
 from PyQt5 import QtGui, QtCore, QtWidgets
 from model.Lead import LeadId
 
-import ImageUtilities
 
 # According the docs, custom items should have type >= UserType (65536)
 # Setting the type allows you to distinguish between items in the graphics scene
@@ -1,13 +1,12 @@
-import numpy as np
 from PyQt5 import QtGui, QtCore, QtWidgets
 
 
-import ImageUtilities
-
 # According the docs, custom items should have type >= UserType (65536)
 # Setting the type allows you to distinguish between items in the graphics scene
 # https://doc.qt.io/archives/qt-4.8/qgraphicsitem.html#UserType-var
 ROI_ITEM_TYPE = QtWidgets.QGraphicsRectItem.UserType
+X_SCALE_ITEM_TYPE = ROI_ITEM_TYPE + 1
+Y_SCALE_ITEM_TYPE = ROI_ITEM_TYPE + 2
 
 # From: https://github.com/drmatthews/slidecrop_pyqt/blob/master/slidecrop/gui/roi.py#L116
 class XScaleROIItem(QtWidgets.QGraphicsRectItem):
@@ -65,7 +64,7 @@ class XScaleROIItem(QtWidgets.QGraphicsRectItem):
 
         # Set item type to identify ROI items in scene - according to custom items should
         # have type >= UserType (65536)
-        self.type = ROI_ITEM_TYPE+1
+        self.type = X_SCALE_ITEM_TYPE
 
     @property
     def x(self):
@@ -415,7 +414,7 @@ class YScaleROIItem(QtWidgets.QGraphicsRectItem):
 
         # Set item type to identify ROI items in scene - according to custom items should
         # have type >= UserType (65536)
-        self.type = ROI_ITEM_TYPE+1
+        self.type = Y_SCALE_ITEM_TYPE
 
     @property
     def x(self):
@@ -642,7 +641,7 @@ class YScaleROIItem(QtWidgets.QGraphicsRectItem):
                 return self.restrictMovement(value)
 
         if change == QtWidgets.QGraphicsRectItem.ItemSelectedChange:
-            self.parentViews[0].roiItemSelected.emit(self.leadId, value)
+            self.parentViews[0].roiItemSelected.emit("Y", value)
             if value == True:
                 self.setZValue(1)
             else:
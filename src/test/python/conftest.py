@@ -0,0 +1,45 @@
+"""
+conftest.py
+Created October 19, 2026
+
+Shared fixtures for the tests: the application's modules are importable and the bundled scan is cut into leads.
+"""
+import sys
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(ROOT / 'src' / 'main' / 'python'))
+
+import ecgdigitize  # noqa: E402
+from ecgdigitize import common, pages  # noqa: E402
+from ecgdigitize.image import ColorImage, Rectangle, cropped, rotated  # noqa: E402
+
+SAMPLE_SCAN = ROOT / 'fullScan.png'
+
+
+@pytest.fixture(scope='session')
+def samplePage() -> ColorImage:
+    """The bundled scan, straightened."""
+    page = pages.openPage(SAMPLE_SCAN, 0)
+    return rotated(page, ecgdigitize.estimateRotationAngle(page) or 0)
+
+
+@pytest.fixture(scope='session')
+def sampleLeadRegions(samplePage) -> Dict[str, Rectangle]:
+    regions = ecgdigitize.detectLeadLayout(samplePage)
+    assert not isinstance(regions, common.Failure)
+    return {region.name: region.region for region in regions}
+
+
+@pytest.fixture(scope='session')
+def sampleLead(samplePage, sampleLeadRegions):
+    """Crops a lead of the bundled scan, optionally with `padding` rows of its neighbours above and below."""
+    def crop(name: str, padding: int = 0) -> ColorImage:
+        region = sampleLeadRegions[name]
+        top = max(region.y - padding, 0)
+        return cropped(samplePage, Rectangle(region.x, top, region.width, region.y + region.height + padding - top))
+
+    return crop
@@ -0,0 +1,58 @@
+import pathlib
+
+import pytest
+
+import Annotation
+from AnnotationIndex import AnnotationIndex
+from model.Lead import LeadId
+
+
+def saveAnnotation(imagePath: pathlib.Path, leads):
+    imagePath.parent.mkdir(parents=True, exist_ok=True)
+    imagePath.touch()
+
+    annotationPath = Annotation.annotationPath(imagePath)
+    annotationPath.parent.mkdir(exist_ok=True)
+    Annotation.Annotation(
+        timeStamp="10/19/2026, 12:00:00",
+        image=Annotation.ImageMetadata(imagePath.name, str(imagePath.parent)),
+        rotation=0,
+        timeScale=25,
+        voltageScale=10,
+        leads={leadId: Annotation.LeadAnnotation(Annotation.CropLocation(0, 0, 20, 40), 0.0) for leadId in leads}
+    ).save(annotationPath)
+
+    return annotationPath
+
+
+@pytest.mark.parametrize("reimported, sibling", [("scans_1", "scansx1"), ("scans%", "scans10")])
+def test_reimportKeepsSiblingRoots(tmp_path, reimported, sibling):
+    saveAnnotation(tmp_path / sibling / "first.png", [LeadId.I])
+    saveAnnotation(tmp_path / sibling / "second.png", [LeadId.II])
+    removed = saveAnnotation(tmp_path / reimported / "third.png", [LeadId.I])
+
+    with AnnotationIndex() as index:
+        assert index.importDirectory(tmp_path / sibling) == 2
+        assert index.importDirectory(tmp_path / reimported) == 1
+
+        removed.unlink()
+        assert index.importDirectory(tmp_path / reimported) == 0
+
+        assert index.count() == 2
+        assert {record.imagePath.name for record in index.find()} == {"first.png", "second.png"}
+
+
+def test_findRequiresEveryLead(tmp_path):
+    saveAnnotation(tmp_path / "both.png", [LeadId.I, LeadId.V1, LeadId.V2])
+    saveAnnotation(tmp_path / "first.png", [LeadId.I, LeadId.V2])
+    saveAnnotation(tmp_path / "second.png", [LeadId.V1])
+
+    with AnnotationIndex() as index:
+        assert index.importDirectory(tmp_path) == 3
+
+        records = index.find(leads=[LeadId.I, LeadId.V1])
+        assert [record.imagePath.name for record in records] == ["both.png"]
+        assert set(records[0].annotation.leads) == {LeadId.I, LeadId.V1, LeadId.V2}
+
+        assert [record.imagePath.name for record in index.find(leads=[LeadId.V2])] == ["both.png", "first.png"]
+        assert index.find(leads=[LeadId.I], timeScale=50) == []
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+import ecgdigitize
+from ecgdigitize.signal import baseline
+
+
+def beats(length: int = 2000, level: float = 50.3, period: int = 250) -> np.ndarray:
+    """A flat signal at `level` with a tall, narrow beat every `period` samples."""
+    samples = np.arange(length)
+    return level - 40 * np.exp(-((samples % period) - period / 2) ** 2 / 50)
+
+
+def test_histogramMode():
+    signal = beats()
+    assert baseline.histogramMode(signal) == pytest.approx(50.3, abs=.05)
+    assert isinstance(baseline.histogramMode(signal), float)
+
+    matrix = np.stack([beats(level=20), beats(level=-7.5), np.full(2000, np.nan)])
+    matrix[0, :300] = np.nan
+    modes = baseline.histogramMode(matrix)
+
+    assert modes.shape == (3, 1)
+    np.testing.assert_allclose(modes[:2, 0], [20, -7.5], atol=.05)
+    assert np.isnan(modes[2, 0])
+    assert baseline.histogramMode(matrix.astype(np.float32)).dtype == np.float32
+
+
+def test_nanMedian():
+    matrix = np.array([[1, 2, np.nan, 9], [np.nan] * 4])
+    np.testing.assert_array_equal(baseline.nanMedian(matrix), [[2], [np.nan]])
+    assert baseline.nanMedian(np.array([3.0, 1.0, 2.0])) == 2
+
+
+def test_slidingMedianBaselineFollowsWander():
+    wander = 10 * np.sin(np.arange(5000) / 800)
+    signal = beats(5000, level=0) + wander
+    signal[1000:1100] = np.nan
+
+    estimate = baseline.slidingMedianBaseline(np.stack([signal, signal + 3]))
+
+    assert estimate.shape == (2, 5000)
+    assert np.all(np.isfinite(estimate))
+    assert np.max(np.abs(estimate[0] - wander)) < 1
+    np.testing.assert_allclose(estimate[1] - estimate[0], 3, atol=1e-9)
+
+
+@pytest.mark.parametrize('method', list(ecgdigitize.ZeroingMethod))
+def test_zeroSignals(method):
+    matrix = np.stack([beats(level=20), beats(level=-7.5)])
+
+    zeroed = ecgdigitize.zeroSignals(matrix, method)
+
+    assert zeroed.shape == matrix.shape
+    np.testing.assert_allclose(np.median(zeroed, axis=1), 0, atol=.1)
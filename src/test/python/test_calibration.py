@@ -0,0 +1,47 @@
+import cv2
+import numpy as np
+import pytest
+
+import ecgdigitize
+from ecgdigitize import calibration, common
+from ecgdigitize.image import BinaryImage, ColorImage, Rectangle
+
+
+def drawPulse(image: np.ndarray, left: int, baseline: int, width: int, height: int, color, thickness: int = 3):
+    """A baseline running into a square pulse and out again, as printed beside the leads."""
+    points = [
+        (left - 50, baseline), (left, baseline), (left, baseline - height),
+        (left + width, baseline - height), (left + width, baseline), (left + width + 100, baseline)
+    ]
+    cv2.polylines(image, [np.array(points, dtype=np.int32)], False, color, thickness)
+
+
+def test_findsPulse():
+    mask = np.zeros((200, 300), dtype=np.uint8)
+    drawPulse(mask, 60, 150, 40, 80, 1)
+
+    pulse = calibration.findCalibrationPulse(BinaryImage(mask))
+
+    assert not isinstance(pulse, common.Failure)
+    assert pulse.pixelsPerMilliVolt == pytest.approx(80, abs=1)
+    assert pulse.pixelsPerSecond == pytest.approx(40 / .2, abs=5)
+    assert pulse.region == Rectangle(60, 70, 40, 80)
+
+
+def test_ignoresClosedBoxes():
+    mask = np.zeros((200, 300), dtype=np.uint8)
+    cv2.rectangle(mask, (60, 70), (100, 150), 1, 3)  # Like a letter: no baseline leads in or out
+
+    assert isinstance(calibration.findCalibrationPulse(BinaryImage(mask)), common.Failure)
+    assert isinstance(calibration.findCalibrationPulse(BinaryImage(np.zeros((50, 50), dtype=np.uint8))), common.Failure)
+
+
+def test_detectsPulseInRegion():
+    page = np.full((400, 600, 3), 255, dtype=np.uint8)
+    drawPulse(page, 360, 300, 40, 80, (0, 0, 0))
+
+    pulse = ecgdigitize.detectCalibrationPulse(ColorImage(page), Rectangle(250, 150, 300, 200))
+
+    assert not isinstance(pulse, common.Failure)
+    assert pulse.region == Rectangle(360, 220, 40, 80)  # In page coordinates
+    assert pulse.pixelsPerMilliVolt == pytest.approx(80, abs=1)
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+import Conversion
+from model.InputParameters import InputParameters
+from model.Lead import Lead, LeadId
+
+
+def steps(length: int, level: float) -> np.ndarray:
+    """A trace (in pixel rows) resting at `level` with a 20 pixel tall beat every 50 samples."""
+    trace = np.full(length, level)
+    trace[np.arange(length) % 50 < 5] -= 20
+    return trace
+
+
+PIXELS_PER_SECOND = 100
+PIXELS_PER_MILLIVOLT = 20
+PARAMETERS = InputParameters(
+    rotation=0, timeScale=25, voltScale=10,
+    leads={LeadId.II: Lead(0, 0, 150, 50, 0.5), LeadId.I: Lead(0, 0, 220, 50, 0)}
+)
+SIGNALS = {
+    LeadId.II: (steps(150, 40), np.arange(150.0)),
+    LeadId.I: (steps(220, 30), np.arange(220.0)),
+}
+
+
+def test_scaleLeadsIntoMatrix():
+    leadSignals = Conversion.scaleECGLeads(SIGNALS, PARAMETERS, PIXELS_PER_MILLIVOLT, PIXELS_PER_SECOND)
+
+    assert leadSignals.leadIds == [LeadId.I, LeadId.II]
+    assert leadSignals.signals.shape == (2, 220)
+    assert leadSignals.signals.dtype == np.float32
+    assert leadSignals.samplingPeriod == pytest.approx(.01)
+
+    # Zeroed on the resting level, scaled to μV (up is positive), and placed at the lead's start time
+    microVoltsPerPixel = 1000 / PIXELS_PER_MILLIVOLT
+    np.testing.assert_array_equal(leadSignals[LeadId.I], (30 - steps(220, 30)) * microVoltsPerPixel)
+    np.testing.assert_array_equal(leadSignals[LeadId.II][50:200], (40 - steps(150, 40)) * microVoltsPerPixel)
+    assert np.all(leadSignals[LeadId.II][:50] == 0) and np.all(leadSignals[LeadId.II][200:] == 0)
+
+
+def test_exportMatrix(tmp_path):
+    leadSignals = Conversion.scaleECGLeads(SIGNALS, PARAMETERS, PIXELS_PER_MILLIVOLT, PIXELS_PER_SECOND)
+    path = tmp_path / "signals.txt"
+
+    Conversion.exportSignals(leadSignals, path, separator=',')
+
+    lines = path.read_text().splitlines()
+    assert lines[0] == "sample period 0.01"
+    assert lines[2] == ",".join(str(leadId) for leadId in leadSignals.leadIds)
+    np.testing.assert_array_equal(np.loadtxt(lines[3:], delimiter=','), leadSignals.signals.T)
+
+
+def test_scaleLeadsToOutputRate():
+    native = Conversion.scaleECGLeads(SIGNALS, PARAMETERS, PIXELS_PER_MILLIVOLT, PIXELS_PER_SECOND)
+    leadSignals = Conversion.scaleECGLeads(SIGNALS, PARAMETERS, PIXELS_PER_MILLIVOLT, PIXELS_PER_SECOND, outputRate=250)
+
+    assert leadSignals.samplingPeriod == pytest.approx(.004)
+    assert leadSignals.signals.shape == (2, 550)
+    assert leadSignals.leadIds == native.leadIds
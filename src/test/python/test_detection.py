@@ -0,0 +1,54 @@
+import numpy as np
+
+import ecgdigitize
+from ecgdigitize.image import BinaryImage
+from ecgdigitize.signal import detection
+
+
+def noisyTraceMask() -> np.ndarray:
+    mask = np.zeros((100, 100), dtype=np.uint8)
+    mask[50:52, :] = 1       # The trace
+    mask[5:13, 60:70] = 1    # A lead label well above it: 10 candidate points
+    mask[60:90, 30] = 1      # A grid fragment: a straight line, 1 candidate point
+    mask[70, 80:82] = 1      # A speck: 2 candidate points
+    return mask
+
+
+def test_filterComponentsCounts():
+    mask = noisyTraceMask()
+    filtered = detection.filterComponents(BinaryImage(mask))
+
+    expected = np.zeros_like(mask)
+    expected[50:52, :] = 1
+
+    assert np.array_equal(filtered.mask.data, expected)
+    assert filtered.removedComponents == 3
+    assert filtered.removedPoints == 13
+
+
+def test_filterComponentsKeepsCleanMask():
+    mask = np.zeros((100, 100), dtype=np.uint8)
+    mask[50:52, :] = 1
+    mask[40:50, 20] = 1  # A spike, part of the trace
+
+    filtered = detection.filterComponents(BinaryImage(mask))
+
+    assert np.array_equal(filtered.mask.data, mask)
+    assert (filtered.removedComponents, filtered.removedPoints) == (0, 0)
+
+
+def test_filteringReportedInQuality(sampleLead):
+    image = sampleLead('II')
+    expected = detection.filterComponents(detection.adaptive(image))
+
+    _, quality = ecgdigitize.digitizeSignalWithQuality(
+        image, filteringMethod=ecgdigitize.SignalFilteringMethod.components,
+        extractionMethod=ecgdigitize.SignalExtractionMethod.banded
+    )
+    assert quality.removedComponents == expected.removedComponents > 0
+    assert quality.removedPoints == expected.removedPoints > 0
+
+    _, unfiltered = ecgdigitize.digitizeSignalWithQuality(
+        image, extractionMethod=ecgdigitize.SignalExtractionMethod.banded
+    )
+    assert unfiltered.removedComponents is None and unfiltered.removedPoints is None
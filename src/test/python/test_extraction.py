@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from ecgdigitize.image import BinaryImage
+from ecgdigitize.signal import detection
+from ecgdigitize.signal.extraction import viterbi
+
+
+def assertTracesAgree(signal: np.ndarray, reference: np.ndarray, meanError: float = 3.0, extentError: float = 10.0):
+    assert abs(len(signal) - len(reference)) <= 2
+
+    length = min(len(signal), len(reference))
+    assert np.nanmean(np.abs(signal[:length] - reference[:length])) < meanError
+
+    # A trace that wandered onto a neighbouring lead reaches far above or below the real one
+    for percentile in (5, 95):
+        assert abs(np.nanpercentile(signal, percentile) - np.nanpercentile(reference, percentile)) < extentError
+
+
+@pytest.mark.parametrize('lead', ['I', 'aVL', 'V4', 'V5', 'II'])
+def test_bandedMatchesDefault(sampleLead, lead):
+    binary = detection.adaptive(sampleLead(lead))
+
+    reference, _ = viterbi.extractSignal(binary)
+    signal, time = viterbi.extractSignalBanded(binary)
+
+    assertTracesAgree(signal, reference)
+    assert len(time) == len(signal)
+
+
+def test_bandedEmptyMask():
+    assert viterbi.extractSignalBanded(BinaryImage(np.zeros((20, 30), dtype=np.uint8))) is None
+
+
+def test_streamingMatchesBanded(sampleLead):
+    # Windows much narrower than the lead, so the trace is committed in many chunks
+    binary = detection.adaptive(sampleLead('II'))
+
+    chunks = list(viterbi.traceSignalIncrementally(binary, windowWidth=128, overlap=32))
+    columns = np.concatenate([chunkColumns for chunkColumns, _ in chunks])
+    assert len(chunks) > 10
+    assert np.all(np.diff(columns) > 0)
+
+    banded, _ = viterbi.extractSignalBanded(binary)
+    streaming, _ = viterbi.extractSignalStreaming(binary, windowWidth=128, overlap=32)
+    np.testing.assert_array_equal(streaming, banded)
+
+
+def test_streamingMatchesDefault(sampleLead):
+    binary = detection.adaptive(sampleLead('V5'))
+
+    reference, _ = viterbi.extractSignal(binary)
+    signal, _ = viterbi.extractSignalStreaming(binary, windowWidth=128, overlap=32)
+
+    assertTracesAgree(signal, reference)
+
+
+GAP_COLUMNS = np.array([0, 1, 2, 8, 9], dtype=float)
+GAP_ROWS = np.array([10, 11, 12, 18, 19], dtype=float)
+
+
+@pytest.mark.parametrize('gapPolicy, gapValues', [
+    (viterbi.GapPolicy.linear, [13, 14, 15, 16, 17]),
+    (viterbi.GapPolicy.hold, [12, 12, 12, 12, 12]),
+    (viterbi.GapPolicy.nan, [np.nan] * 5),
+])
+def test_gapPolicy(gapPolicy, gapValues):
+    signal, time = viterbi.convertPathToSignal(GAP_COLUMNS, GAP_ROWS, width=12, gapPolicy=gapPolicy, maximumGap=3)
+
+    np.testing.assert_array_equal(signal[:3], [10, 11, 12])
+    np.testing.assert_array_equal(signal[3:8], gapValues)
+    np.testing.assert_array_equal(signal[8:10], [18, 19])
+    assert np.all(np.isnan(signal[10:]))
+
+    filled = ~np.isnan(signal)
+    np.testing.assert_array_equal(time[filled], np.arange(12)[filled])
+    assert np.all(time[~filled] == 0)
+
+
+@pytest.mark.parametrize('gapPolicy', list(viterbi.GapPolicy))
+def test_gapPolicyIgnoresNarrowGaps(gapPolicy):
+    signal, _ = viterbi.convertPathToSignal(GAP_COLUMNS, GAP_ROWS, gapPolicy=gapPolicy, maximumGap=6)
+    np.testing.assert_array_equal(signal[3:8], [13, 14, 15, 16, 17])
+
+
+def test_bandedGapPolicy():
+    mask = np.zeros((30, 60), dtype=np.uint8)
+    mask[10, :25] = 1
+    mask[12, 35:] = 1
+
+    signal, _ = viterbi.extractSignalBanded(BinaryImage(mask), gapPolicy=viterbi.GapPolicy.nan, maximumGap=5)
+
+    assert np.all(np.isnan(signal[25:35]))
+    np.testing.assert_array_equal(signal[:25], 10)
+    np.testing.assert_array_equal(signal[35:], 12)
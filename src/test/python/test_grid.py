@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+import ecgdigitize
+from ecgdigitize import common
+from ecgdigitize.grid import extraction, frequency
+
+
+def gridMask(height: int, width: int, period: float) -> np.ndarray:
+    """A binary grid with one pixel wide lines every `period` pixels in both directions."""
+    mask = np.zeros((height, width), dtype=np.uint8)
+    mask[np.rint(np.arange(0, height, period)).astype(int).clip(max=height - 1), :] = 1
+    mask[:, np.rint(np.arange(0, width, period)).astype(int).clip(max=width - 1)] = 1
+    return mask
+
+
+@pytest.mark.parametrize('period', [6.0, 9.37, 15.5])
+def test_spectrumPeriodOfProfile(period):
+    profile = gridMask(400, 600, period).sum(axis=0, dtype=float)
+
+    estimate = frequency.estimatePeriodViaSpectrum(profile)
+
+    assert estimate is not None
+    assert estimate.period == pytest.approx(period, abs=.05)
+    assert .15 < estimate.confidence <= 1  # The harmonics of thin lines share the rest of the power
+
+
+def test_spectrumPeriodOfFlatProfile():
+    assert frequency.estimatePeriodViaSpectrum(np.full(600, 40.0)) is None
+    assert frequency.estimatePeriodViaSpectrum(np.ones(10)) is None  # Too short for any period in range
+
+
+def test_spectrumPeriodOfNoiseHasLowConfidence():
+    profile = np.random.default_rng(0).random(600)
+    estimate = frequency.estimatePeriodViaSpectrum(profile)
+
+    assert estimate is not None and estimate.confidence < .1
+
+
+def test_spectrumPeriodOfGrid():
+    columnEstimate, rowEstimate = extraction.estimatePeriodsViaSpectrum(gridMask(300, 500, 11.8))
+
+    assert columnEstimate.period == pytest.approx(11.8, abs=.05)
+    assert rowEstimate.period == pytest.approx(11.8, abs=.05)
+    assert extraction.estimateFrequencyViaSpectrum(gridMask(300, 500, 11.8)) == pytest.approx(11.8, abs=.05)
+    assert isinstance(extraction.estimateFrequencyViaSpectrum(np.zeros((300, 500))), common.Failure)
+
+
+@pytest.mark.parametrize('lead', ['I', 'V4'])
+def test_spectrumMatchesAutocorrelation(sampleLead, lead):
+    image = sampleLead(lead)
+
+    reference = ecgdigitize.digitizeGrid(image)
+    period = ecgdigitize.digitizeGrid(image, extractionMethod=ecgdigitize.GridExtractionMethod.spectrum)
+
+    assert period == pytest.approx(reference, rel=.02)
@@ -0,0 +1,71 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from ecgdigitize.image import BinaryImage, ColorImage, GrayscaleImage
+
+
+def test_conversionsAreCached():
+    color = ColorImage(np.random.default_rng(0).integers(0, 256, (40, 60, 3), dtype=np.uint8))
+
+    grayscale = color.toGrayscale()
+    assert color.toGrayscale() is grayscale
+    assert grayscale.histogram() is grayscale.histogram()
+    assert grayscale.normalized() is grayscale.normalized()
+
+    color.release()
+    assert color.toGrayscale() is not grayscale
+    assert np.array_equal(color.toGrayscale().data, grayscale.data)
+
+    color.release()
+    color.release()  # Releasing twice (or before anything was cached) is fine
+
+
+def test_histogramMatchesNumpy():
+    grayscale = GrayscaleImage(np.random.default_rng(1).integers(0, 256, (50, 70), dtype=np.uint8))
+    expected, _ = np.histogram(grayscale.data, 255, range=(0, 255))
+
+    assert np.array_equal(grayscale.histogram(), expected)
+    assert np.array_equal(GrayscaleImage(grayscale.data.astype(float)).histogram(), expected)
+
+
+def test_picklingDropsCache():
+    grayscale = GrayscaleImage(np.arange(12, dtype=np.uint8).reshape(3, 4))
+    grayscale.toColor()
+
+    copy = pickle.loads(pickle.dumps(grayscale))
+    assert np.array_equal(copy.data, grayscale.data)
+    assert not hasattr(copy, '_cache')
+
+
+@pytest.mark.parametrize('height, width', [(300, 77), (600, 130), (8, 64)])
+def test_packedDensities(height, width):
+    mask = (np.random.default_rng(height).random((height, width)) < .3).astype(np.uint8)
+    packed = BinaryImage(mask).packed()
+
+    assert np.array_equal(packed.unpacked().data, mask)
+    assert packed.nbytes <= mask.nbytes // 8 + 8 * height
+
+    assert np.array_equal(packed.rowDensity(), mask.sum(axis=1))
+    assert np.array_equal(packed.columnDensity(), mask.sum(axis=0))
+
+    # Counts within whole blocks, as used for the grid's tiles
+    blocksDown, blocksAcross = height // 4, width // 16
+    assert np.array_equal(
+        packed.columnDensity(blockHeight=4), mask[:blocksDown * 4].reshape(blocksDown, 4, width).sum(axis=1)
+    )
+    assert np.array_equal(
+        packed.rowDensity(blockWidth=16), mask[:, :blocksAcross * 16].reshape(height, blocksAcross, 16).sum(axis=2)
+    )
+
+
+def test_packedNonBinaryMask():
+    mask = np.array([[0, 2, 255, 1, 0, 0, 0, 0, 3]], dtype=np.uint8)  # Any non-zero pixel is on
+    assert np.array_equal(BinaryImage(mask).packed().columnDensity(), mask[0] > 0)
+
+
+def test_packedColumnDensityOfTallMask():
+    # More rows than one byte can count
+    mask = np.ones((1000, 20), dtype=np.uint8)
+    assert np.array_equal(BinaryImage(mask).packed().columnDensity(), np.full(20, 1000))
@@ -0,0 +1,53 @@
+import cv2
+import numpy as np
+
+import ecgdigitize
+from ecgdigitize import common, layout
+from ecgdigitize.image import BinaryImage
+
+
+def test_layoutOfSampleScan(samplePage):
+    regions = {region.name: region for region in ecgdigitize.detectLeadLayout(samplePage)}
+
+    assert set(regions) == {name for row in layout.STANDARD_ROWS for name in row}
+
+    # Two rhythm strips (V1 and II) span the page below the 3x4 block
+    for name in ['V1', 'II']:
+        assert regions[name].startTime == 0
+        assert regions[name].region.width > 3 * regions['I'].region.width
+    assert regions['II'].region.y > regions['V1'].region.y > regions['III'].region.y
+
+    for row in layout.STANDARD_ROWS:
+        short = [regions[name] for name in row if name not in ['V1', 'II']]
+        assert len({region.region.y for region in short}) == 1
+        assert [region.startTime for region in short] == [2.5 * row.index(region.name) for region in short]
+
+    for region in regions.values():
+        assert region.region.x >= 0 and region.region.x + region.region.width <= samplePage.width
+        assert region.region.y >= 0 and region.region.y + region.region.height <= samplePage.height
+
+
+def syntheticPage(baselines, height: int = 700, width: int = 1000) -> BinaryImage:
+    mask = np.zeros((height, width), dtype=np.uint8)
+    columns = np.arange(50, 950)
+    for baseline in baselines:
+        rows = baseline - 20 * np.exp(-((columns % 150) - 75) ** 2 / 20)  # Flat with a beat every 150 columns
+        cv2.polylines(mask, [np.stack([columns, rows], axis=1).astype(np.int32)], False, 1)
+    mask[30:40, 60:70] = 1  # A label, too small to be a trace
+    return BinaryImage(mask)
+
+
+def test_layoutWithOneRhythmStrip():
+    regions = layout.detectLeadRegions(syntheticPage([100, 250, 400, 550]))
+
+    assert not isinstance(regions, common.Failure)
+    byName = {region.name: region for region in regions}
+    assert len(byName) == 12
+    assert byName['II'].region.x == 50 and byName['II'].region.width == 900
+    assert byName['I'].region.width == 225
+    assert byName['aVR'].region.y < 100 < byName['aVR'].region.y + byName['aVR'].region.height
+
+
+def test_layoutFailsOnOtherLayouts():
+    assert isinstance(layout.detectLeadRegions(syntheticPage([200, 450])), common.Failure)
+    assert isinstance(layout.detectLeadRegions(BinaryImage(np.zeros((700, 1000), dtype=np.uint8))), common.Failure)
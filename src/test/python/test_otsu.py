@@ -0,0 +1,40 @@
+import numpy as np
+
+from ecgdigitize import otsu
+
+
+def betweenClassVariance(histogram: np.ndarray, k: int) -> float:
+    """Otsu's criterion for splitting the values `< k` from the rest, computed directly from the two classes."""
+    values = np.arange(len(histogram))
+    below, above = histogram[:k], histogram[k:]
+    if below.sum() == 0 or above.sum() == 0:
+        return 0.0
+
+    ω = below.sum() / histogram.sum()
+    meanBelow = (values[:k] * below).sum() / below.sum()
+    meanAbove = (values[k:] * above).sum() / above.sum()
+    return ω * (1 - ω) * (meanBelow - meanAbove)**2
+
+
+def test_histogramThresholdIsGlobalMaximum(samplePage):
+    grayscale = samplePage.toGrayscale()
+    histogram = grayscale.histogram()
+
+    criteria = [betweenClassVariance(histogram, k) for k in range(len(histogram) + 1)]
+    threshold = otsu.histogramThreshold(histogram)
+
+    assert threshold + 1 == int(np.argmax(criteria))  # Values <= threshold, i.e. < threshold + 1
+    assert criteria[threshold + 1] >= criteria[int(otsu.otsuThreshold(grayscale, histogram=histogram))]
+
+
+def test_histogramThresholdSeparatesModes():
+    histogram = np.zeros(256)
+    histogram[40:50] = 5
+    histogram[200:220] = 3
+
+    threshold = otsu.histogramThreshold(histogram)
+
+    assert 49 <= threshold < 200
+    assert betweenClassVariance(histogram, threshold + 1) == max(
+        betweenClassVariance(histogram, k) for k in range(257)
+    )
@@ -0,0 +1,61 @@
+import threading
+import time
+
+import pytest
+
+from ecgdigitize import common
+from ecgdigitize.pipeline import Pipeline, Stage
+
+
+def test_failedItemsAreReleased():
+    released = []
+
+    def halve(number: int) -> int:
+        if number % 2 == 1:
+            raise ValueError("odd")
+        return number // 2
+
+    pipeline = Pipeline([Stage("halve", halve, workers=2, release=released.append)])
+    results = dict(pipeline.run(range(6)))
+
+    assert [results[number] for number in (0, 2, 4)] == [0, 1, 2]
+    assert all(isinstance(results[number], common.Failure) for number in (1, 3, 5))
+    assert sorted(released) == [1, 3, 5]
+
+
+def test_itemsErrorReachesConsumer():
+    def items():
+        yield 1
+        yield 2
+        raise OSError("unreadable index")
+
+    pipeline = Pipeline([Stage("same", lambda number: number)])
+    results = []
+
+    with pytest.raises(OSError, match="unreadable index"):
+        for _, result in pipeline.run(items()):
+            results.append(result)
+
+    assert results == [1, 2]
+
+
+def test_stoppingEarlyShutsDownStages():
+    released = []
+
+    def slow(number: int) -> int:
+        time.sleep(.01)
+        return number
+
+    pipeline = Pipeline([
+        Stage("first", slow, workers=2, release=released.append),
+        Stage("second", slow, workers=2),
+    ], queueSize=1)
+    threadsBefore = threading.active_count()
+
+    with pipeline:
+        for _, result in pipeline.run(range(1000)):
+            if result == 3:
+                break
+
+    assert threading.active_count() <= threadsBefore
+    assert all(number > 3 for number in released)  # Items abandoned in flight are released, finished ones are not
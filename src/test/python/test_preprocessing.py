@@ -0,0 +1,37 @@
+import warnings
+
+import numpy as np
+import pytest
+
+from ecgdigitize.image import ColorImage
+from ecgdigitize.preprocessing import preprocess
+
+
+def colorImage(gray: np.ndarray) -> ColorImage:
+    return ColorImage(np.repeat(gray[:, :, np.newaxis], 3, axis=2))
+
+
+def assertMatchesImagePath(image: ColorImage):
+    preprocessed = preprocess(image)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # Division by a white point of 0
+        expected = preprocessed.grayscale.whitePointAdjusted()
+
+    assert np.array_equal(preprocessed.whitePointAdjusted().data, expected.data)
+    assert np.array_equal(preprocessed.darkPixels().data, (expected.data <= 230).astype(np.uint8))
+
+
+def test_whitePointAdjustedMatchesImage(samplePage):
+    assertMatchesImagePath(samplePage)
+
+
+@pytest.mark.parametrize('bright', [0, 10])
+def test_blackImage(bright):
+    gray = np.zeros((20, 30), dtype=np.uint8)
+    gray[:bright, :bright] = 200
+
+    preprocessed = preprocess(colorImage(gray))
+
+    assert preprocessed.whitePoint == 0
+    assertMatchesImagePath(colorImage(gray))
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from ecgdigitize.image import BinaryImage, ColorImage
+from ecgdigitize.signal import quality
+
+import Conversion
+from model.InputParameters import InputParameters
+from model.Lead import Lead, LeadId
+
+
+def test_candidateDensityCountsEachRunOnce():
+    mask = np.zeros((10, 4), dtype=np.uint8)
+    mask[0:2, 0] = 1   # Touches the top edge
+    mask[5:7, 0] = 1
+    mask[3:6, 1] = 1
+    mask[:, 3] = 1     # Fills the column, touching both edges
+
+    assert quality.candidateDensity(mask) == 4 / 4
+
+
+def test_gapFractionOfHalfGappedTrace():
+    mask = np.zeros((10, 10), dtype=np.uint8)
+    mask[5, :5] = 1
+
+    assert quality.gapFraction(mask, np.full(10, 5.0)) == pytest.approx(.5)
+
+    # Missing samples count as gaps too
+    signal = np.full(10, 5.0)
+    signal[:2] = np.nan
+    assert quality.gapFraction(mask, signal) == pytest.approx(.7)
+
+
+def test_clippedFraction():
+    signal = np.array([0, 5, 9, 5, np.nan])
+    assert quality.clippedFraction(signal, height=10) == pytest.approx(.5)
+    assert quality.clippedFraction(np.full(3, np.nan), height=10) == 0
+
+
+def test_pathCostPerColumn():
+    # A flat trace only pays for distance (half of each 1 pixel step)
+    assert quality.pathCostPerColumn(np.full(10, 3.0)) == pytest.approx(.5)
+
+    # A 45 degree ramp pays for the longer steps, and once for turning onto it (a quarter turn, weighted by half)
+    stepCost = np.sqrt(2) / 2
+    assert quality.pathCostPerColumn(np.arange(4.0)) == pytest.approx(stepCost + .25 * .5 / 3)
+
+    assert np.isnan(quality.pathCostPerColumn(np.full(4, np.nan)))
+
+
+def test_assessFailedExtraction():
+    mask = np.zeros((10, 10), dtype=np.uint8)
+    mask[5, :] = 1
+
+    failed = quality.assessSignal(BinaryImage(mask), None)
+    assert failed.gapFraction == 1 and np.isnan(failed.pathCostPerColumn)
+    assert failed.candidateDensity == 1
+
+
+PARAMETERS = InputParameters(rotation=0, timeScale=25, voltScale=10, leads={LeadId.I: Lead(50, 100, 500, 150, 0)})
+
+
+def test_convertLeadsWithoutTrace():
+    blank = ColorImage(np.full((400, 600, 3), 255, dtype=np.uint8))
+
+    signals, previews = Conversion.convertECGLeads(blank, PARAMETERS)
+
+    assert previews is None
+    assert signals.leadIds == [] and signals.signals.shape == (0, 0)
+    assert signals.quality[LeadId.I].gapFraction == 1
+
+
+def test_convertLeadsWithoutScale(monkeypatch):
+    page = np.full((400, 600, 3), 255, dtype=np.uint8)
+    page[170:172, 60:540] = 0
+
+    # Neither a calibration pulse nor a grid to measure the scale with
+    monkeypatch.setattr(Conversion, 'measurePageScaleAndGrid', lambda *_: (None, None, None))
+    signals, previews = Conversion.convertECGLeads(ColorImage(page), PARAMETERS)
+
+    assert previews is None
+    assert signals.leadIds == []
+    assert signals.quality[LeadId.I].gapFraction < .1
+    assert signals.quality[LeadId.I].gridPeriodConfidence is None
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from ecgdigitize.image import GrayscaleImage
+from ecgdigitize.signal import refinement
+
+
+def blurredLine(height: int = 40, width: int = 120, sigma: float = 1.2):
+    """A dark line with a Gaussian cross section, centered between pixel rows, and the row it passes through."""
+    columns = np.arange(width)
+    center = 20.3 + 2.5 * np.sin(columns / 15)
+
+    rows = np.arange(height)[:, np.newaxis]
+    darkness = 200 * np.exp(-(rows - center[np.newaxis, :]) ** 2 / (2 * sigma ** 2))
+    image = GrayscaleImage(np.rint(255 - darkness).astype(np.uint8))
+
+    return image, center
+
+
+@pytest.mark.parametrize('refine', [refinement.centroidRefinement, refinement.gaussianRefinement])
+def test_refinementFindsSubpixelCenter(refine):
+    image, center = blurredLine()
+    signal = np.rint(center)
+    signal[:5] = np.nan  # Columns without data are left alone
+
+    refined = refine(signal, image)
+
+    assert np.all(np.isnan(refined[:5]))
+    error = np.abs(refined[5:] - center[5:])
+    assert error.max() < .15
+    assert error.mean() < np.abs(signal[5:] - center[5:]).mean() / 2
+
+
+@pytest.mark.parametrize('refine', [refinement.centroidRefinement, refinement.gaussianRefinement])
+def test_refinementKeepsBlankColumns(refine):
+    image = GrayscaleImage(np.full((20, 10), 255, dtype=np.uint8))
+    signal = np.full(10, 8.0)
+
+    np.testing.assert_array_equal(refine(signal, image), signal)
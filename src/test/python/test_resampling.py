@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from ecgdigitize.signal import resampling
+
+
+def sines(length: int, samplingPeriod: float) -> np.ndarray:
+    time = np.arange(length) * samplingPeriod
+    return np.stack([np.sin(2 * np.pi * 2 * time), 100 * np.cos(2 * np.pi * 3 * time)]).astype(np.float32)
+
+
+def test_resamplingFactors():
+    assert resampling.resamplingFactors(100, 250) == (5, 2)
+    assert resampling.resamplingFactors(300, 100) == (1, 3)
+
+
+@pytest.mark.parametrize('inputRate, outputRate', [(100, 250), (318.7, 500), (1000, 250)])
+def test_resampledLengthAndRate(inputRate, outputRate):
+    signals = sines(1000, 1 / inputRate)
+
+    resampled, samplingPeriod = resampling.resampleSignals(signals, 1 / inputRate, outputRate)
+
+    assert samplingPeriod == pytest.approx(1 / outputRate, rel=1e-3)
+    assert resampled.shape == (2, int(np.ceil(1000 / inputRate / samplingPeriod - 1e-9)))
+    assert resampled.dtype == np.float32
+
+    # Away from the ends (where the filter sees the implicit zero padding) the waveforms are unchanged
+    interior = slice(len(resampled[0]) // 10, -len(resampled[0]) // 10)
+    expected = sines(resampled.shape[1], samplingPeriod)
+    np.testing.assert_allclose(resampled[0, interior], expected[0, interior], atol=.02)
+    np.testing.assert_allclose(resampled[1, interior], expected[1, interior], atol=2)
+
+
+def test_resamplingToSameRate():
+    signals = sines(100, .004)
+    resampled, samplingPeriod = resampling.resampleSignals(signals, .004, 250)
+
+    assert resampled is signals and samplingPeriod == .004
+
+
+def test_resamplingKeepsGaps():
+    signal = np.zeros(400)
+    signal[100:200] = np.nan
+
+    resampled, _ = resampling.resampleSignals(signal, .01, 200)
+
+    assert len(resampled) == 800
+    assert np.all(np.isnan(resampled[200:400]))
+    assert not np.any(np.isnan(resampled[:200])) and not np.any(np.isnan(resampled[400:]))